@@ -1,13 +1,13 @@
 import asyncio
-from typing import List, Dict, Any
 import akshare as ak
+import pandas as pd
 
-async def execute() -> List[Dict[str, Any]]:
+async def execute() -> pd.DataFrame:
     """
     异步获取乐咕乐股-大盘拥挤度数据
     
     Returns:
-        List[Dict[str, Any]]: 返回处理后的数据列表，每个元素为包含日期、收盘价和拥挤度的字典
+        pd.DataFrame: 日期、收盘价和拥挤度数据
         
     Raises:
         Exception: 当数据获取或处理过程中出现错误时抛出异常
@@ -15,25 +15,16 @@ async def execute() -> List[Dict[str, Any]]:
     try:
         # 调用akshare接口获取数据
         df = ak.stock_a_congestion_lg()
-        
-        # 将DataFrame转换为List[Dict]格式
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-                "date": row["date"],
-                "close": row["close"],
-                "congestion": row["congestion"]
-            })
-        return result
+        return df
     except Exception as e:
         raise Exception(f"获取大盘拥挤度数据失败: {str(e)}")
 
-def test() -> List[Dict[str, Any]]:
+def test() -> pd.DataFrame:
     """
     同步测试方法，用于自动化测试
     
     Returns:
-        List[Dict[str, Any]]: 返回处理后的数据列表
+        pd.DataFrame: 大盘拥挤度数据
         
     Raises:
         Exception: 当execute方法执行失败时抛出异常
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str = "000001") -> List[Dict[str, Any]]:
     """
@@ -24,9 +23,6 @@ async def execute(symbol: str = "000001") -> List[Dict[str, Any]]:
         if df.empty:
             return []
             
-        # 转换日期格式为字符串
-        if 'trade_date' in df.columns:
-            df['trade_date'] = df['trade_date'].astype(str)
             
         # 转换为字典列表
         result = df.to_dict('records')
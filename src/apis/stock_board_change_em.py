@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute() -> List[Dict[str, Any]]:
     """
@@ -18,8 +17,6 @@ async def execute() -> List[Dict[str, Any]]:
         # 将DataFrame转换为字典列表
         result = []
         if not df.empty:
-            # 替换NaN为None
-            df = df.where(pd.notnull(df), None)
             # 转换每一行为字典
             result = df.to_dict(orient='records')
         return result
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(
     symbol: str,
@@ -40,8 +39,6 @@ async def execute(
         if not df.empty:
             # 处理可能的NaN值
             df = df.fillna(0)
-            # 转换日期列为字符串格式
-            df["日期"] = df["日期"].astype(str)
             return df.to_dict("records")
         return []
     except Exception as e:
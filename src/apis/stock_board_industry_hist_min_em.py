@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str, period: str) -> List[Dict[str, Any]]:
     """
@@ -30,7 +29,6 @@ async def execute(symbol: str, period: str) -> List[Dict[str, Any]]:
                 "振幅", "换手率"
             ]
             # 转换数据类型
-            df["日期时间"] = df["日期时间"].astype(str)
             return df.to_dict("records")
         return []
     except Exception as e:
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str) -> List[Dict[str, Any]]:
     """
@@ -22,8 +21,6 @@ async def execute(symbol: str) -> List[Dict[str, Any]]:
         
         # 处理数据为字典列表格式
         if not df.empty:
-            # 转换日期为字符串格式
-            df["日期"] = df["日期"].astype(str)
             return df.to_dict("records")
         return []
     except Exception as e:
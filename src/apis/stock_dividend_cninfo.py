@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str) -> List[Dict[str, Any]]:
     """
@@ -26,13 +25,6 @@ async def execute(symbol: str) -> List[Dict[str, Any]]:
             
         # 转换DataFrame为List[Dict]格式
         result = df.to_dict(orient="records")
-        
-        # 处理可能的NaN值
-        for item in result:
-            for key, value in item.items():
-                if pd.isna(value):
-                    item[key] = None
-                    
         return result
     except Exception as e:
         raise Exception(f"Failed to fetch dividend data for {symbol}: {str(e)}")
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute() -> List[Dict[str, Any]]:
     """
@@ -18,9 +17,6 @@ async def execute() -> List[Dict[str, Any]]:
         if not df.empty:
             # 处理可能的NaN值
             df = df.fillna(0)
-            # 转换日期格式为字符串
-            if '交易日期' in df.columns:
-                df['交易日期'] = df['交易日期'].astype(str)
             return df.to_dict('records')
         return []
     except Exception as e:
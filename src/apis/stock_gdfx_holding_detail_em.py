@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(date: str, indicator: str, symbol: str) -> List[Dict[str, Any]]:
     """
@@ -24,12 +23,6 @@ async def execute(date: str, indicator: str, symbol: str) -> List[Dict[str, Any]
         
         # 处理数据为List[Dict]格式
         if not df.empty:
-            # 转换NaN为None
-            df = df.where(pd.notnull(df), None)
-            # 转换datetime列
-            for col in df.columns:
-                if df[col].dtype == 'datetime64[ns]':
-                    df[col] = df[col].astype(str)
             return df.to_dict('records')
         return []
     except Exception as e:
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(date: str) -> List[Dict[str, Any]]:
     """
@@ -23,8 +22,6 @@ async def execute(date: str) -> List[Dict[str, Any]]:
         # 将DataFrame转换为List[Dict]格式
         result = []
         if not df.empty:
-            # 处理可能的NaN值
-            df = df.where(pd.notnull(df), None)
             result = df.to_dict('records')
         
         return result
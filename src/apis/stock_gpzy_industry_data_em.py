@@ -18,12 +18,6 @@ async def execute() -> List[Dict[str, Any]]:
         
         # 将DataFrame转换为字典列表
         result = df.to_dict(orient='records')
-        
-        # 转换数据类型 (确保float64转换为Python原生float)
-        for item in result:
-            for key, value in item.items():
-                if hasattr(value, 'item'):  # 处理numpy类型
-                    item[key] = value.item()
         return result
     except Exception as e:
         raise Exception(f"获取行业质押数据失败: {str(e)}")
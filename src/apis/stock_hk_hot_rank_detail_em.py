@@ -1,9 +1,8 @@
 import asyncio
-from typing import List, Dict, Any
 import akshare as ak
 import pandas as pd
 
-async def execute(symbol: str) -> List[Dict[str, Any]]:
+async def execute(symbol: str) -> pd.DataFrame:
     """
     获取东方财富网-股票热度-历史趋势数据 (异步版本)
     
@@ -11,7 +10,7 @@ async def execute(symbol: str) -> List[Dict[str, Any]]:
         symbol: 股票代码，例如 "00700"
         
     Returns:
-        返回处理后的数据列表，每个元素为包含时间、排名、证券代码的字典
+        包含时间、排名、证券代码的 DataFrame
         
     Raises:
         Exception: 当获取数据或处理数据过程中出现错误时抛出
@@ -19,18 +18,7 @@ async def execute(symbol: str) -> List[Dict[str, Any]]:
     try:
         # 调用akshare接口获取数据
         df = ak.stock_hk_hot_rank_detail_em(symbol=symbol)
-        
-        # 处理数据为List[Dict]格式
-        result = []
-        for _, row in df.iterrows():
-            item = {
-                "时间": str(row["时间"]),
-                "排名": int(row["排名"]),
-                "证券代码": str(row["证券代码"])
-            }
-            result.append(item)
-            
-        return result
+        return df
     except Exception as e:
         raise Exception(f"获取股票热度数据失败: {str(e)}")
 
@@ -1,8 +1,8 @@
 import asyncio
-from typing import Any, Dict, List
 import akshare as ak
+import pandas as pd
 
-async def execute(symbol: str = "最热门") -> List[Dict[str, Any]]:
+async def execute(symbol: str = "最热门") -> pd.DataFrame:
     """
     异步获取雪球-沪深股市-热度排行榜-关注排行榜数据
     
@@ -10,7 +10,7 @@ async def execute(symbol: str = "最热门") -> List[Dict[str, Any]]:
         symbol: 排行榜类型, "本周新增" 或 "最热门"
     
     Returns:
-        返回处理后的数据列表, 每个元素为包含股票信息的字典
+        关注排行榜数据, 每行一只股票
     
     Raises:
         Exception: 当akshare接口调用失败时抛出异常
@@ -18,18 +18,7 @@ async def execute(symbol: str = "最热门") -> List[Dict[str, Any]]:
     try:
         # 调用akshare同步接口
         df = ak.stock_hot_follow_xq(symbol=symbol)
-        
-        # 将DataFrame转换为List[Dict]格式
-        result = []
-        for _, row in df.iterrows():
-            item = {
-                "股票代码": row["股票代码"],
-                "股票简称": row["股票简称"],
-                "关注": float(row["关注"]),
-                "最新价": float(row["最新价"]),
-            }
-            result.append(item)
-        return result
+        return df
     except Exception as e:
         raise Exception(f"获取雪球关注排行榜数据失败: {e}")
 
@@ -53,10 +42,9 @@ if __name__ == "__main__":
     # 演示如何调用异步函数
     async def main():
         try:
-            data = await execute(symbol="最热门"))
+            data = await execute(symbol="最热门")
             print("获取数据成功:")
-            for item in data[:3]:  # 打印前3条数据
-                print(item)
+            print(data.head(3))  # 打印前3条数据
         except Exception as e:
             print("调用失败:", e)
     
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(date: str = "20240920") -> List[Dict[str, Any]]:
     """
@@ -23,8 +22,6 @@ async def execute(date: str = "20240920") -> List[Dict[str, Any]]:
         # 处理数据为List[Dict]格式
         result = []
         if not df.empty:
-            # 替换NaN为None
-            df = df.where(pd.notnull(df), None)
             # 转换每一行为字典
             result = df.to_dict(orient="records")
         return result
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
     """
@@ -30,9 +29,6 @@ async def execute(symbol: str, start_date: str, end_date: str) -> List[Dict[str,
         if not df.empty:
             # 处理可能的NaN值
             df = df.fillna(0)
-            # 转换日期列为字符串格式
-            if '持股日期' in df.columns:
-                df['持股日期'] = df['持股日期'].astype(str)
             return df.to_dict('records')
         return []
     except Exception as e:
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(stock: str) -> List[Dict[str, Any]]:
     """
@@ -22,13 +21,6 @@ async def execute(stock: str) -> List[Dict[str, Any]]:
         
         # 将DataFrame转换为List[Dict]格式
         result = df.to_dict(orient="records")
-        
-        # 处理可能的NaN值
-        for item in result:
-            for key, value in item.items():
-                if pd.isna(value):
-                    item[key] = None
-        
         return result
     except Exception as e:
         raise Exception(f"获取沪深港通个股持股数据失败: {e}")
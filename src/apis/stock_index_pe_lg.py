@@ -1,8 +1,8 @@
 import asyncio
-from typing import List, Dict, Any
 import akshare as ak
+import pandas as pd
 
-async def execute(symbol: str = "上证50") -> List[Dict[str, Any]]:
+async def execute(symbol: str = "上证50") -> pd.DataFrame:
     """
     异步获取乐咕乐股-指数市盈率数据
     
@@ -12,7 +12,7 @@ async def execute(symbol: str = "上证50") -> List[Dict[str, Any]]:
                               "中证100", "中证800"}
     
     Returns:
-        返回处理后的指数市盈率数据列表, 每个元素为一个字典
+        指数市盈率数据
         
     Raises:
         Exception: 当获取数据失败时抛出异常
@@ -20,23 +20,7 @@ async def execute(symbol: str = "上证50") -> List[Dict[str, Any]]:
     try:
         # 调用akshare接口获取数据
         df = ak.stock_index_pe_lg(symbol=symbol)
-        
-        # 处理数据为List[Dict]格式
-        result = []
-        for _, row in df.iterrows():
-            item = {
-                "日期": str(row["日期"]),
-                "指数": float(row["指数"]),
-                "等权静态市盈率": float(row["等权静态市盈率"]),
-                "静态市盈率": float(row["静态市盈率"]),
-                "静态市盈率中位数": float(row["静态市盈率中位数"]),
-                "等权滚动市盈率": float(row["等权滚动市盈率"]),
-                "滚动市盈率": float(row["滚动市盈率"]),
-                "滚动市盈率中位数": float(row["滚动市盈率中位数"]),
-            }
-            result.append(item)
-            
-        return result
+        return df
     except Exception as e:
         raise Exception(f"获取指数市盈率数据失败: {e}")
 
@@ -58,8 +42,7 @@ if __name__ == "__main__":
     async def main():
         try:
             data = await execute(symbol="上证50")
-            for item in data:
-                print(item)
+            print(data)
         except Exception as e:
             print(f"Error: {e}")
     
@@ -1,9 +1,8 @@
 import asyncio
-from typing import List, Dict, Any
 import akshare as ak
 import pandas as pd
 
-async def execute(symbol: str = "巨潮行业分类标准") -> List[Dict[str, Any]]:
+async def execute(symbol: str = "巨潮行业分类标准") -> pd.DataFrame:
     """
     异步获取巨潮资讯行业分类数据
     
@@ -14,7 +13,7 @@ async def execute(symbol: str = "巨潮行业分类标准") -> List[Dict[str, An
             "天相行业分类标准", "全球行业分类标准"
             
     Returns:
-        行业分类数据列表, 每个条目是一个字典
+        行业分类数据
         
     Raises:
         Exception: 当获取数据失败时抛出异常
@@ -22,16 +21,7 @@ async def execute(symbol: str = "巨潮行业分类标准") -> List[Dict[str, An
     try:
         # 调用akshare同步接口
         df = ak.stock_industry_category_cninfo(symbol=symbol)
-        
-        # 将DataFrame转换为List[Dict]格式
-        result = df.to_dict(orient="records")
-        
-        # 处理datetime64类型字段
-        for item in result:
-            if "终止日期" in item and pd.notna(item["终止日期"]):
-                item["终止日期"] = item["终止日期"].to_pydatetime()
-                
-        return result
+        return df
     except Exception as e:
         raise Exception(f"获取行业分类数据失败: {str(e)}")
 
@@ -40,7 +30,7 @@ def test():
     同步测试方法, 用于自动化测试
     
     Returns:
-        行业分类数据列表
+        行业分类数据
         
     Raises:
         原样抛出execute方法中的异常
@@ -54,10 +44,7 @@ if __name__ == "__main__":
         try:
             data = await execute(symbol="巨潮行业分类标准")
             print(f"获取到{len(data)}条行业分类数据")
-            for i, item in enumerate(data[:3], 1):  # 打印前3条数据
-                print(f"\n第{i}条数据:")
-                for k, v in item.items():
-                    print(f"{k}: {v}")
+            print(data.head(3))  # 打印前3条数据
         except Exception as e:
             print(f"发生错误: {e}")
     
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str = "A股列表") -> List[Dict[str, Any]]:
     """
@@ -26,13 +25,6 @@ async def execute(symbol: str = "A股列表") -> List[Dict[str, Any]]:
         
         # 将DataFrame转换为List[Dict]格式
         result = df.to_dict(orient="records")
-        
-        # 处理可能的NaN值
-        for item in result:
-            for key in item:
-                if pd.isna(item[key]):
-                    item[key] = None
-                    
         return result
     except Exception as e:
         raise Exception(f"获取深证股票列表数据失败: {str(e)}")
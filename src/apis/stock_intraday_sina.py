@@ -1,9 +1,8 @@
 import asyncio
-from typing import List, Dict, Any
 import akshare as ak
 import pandas as pd
 
-async def execute(symbol: str, date: str) -> List[Dict[str, Any]]:
+async def execute(symbol: str, date: str) -> pd.DataFrame:
     """
     异步获取新浪财经日内分时数据
     
@@ -12,7 +11,7 @@ async def execute(symbol: str, date: str) -> List[Dict[str, Any]]:
         date: 交易日, 格式如 "20240321"
     
     Returns:
-        返回处理后的分时数据列表, 每个元素是一个字典
+        日内分时数据
         
     Raises:
         Exception: 当akshare接口调用失败或数据处理异常时抛出
@@ -20,22 +19,7 @@ async def execute(symbol: str, date: str) -> List[Dict[str, Any]]:
     try:
         # 调用akshare同步接口获取数据
         df = ak.stock_intraday_sina(symbol=symbol, date=date)
-        
-        # 处理数据为List[Dict]格式
-        result = []
-        for _, row in df.iterrows():
-            item = {
-                "symbol": row["symbol"],
-                "name": row["name"],
-                "ticktime": row["ticktime"],
-                "price": row["price"],
-                "volume": row["volume"],
-                "prev_price": row["prev_price"],
-                "kind": row["kind"]
-            }
-            result.append(item)
-            
-        return result
+        return df
     except Exception as e:
         raise Exception(f"Failed to fetch intraday data: {str(e)}")
 
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str) -> List[Dict[str, Any]]:
     """
@@ -22,9 +21,6 @@ async def execute(symbol: str) -> List[Dict[str, Any]]:
         
         # 将DataFrame转换为List[Dict]格式
         if not df.empty:
-            # 处理datetime类型字段
-            df['提问时间'] = pd.to_datetime(df['提问时间']).dt.strftime('%Y-%m-%d %H:%M:%S')
-            df['回答时间'] = pd.to_datetime(df['回答时间']).dt.strftime('%Y-%m-%d %H:%M:%S')
             return df.to_dict('records')
         return []
     except Exception as e:
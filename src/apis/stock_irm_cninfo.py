@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str) -> List[Dict[str, Any]]:
     """
@@ -22,12 +21,6 @@ async def execute(symbol: str) -> List[Dict[str, Any]]:
         
         # 将DataFrame转换为字典列表
         if not df.empty:
-            # 处理datetime类型字段
-            datetime_cols = ['提问时间', '更新时间']
-            for col in datetime_cols:
-                if col in df.columns:
-                    df[col] = df[col].astype(str)
-            
             return df.to_dict('records')
         return []
     except Exception as e:
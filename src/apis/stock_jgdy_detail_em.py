@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(date: str) -> List[Dict[str, Any]]:
     """
@@ -26,13 +25,6 @@ async def execute(date: str) -> List[Dict[str, Any]]:
             
         # 转换DataFrame为List[Dict]
         result = df.to_dict(orient='records')
-        
-        # 处理可能的NaN值
-        for item in result:
-            for key, value in item.items():
-                if pd.isna(value):
-                    item[key] = None
-        
         return result
     except Exception as e:
         raise Exception(f"获取机构调研详细数据失败: {str(e)}")
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute() -> List[Dict[str, Any]]:
     """
@@ -22,8 +21,6 @@ async def execute() -> List[Dict[str, Any]]:
         if not df.empty:
             # 处理可能的NaN值
             df = df.fillna(0)
-            # 转换日期格式为字符串
-            df['日期'] = df['日期'].astype(str)
             result = df.to_dict('records')
         return result
     except Exception as e:
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute() -> List[Dict[str, Any]]:
     """
@@ -19,8 +18,6 @@ async def execute() -> List[Dict[str, Any]]:
         
         # 将DataFrame转换为List[Dict]格式
         if not df.empty:
-            # 处理可能的NaN值
-            df = df.where(pd.notnull(df), None)
             return df.to_dict(orient='records')
         return []
     except Exception as e:
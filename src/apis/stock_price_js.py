@@ -1,7 +1,6 @@
 import asyncio
 from typing import Any, Dict, List
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str = "us") -> List[Dict[str, Any]]:
     """
@@ -23,8 +22,6 @@ async def execute(symbol: str = "us") -> List[Dict[str, Any]]:
         # 处理数据为List[Dict]格式
         result = []
         if not df.empty:
-            # 替换NaN为None, 确保JSON序列化
-            df = df.where(pd.notnull(df), None)
             result = df.to_dict(orient="records")
         return result
     except Exception as e:
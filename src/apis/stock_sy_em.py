@@ -1,9 +1,8 @@
 import asyncio
-from typing import List, Dict, Any
 import akshare as ak
 import pandas as pd
 
-async def execute(date: str = "20240630") -> List[Dict[str, Any]]:
+async def execute(date: str = "20240630") -> pd.DataFrame:
     """
     异步获取东方财富网-数据中心-特色数据-商誉-个股商誉明细
     
@@ -11,7 +10,7 @@ async def execute(date: str = "20240630") -> List[Dict[str, Any]]:
         date: 查询日期，格式如"20240630"
         
     Returns:
-        返回商誉数据列表，每个元素为包含字段的字典
+        个股商誉明细数据
         
     Raises:
         Exception: 当接口调用或数据处理出错时抛出
@@ -19,30 +18,7 @@ async def execute(date: str = "20240630") -> List[Dict[str, Any]]:
     try:
         # 调用akshare接口获取数据
         df = ak.stock_sy_em(date=date)
-        
-        # 处理可能的空数据
-        if df.empty:
-            return []
-            
-        # 转换DataFrame为List[Dict]
-        result = []
-        for _, row in df.iterrows():
-            item = {
-                "序号": int(row["序号"]),
-                "股票代码": str(row["股票代码"]),
-                "股票简称": str(row["股票简称"]),
-                "商誉": float(row["商誉"]),
-                "商誉占净资产比例": float(row["商誉占净资产比例"]),
-                "净利润": float(row["净利润"]),
-                "净利润同比": float(row["净利润同比"]),
-                "上年商誉": float(row["上年商誉"]),
-                "公告日期": str(row["公告日期"]),
-                "交易市场": str(row["交易市场"])
-            }
-            result.append(item)
-            
-        return result
-        
+        return df
     except Exception as e:
         raise Exception(f"获取商誉数据失败: {str(e)}")
 
@@ -68,9 +44,9 @@ if __name__ == "__main__":
         try:
             data = await execute(date="20240630")
             print(f"获取到{len(data)}条数据")
-            if data:
+            if not data.empty:
                 print("第一条数据示例:")
-                print(data[0])
+                print(data.iloc[0])
         except Exception as e:
             print(f"调用失败: {str(e)}")
             
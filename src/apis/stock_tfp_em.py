@@ -1,9 +1,8 @@
 import asyncio
-from typing import List, Dict, Any
 import akshare as ak
 import pandas as pd
 
-async def execute(date: str) -> List[Dict[str, Any]]:
+async def execute(date: str) -> pd.DataFrame:
     """
     异步获取东方财富网-数据中心-特色数据-停复牌信息
     
@@ -11,7 +10,7 @@ async def execute(date: str) -> List[Dict[str, Any]]:
         date: 日期, 格式为"YYYYMMDD"
         
     Returns:
-        停复牌信息列表, 每个元素为包含详细信息的字典
+        停复牌信息
         
     Raises:
         Exception: 当获取数据失败时抛出异常
@@ -19,13 +18,7 @@ async def execute(date: str) -> List[Dict[str, Any]]:
     try:
         # 调用akshare同步接口获取数据
         df = ak.stock_tfp_em(date=date)
-        
-        # 将DataFrame转换为List[Dict]格式
-        if not df.empty:
-            # 处理可能的NaN值
-            df = df.where(pd.notna(df), None)
-            return df.to_dict(orient="records")
-        return []
+        return df
     except Exception as e:
         raise Exception(f"获取停复牌信息失败: {e}")
 
@@ -34,7 +27,7 @@ def test():
     同步测试方法, 用于自动化测试
     
     Returns:
-        停复牌信息列表
+        停复牌信息
         
     Raises:
         原样抛出execute方法中的异常
@@ -50,8 +43,7 @@ if __name__ == "__main__":
             date = "20240426"
             result = await execute(date)
             print(f"获取到{len(result)}条停复牌信息:")
-            for item in result:
-                print(item)
+            print(result)
         except Exception as e:
             print(f"发生错误: {e}")
     
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -37,8 +36,6 @@ async def execute(symbol: str, adjust: str = "") -> List[Dict[str, Any]]:
         
         # 将DataFrame转换为字典列表
         if not df.empty:
-            # 确保date列是字符串类型
-            df['date'] = df['date'].astype(str)
             return df.to_dict(orient='records')
         return []
     except Exception as e:
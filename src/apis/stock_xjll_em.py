@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(date: str) -> List[Dict[str, Any]]:
     """
@@ -22,8 +21,6 @@ async def execute(date: str) -> List[Dict[str, Any]]:
         
         # 处理数据为List[Dict]格式
         if not df.empty:
-            # 替换NaN为None，方便JSON序列化
-            df = df.where(pd.notnull(df), None)
             return df.to_dict(orient='records')
         return []
     except Exception as e:
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(date: str) -> List[Dict[str, Any]]:
     """
@@ -24,8 +23,6 @@ async def execute(date: str) -> List[Dict[str, Any]]:
         # 调用akshare同步接口获取数据
         df = ak.stock_zcfz_em(date=date)
         
-        # 处理NaN值为None
-        df = df.where(pd.notnull(df), None)
         
         # 转换为List[Dict]格式
         result = df.to_dict(orient='records')
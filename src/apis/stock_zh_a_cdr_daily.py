@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
     """
@@ -24,9 +23,8 @@ async def execute(symbol: str, start_date: str, end_date: str) -> List[Dict[str,
         
         # 将DataFrame转换为字典列表
         if not df.empty:
-            # 重置索引并将日期列转为字符串
+            # 重置索引
             df = df.reset_index()
-            df['date'] = df['date'].astype(str)
             return df.to_dict('records')
         return []
     except Exception as e:
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(
     symbol: str,
@@ -44,8 +43,6 @@ async def execute(
         
         # 将DataFrame转换为List[Dict]格式
         if not df.empty:
-            # 确保日期列是字符串类型
-            df["日期"] = df["日期"].astype(str)
             return df.to_dict("records")
         return []
     except Exception as e:
@@ -2,7 +2,6 @@ import asyncio
 from typing import Any, Dict, List, Optional
 import aiohttp
 import akshare as ak
-import pandas as pd
 
 async def execute(symbol: str, adjust: str = "") -> List[Dict[str, Any]]:
     """
@@ -28,9 +27,6 @@ async def execute(symbol: str, adjust: str = "") -> List[Dict[str, Any]]:
         if not df.empty:
             # 处理可能的NaN值
             df = df.fillna(0)
-            # 转换日期格式为字符串
-            if 'date' in df.columns:
-                df['date'] = df['date'].astype(str)
             return df.to_dict('records')
         return []
     except Exception as e:
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(date: str = '20241009') -> List[Dict[str, Any]]:
     """
@@ -22,8 +21,6 @@ async def execute(date: str = '20241009') -> List[Dict[str, Any]]:
         
         # 处理数据为List[Dict]格式
         if not df.empty:
-            # 转换NaN为None
-            df = df.where(pd.notnull(df), None)
             # 转换数据类型
             df['序号'] = df['序号'].astype(int) if '序号' in df.columns else None
             return df.to_dict('records')
@@ -1,7 +1,6 @@
 import asyncio
 from typing import List, Dict, Any
 import akshare as ak
-import pandas as pd
 
 async def execute(date: str = '20241231') -> List[Dict[str, Any]]:
     """
@@ -25,15 +24,6 @@ async def execute(date: str = '20241231') -> List[Dict[str, Any]]:
         
         # 转换DataFrame为List[Dict]
         result = df.to_dict('records')
-        
-        # 转换数据类型
-        for item in result:
-            for key, value in item.items():
-                if pd.isna(value):
-                    item[key] = None
-                elif isinstance(value, (pd.Timestamp, pd.Timedelta)):
-                    item[key] = str(value)
-                    
         return result
     except Exception as e:
         raise Exception(f"获取次新股池数据失败: {str(e)}")
@@ -55,7 +45,7 @@ if __name__ == '__main__':
     # 演示如何调用该函数
     async def main():
         try:
-            data = await execute(date='20241231'))
+            data = await execute(date='20241231')
             print(data)
         except Exception as e:
             print(f"Error: {str(e)}")
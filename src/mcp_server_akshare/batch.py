@@ -0,0 +1,90 @@
+"""
+批量工具调用。
+
+``batch_call`` 在一次请求中以有限并发执行同一个工具的多组参数，把结果合并为一张表返回，
+每行带有区分各组参数的键列(如 symbol)。每次调用都走普通工具调用的完整路径，并发受数据源
+限流约束；单次调用失败不影响其他调用，失败的参数组在 error 列中给出原因。
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .formatting import SERVER_ARGUMENTS
+
+BATCH_CONCURRENCY = int(os.getenv("AKSHARE_MCP_BATCH_CONCURRENCY", "8"))
+BATCH_MAX_CONCURRENCY = 16
+BATCH_MAX_CALLS = int(os.getenv("AKSHARE_MCP_BATCH_MAX_CALLS", "500"))
+
+ToolRunner = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+def require_tool(name: Any):
+    """返回可批量调用的工具定义，内置工具和未知工具抛出 ValueError"""
+    from .builtin_tools import get_builtin_handler  # builtin_tools 导入本模块，延迟导入
+    from .registry import tool_registry
+
+    tool = tool_registry.get(name) if isinstance(name, str) else None
+    if tool is None or get_builtin_handler(name) is not None:
+        raise ValueError(f"Unknown tool {name!r}")
+    return tool
+
+
+def key_columns(calls: List[Dict[str, Any]]) -> List[str]:
+    """各组参数中取值不同的参数名，全部相同时返回所有参数名"""
+    names = list(dict.fromkeys(name for call in calls for name in call))
+    varying = [name for name in names if len({repr(call.get(name)) for call in calls}) > 1]
+    return varying or names
+
+
+def _merge(calls: List[Dict[str, Any]], keys: List[str], outcomes: List[Tuple[Any, Optional[str]]]) -> Any:
+    """按参数组顺序合并结果，并在前面插入键列"""
+    import pandas as pd
+
+    from .normalize import normalize_result, to_frame
+
+    frames = []
+    for call, (result, error) in zip(calls, outcomes):
+        if error is not None:
+            frame = pd.DataFrame({"error": [error]})
+        else:
+            frame = to_frame(normalize_result(result))
+            if frame is None:
+                if result is None or (isinstance(result, list) and not result):
+                    continue
+                frame = pd.DataFrame({"value": [result]})
+        frame = frame.copy()
+        for key in reversed(keys):
+            if key not in frame.columns:
+                frame.insert(0, key, [call.get(key)] * len(frame))
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame({key: [] for key in keys})
+    return pd.concat(frames, ignore_index=True)
+
+
+async def run_batch(runner: ToolRunner, tool: str, calls: Any, shared: Optional[Dict[str, Any]] = None,
+                    concurrency: Optional[int] = None) -> Any:
+    """以有限并发执行 calls 中的每组参数，返回合并后的 DataFrame"""
+    require_tool(tool)
+    if not isinstance(calls, list) or not calls or not all(isinstance(call, dict) for call in calls):
+        raise ValueError("calls must be a non-empty array of argument objects")
+    if len(calls) > BATCH_MAX_CALLS:
+        raise ValueError(f"batch_call accepts at most {BATCH_MAX_CALLS} calls, use submit_job for larger fan-outs")
+    concurrency = concurrency or BATCH_CONCURRENCY
+    if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+        raise ValueError(f"concurrency must be a positive integer, got {concurrency!r}")
+    # 服务端参数作用于合并后的整张表，不传给单次调用
+    calls = [{k: v for k, v in call.items() if k not in SERVER_ARGUMENTS} for call in calls]
+    shared = {k: v for k, v in (shared or {}).items() if k not in SERVER_ARGUMENTS}
+    semaphore = asyncio.Semaphore(min(concurrency, BATCH_MAX_CONCURRENCY))
+
+    async def call_one(arguments: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+        async with semaphore:
+            try:
+                return await runner(tool, {**shared, **arguments}), None
+            except Exception as e:
+                return None, str(e) or type(e).__name__
+
+    outcomes = await asyncio.gather(*[call_one(call) for call in calls])
+    return await asyncio.to_thread(_merge, calls, key_columns(calls), outcomes)
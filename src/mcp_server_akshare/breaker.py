@@ -0,0 +1,218 @@
+"""
+按上游数据源的熔断器。
+
+某个数据源连续失败或超时达到阈值后熔断(open)，期间该数据源的调用立即失败；
+冷却时间过后进入半开(half_open)状态，只放行一个探测调用，成功则恢复(closed)，
+失败则重新熔断。
+
+只有网络错误、超时和 HTTP 5xx 计为上游失败。生成的工具把参数错误、无数据等
+都包装成普通 Exception 抛出，这类错误不代表数据源不可用，不计入熔断。
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FAILURE_THRESHOLD = int(os.getenv("AKSHARE_MCP_BREAKER_THRESHOLD", "5"))
+RESET_TIMEOUT = float(os.getenv("AKSHARE_MCP_BREAKER_RESET", "30"))
+# 单次上游调用的超时时间(秒)，超时计为一次失败
+CALL_TIMEOUT = float(os.getenv("AKSHARE_MCP_CALL_TIMEOUT", "120"))
+# 半开探测进行中被拒绝的调用建议的重试间隔(秒)
+PROBE_RETRY_DELAY = 1.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """数据源处于熔断状态，调用被快速拒绝"""
+
+    def __init__(self, message: str, retry_in: float = 0.0):
+        super().__init__(message)
+        # 距离熔断器允许下一次调用的秒数
+        self.retry_in = retry_in
+
+
+def is_upstream_fault(error: BaseException) -> bool:
+    """错误(或其异常链中的原因)是否为网络错误、超时或 HTTP 5xx"""
+    import requests
+
+    transport = (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+        ConnectionError,
+        TimeoutError,
+        asyncio.TimeoutError,
+    )
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, transport):
+            return True
+        if isinstance(error, requests.exceptions.HTTPError):
+            response = error.response
+            if response is not None and response.status_code >= 500:
+                return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class CircuitBreaker:
+    """单个数据源的熔断器"""
+
+    def __init__(self, provider: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.successes = 0
+        self.tool_errors = 0
+        self.last_error: Optional[str] = None
+
+    def _retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def before_call(self) -> None:
+        """调用前检查熔断状态
+
+        Raises:
+            CircuitOpenError: 熔断中，或半开状态下已有探测调用在进行
+        """
+        if self.state == OPEN:
+            if self._retry_in() > 0:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"Upstream provider {self.provider} is unavailable "
+                    f"(circuit open after {self.consecutive_failures} consecutive failures: {self.last_error}), "
+                    f"retry in {self._retry_in():.1f}s",
+                    self._retry_in(),
+                )
+            self.state = HALF_OPEN
+            logger.info(f"Circuit for {self.provider} half-open, probing upstream")
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"Upstream provider {self.provider} is being probed after failures, retry shortly",
+                    PROBE_RETRY_DELAY,
+                )
+            self._probe_in_flight = True
+
+    def ensure_not_open(self) -> None:
+        """排队等待期间熔断器可能已打开，执行前再次检查(不占用半开探测名额)"""
+        if self.state == OPEN and self._retry_in() > 0:
+            self.rejected += 1
+            raise CircuitOpenError(
+                f"Upstream provider {self.provider} became unavailable while queued "
+                f"({self.last_error}), retry in {self._retry_in():.1f}s",
+                self._retry_in(),
+            )
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        if self.state != CLOSED:
+            logger.info(f"Circuit for {self.provider} closed")
+        self.state = CLOSED
+        self.opened_at = None
+
+    def record_failure(self, error: BaseException, timeout: bool = False) -> None:
+        self.failures += 1
+        if timeout:
+            self.timeouts += 1
+        self.consecutive_failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"[:200]
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(
+                    f"Circuit for {self.provider} opened after {self.consecutive_failures} "
+                    f"consecutive failures: {self.last_error}"
+                )
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """调用被取消时释放半开探测名额，不计入成功或失败"""
+        self._probe_in_flight = False
+
+    def record_tool_error(self) -> None:
+        """参数错误、无数据等非上游故障，不计入连续失败"""
+        self.tool_errors += 1
+        self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_s": round(self._retry_in(), 1) if self.state == OPEN else 0,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "tool_errors": self.tool_errors,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
+
+
+class BreakerBoard:
+    """各数据源熔断器的集合"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, provider: str) -> CircuitBreaker:
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(provider)
+            self._breakers[provider] = breaker
+        return breaker
+
+    @asynccontextmanager
+    async def guard(self, provider: str) -> AsyncIterator[CircuitBreaker]:
+        """检查熔断状态并根据调用结果更新熔断器
+
+        只有网络错误、超时和 HTTP 5xx 计为上游失败，参数错误、无数据等工具错误不计入。
+        """
+        breaker = self.get(provider)
+        breaker.before_call()
+        try:
+            yield breaker
+        except (TimeoutError, asyncio.TimeoutError) as e:
+            breaker.record_failure(e, timeout=True)
+            raise
+        except CircuitOpenError:
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            if is_upstream_fault(e):
+                breaker.record_failure(e)
+            else:
+                breaker.record_tool_error()
+            raise
+        except BaseException:
+            breaker.release_probe()
+            raise
+        else:
+            breaker.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: breaker.stats() for name, breaker in sorted(self._breakers.items())}
+
+
+breakers = BreakerBoard()
@@ -0,0 +1,263 @@
+"""
+服务端内置工具，不对应 apis 目录下的生成模块。
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import mcp.types as types
+
+from .batch import BATCH_CONCURRENCY, BATCH_MAX_CALLS, BATCH_MAX_CONCURRENCY, run_batch
+from .breaker import breakers
+from .cache import result_cache
+from .dispatch import dispatcher
+from .executor import get_executor, lag_monitor
+from .formatting import SERVER_ARGUMENTS
+from .jobs import JOB_CONCURRENCY, JOB_MAX_CONCURRENCY, job_manager
+from .pagination import result_handles
+from .progress import progress_notifier
+from .providers import classify_tools, governor
+from .singleflight import single_flight
+from .spot import SPOT_MARKETS, spot_snapshots
+from .store import store_stats
+from .trading_calendar import trading_calendars
+from .warmup import warmup
+
+BuiltinHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+_BUILTIN_TOOLS: Dict[str, Tuple[types.Tool, BuiltinHandler]] = {}
+
+# 按普通工具调用路径执行工具的函数，由 server 模块设置(server 导入本模块)
+_tool_runner: Callable[[str, Dict[str, Any]], Awaitable[Any]] | None = None
+
+
+def set_tool_runner(runner: Callable[[str, Dict[str, Any]], Awaitable[Any]]) -> None:
+    global _tool_runner
+    _tool_runner = runner
+
+
+def builtin_tool(name: str, description: str, input_schema: Dict[str, Any] | None = None):
+    """注册内置工具的装饰器"""
+    def decorator(func: BuiltinHandler) -> BuiltinHandler:
+        tool = types.Tool(
+            name=name,
+            description=description,
+            inputSchema=input_schema or {"type": "object", "properties": {}},
+        )
+        _BUILTIN_TOOLS[name] = (tool, func)
+        return func
+    return decorator
+
+
+def get_builtin_tools() -> List[types.Tool]:
+    """获取所有内置工具定义"""
+    return [tool for tool, _ in _BUILTIN_TOOLS.values()]
+
+
+def get_builtin_handler(name: str) -> BuiltinHandler | None:
+    """获取内置工具处理函数，不存在时返回None"""
+    entry = _BUILTIN_TOOLS.get(name)
+    return entry[1] if entry else None
+
+
+@builtin_tool(
+    name="server_stats",
+    description="获取MCP服务运行状态，包括工具线程池、事件循环延迟、本地存储和交易日历等指标",
+)
+async def server_stats(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    from .registry import tool_registry  # registry 依赖本模块，延迟导入
+
+    return {
+        "executor": get_executor().stats(),
+        "dispatch": dispatcher.stats(),
+        "result_cache": result_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "providers": governor.stats(),
+        "provider_tools": classify_tools(tool_registry.names()),
+        "event_loop_lag": lag_monitor.stats(),
+        "warmup": warmup.stats(),
+        "local_store": store_stats(),
+        "trading_calendar": trading_calendars.stats(),
+        "spot_snapshots": spot_snapshots.stats(),
+        "result_handles": result_handles.stats(),
+        "progress": progress_notifier.stats(),
+        "jobs": job_manager.stats(),
+    }
+
+
+@builtin_tool(
+    name="provider_diagnostics",
+    description="获取各上游数据源(东方财富、新浪、同花顺等)的熔断器状态、限流排队情况和工具数量",
+)
+async def provider_diagnostics(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    from .registry import tool_registry  # registry 依赖本模块，延迟导入
+
+    breaker_stats = breakers.stats()
+    limiter_stats = governor.stats()
+    tool_counts = classify_tools(tool_registry.names())
+    providers = sorted(set(breaker_stats) | set(limiter_stats) | set(tool_counts))
+    return {
+        provider: {
+            "tools": tool_counts.get(provider, 0),
+            "breaker": breaker_stats.get(provider, {"state": "closed"}),
+            "limiter": limiter_stats.get(provider),
+        }
+        for provider in providers
+    }
+
+
+@builtin_tool(
+    name="spot_quote",
+    description=(
+        "从共享的全市场实时行情快照中按代码查询报价，批量查询多个代码只需一次全表下载。"
+        "market: a(沪深京A股，新浪)、kc(科创板)、b(B股)、ah(A+H股，可用A股或H股代码)、hk(港股)、us(美股，"
+        "如 AAPL 或 105.AAPL)；代码可带交易所前缀或后缀，如 sh600000、600000.SH"
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "market": {"type": "string", "enum": list(SPOT_MARKETS), "default": "a"},
+            "symbols": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "证券代码列表",
+            },
+            "max_age": {"type": "number", "description": "允许的最大陈旧时间(秒)，默认使用服务配置"},
+        },
+        "required": ["symbols"],
+    },
+)
+async def spot_quote(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    await warmup.wait()
+    snapshot = spot_snapshots.get(arguments.get("market", "a"))
+    symbols = arguments.get("symbols") or []
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    rows, missing = await snapshot.lookup(symbols, arguments.get("max_age"))
+    return {
+        "market": snapshot.market,
+        "source": snapshot.tool,
+        "age_seconds": round(snapshot.age(), 3),
+        "rows": rows.to_dict("records"),
+        "missing": missing,
+    }
+
+
+@builtin_tool(
+    name="submit_job",
+    description=(
+        "提交后台批量任务: 把一个工具按某个参数(如 symbol 或 date)展开为一组调用，以有限并发在后台执行，"
+        "立即返回任务ID。取值来自 values(列表)、values_from(另一个工具结果中的一列，如 "
+        "{\"tool\": \"stock_info_a_code_name\", \"column\": \"code\"})或 date_range(区间内的每个交易日)。"
+        "用 job_status 查询进度，用 job_result 获取合并结果；服务重启后未完成的任务会继续执行"
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "tool": {"type": "string", "description": "要批量调用的工具名称"},
+            "fan_out": {"type": "string", "description": "逐个取值的参数名，如 symbol、date"},
+            "arguments": {"type": "object", "description": "每次调用共用的其他参数"},
+            "values": {"type": "array", "description": "参数取值列表"},
+            "values_from": {
+                "type": "object",
+                "description": "从另一个工具的结果中取一列作为取值列表",
+                "properties": {
+                    "tool": {"type": "string"},
+                    "column": {"type": "string"},
+                    "arguments": {"type": "object"},
+                },
+                "required": ["tool", "column"],
+            },
+            "date_range": {
+                "type": "object",
+                "description": "按交易日展开，日期格式与 start 相同，如 {\"start\": \"20240101\", \"end\": \"20241231\"}",
+                "properties": {"start": {"type": "string"}, "end": {"type": "string"}},
+                "required": ["start"],
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": JOB_MAX_CONCURRENCY,
+                "description": f"并发调用数，默认{JOB_CONCURRENCY}",
+            },
+        },
+        "required": ["tool", "fan_out"],
+    },
+)
+async def submit_job(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    await warmup.wait()
+    return await job_manager.submit(
+        arguments.get("tool"),
+        arguments.get("fan_out"),
+        dict(arguments.get("arguments") or {}),
+        arguments,
+        arguments.get("concurrency"),
+    )
+
+
+@builtin_tool(
+    name="job_status",
+    description="查询后台批量任务的状态与进度(已完成/无数据/失败的调用数、行数、预计剩余时间、失败原因)",
+    input_schema={
+        "type": "object",
+        "properties": {"job_id": {"type": "string"}},
+        "required": ["job_id"],
+    },
+)
+async def job_status(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return await job_manager.status(str(arguments.get("job_id")))
+
+
+@builtin_tool(
+    name="job_result",
+    description=(
+        "获取后台批量任务已完成部分的合并结果，第一列为展开参数的值；"
+        "支持与普通工具相同的列投影、过滤、排序和分页参数"
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {"job_id": {"type": "string"}, **SERVER_ARGUMENTS},
+        "required": ["job_id"],
+    },
+)
+async def job_result(arguments: Dict[str, Any]) -> Any:
+    return await job_manager.result(str(arguments.get("job_id")))
+
+
+@builtin_tool(
+    name="batch_call",
+    description=(
+        "在一次请求中并发调用同一个工具的多组参数，返回合并后的一张表，前几列为各组参数中取值不同的参数"
+        "(如 symbol)；例如 {\"tool\": \"stock_individual_info_em\", \"calls\": [{\"symbol\": \"000001\"}, "
+        "{\"symbol\": \"600000\"}]}。单次调用失败时该组参数的 error 列给出原因。"
+        f"最多{BATCH_MAX_CALLS}组参数，更大的批量请用 submit_job；支持与普通工具相同的列投影、过滤、排序和分页参数"
+    ),
+    input_schema={
+        "type": "object",
+        "properties": {
+            "tool": {"type": "string", "description": "要调用的工具名称"},
+            "calls": {
+                "type": "array",
+                "items": {"type": "object"},
+                "description": "每次调用的参数",
+            },
+            "arguments": {"type": "object", "description": "每次调用共用的参数"},
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": BATCH_MAX_CONCURRENCY,
+                "description": f"并发调用数，默认{BATCH_CONCURRENCY}，实际并发还受数据源限流约束",
+            },
+            **SERVER_ARGUMENTS,
+        },
+        "required": ["tool", "calls"],
+    },
+)
+async def batch_call(arguments: Dict[str, Any]) -> Any:
+    await warmup.wait()
+    return await run_batch(
+        _tool_runner,
+        arguments.get("tool"),
+        arguments.get("calls"),
+        arguments.get("arguments"),
+        arguments.get("concurrency"),
+    )
@@ -0,0 +1,319 @@
+"""
+工具结果缓存。
+
+在 ``handle_call_tool`` 之前按 (工具名, 规范化参数) 缓存原始结果，按工具类型
+决定过期时间:
+  - realtime: 实时行情、资金流排名、人气榜等盘中不断变化的数据，按所属市场的交易时段:
+    盘中秒级过期，收盘后冻结到下一个交易时段开始，夜间和节假日不访问上游
+  - reference: 代码表、板块名称、公司概况等很少变化的参考数据，过期后仍可在陈旧窗口内
+    立即返回旧结果，同时由一个后台任务刷新(stale-while-revalidate)
+  - daily: 普通日更数据表，小时级
+  - historical: 结束日期早于今天的历史区间，永不过期(仍受 LRU 容量淘汰)
+"""
+
+import datetime
+import fnmatch
+import inspect
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from .trading_calendar import RANGE_TOOLS, SESSION_DATE_TOOLS, trading_calendars
+
+logger = logging.getLogger(__name__)
+
+CST = ZoneInfo("Asia/Shanghai")
+
+REALTIME_TTL = float(os.getenv("AKSHARE_MCP_TTL_REALTIME", "5"))
+DAILY_TTL = float(os.getenv("AKSHARE_MCP_TTL_DAILY", str(4 * 3600)))
+REFERENCE_TTL = float(os.getenv("AKSHARE_MCP_TTL_REFERENCE", str(24 * 3600)))
+# 参考数据过期后仍可返回旧结果的时长(秒)
+REFERENCE_STALE = float(os.getenv("AKSHARE_MCP_STALE_REFERENCE", str(7 * 24 * 3600)))
+CACHE_MAX_BYTES = int(float(os.getenv("AKSHARE_MCP_CACHE_MB", "256")) * 1024 * 1024)
+CACHE_MAX_ENTRIES = int(os.getenv("AKSHARE_MCP_CACHE_ENTRIES", "4096"))
+
+REALTIME_PATTERNS = (
+    "*_spot*",
+    "stock_bid_ask_em",
+    "*_fund_flow_rank",
+    "stock_fund_flow_*",
+    "stock_main_fund_flow",
+    "stock_sector_fund_flow_summary",
+    "stock_hot_rank*_em",
+    "stock_hk_hot_rank*_em",
+    "stock_hot_up_em",
+    "stock_hot_keyword_em",
+)
+REFERENCE_PATTERNS = (
+    "stock_info_a_code_name",
+    "stock_info_*_name_code",
+    "stock_info_*_delist",
+    "stock_info_*change_name",
+    "stock_info_broker_sina",
+    "stock_board_*_name_em",
+    "stock_industry_category_cninfo",
+    "stock_industry_clf_hist_sw",
+    "stock_profile_cninfo",
+    "stock_individual_basic_info*_xq",
+    "stock_zh_ah_name",
+)
+# 名称中没有市场标识、需按其他市场交易时段过期的工具(A+H 比价随港股收盘)
+SESSION_MARKET_OVERRIDES = {
+    "stock_zh_ah_spot": "hk",
+    "stock_zh_ah_spot_em": "hk",
+}
+
+# 通用的区间参数对 (起始, 结束)，结束日期已过去的区间查询视为历史数据
+RANGE_PARAMS = (("start_date", "end_date"), ("start", "end"))
+# 会随除权事件整体变化的复权方式(前复权)，历史区间的结果也不能永久缓存
+VOLATILE_ADJUSTS = ("qfq",)
+
+SIZE_SAMPLE_ROWS = 200
+
+_DIGITS = re.compile(r"\D")
+
+
+class TTLClass:
+    REALTIME = "realtime"
+    REFERENCE = "reference"
+    DAILY = "daily"
+    HISTORICAL = "historical"
+
+
+def _parse_date(value: Any) -> Optional[datetime.date]:
+    """解析 20210616 / 2021-06-16 / 2021-06-16 09:32:00 等格式的日期"""
+    if not isinstance(value, str):
+        return None
+    digits = _DIGITS.sub("", value)[:8]
+    if len(digits) != 8:
+        return None
+    try:
+        return datetime.datetime.strptime(digits, "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def today_cst() -> datetime.date:
+    return datetime.datetime.now(CST).date()
+
+
+def session_calendar(name: str):
+    """按交易时段决定工具过期时间所用的市场日历"""
+    market = SESSION_MARKET_OVERRIDES.get(name)
+    return trading_calendars.get(market) if market else trading_calendars.for_tool(name)
+
+
+def classify_tool(name: str, arguments: Dict[str, Any]) -> str:
+    """根据工具名称和参数判断缓存类型"""
+    if any(fnmatch.fnmatchcase(name, pattern) for pattern in REALTIME_PATTERNS):
+        return TTLClass.REALTIME
+    if is_reference_tool(name):
+        return TTLClass.REFERENCE
+    if arguments.get("adjust") in VOLATILE_ADJUSTS:
+        return TTLClass.DAILY
+    param = _end_date_param(name, arguments)
+    if param is not None:
+        end = _parse_date(arguments[param])
+        # 按市场所在时区判断，美股当天的行情在北京时间次日凌晨才收盘
+        if end is not None and end < trading_calendars.for_tool(name).today():
+            return TTLClass.HISTORICAL
+    return TTLClass.DAILY
+
+
+def _end_date_param(name: str, arguments: Dict[str, Any]) -> Optional[str]:
+    """按交易日返回数据的工具中表示结束日期的参数名
+
+    报告期类工具(如 stock_yjbb_em 的 date)在报告期之后仍会陆续补充披露数据，不属于此类。
+    """
+    if name in SESSION_DATE_TOOLS:
+        return SESSION_DATE_TOOLS[name]
+    if name in RANGE_TOOLS:
+        return RANGE_TOOLS[name][1]
+    for start_param, end_param in RANGE_PARAMS:
+        if start_param in arguments and end_param in arguments:
+            return end_param
+    return None
+
+
+def ttl_for(name: str, arguments: Dict[str, Any]) -> Optional[float]:
+    """返回缓存过期秒数，None 表示永不过期"""
+    ttl_class = classify_tool(name, arguments)
+    if ttl_class == TTLClass.REALTIME:
+        return session_calendar(name).session_ttl(REALTIME_TTL)
+    if ttl_class == TTLClass.REFERENCE:
+        return REFERENCE_TTL
+    if ttl_class == TTLClass.HISTORICAL:
+        return None
+    return DAILY_TTL
+
+
+def stale_ttl_for(name: str) -> float:
+    """过期后仍可返回旧结果的秒数，只对参考数据工具生效"""
+    return REFERENCE_STALE if is_reference_tool(name) else 0.0
+
+
+def is_reference_tool(name: str) -> bool:
+    """过期后可先返回旧结果再后台刷新的参考数据工具"""
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in REFERENCE_PATTERNS)
+
+
+def canonical_arguments(
+    func: Callable[..., Any],
+    arguments: Dict[str, Any],
+    input_schema: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """用工具的默认参数补全调用参数
+
+    默认值取自 inputSchema 中的 ``default`` 以及 execute 函数签名，
+    使省略默认参数和显式传入默认值的调用得到相同的缓存键。
+    """
+    canonical: Dict[str, Any] = {}
+    properties = (input_schema or {}).get("properties", {})
+    for param, spec in properties.items():
+        if isinstance(spec, dict) and "default" in spec:
+            canonical[param] = spec["default"]
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        parameters = ()
+    for param in parameters:
+        if param.default is not inspect.Parameter.empty:
+            canonical[param.name] = param.default
+    canonical.update(arguments)
+    return canonical
+
+
+def make_key(name: str, canonical: Dict[str, Any]) -> str:
+    return name + ":" + json.dumps(canonical, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def estimate_size(value: Any) -> int:
+    """估算缓存值占用的内存字节数"""
+    if hasattr(value, "memory_usage"):
+        # 对 object 列逐个计算大小较慢，按前若干行抽样后放大
+        try:
+            rows = len(value)
+            sample = value.head(SIZE_SAMPLE_ROWS)
+            deep = int(sample.memory_usage(index=True, deep=True).sum())
+            return deep if rows <= SIZE_SAMPLE_ROWS else int(deep * rows / SIZE_SAMPLE_ROWS)
+        except Exception:
+            pass
+    if isinstance(value, list):
+        if not value:
+            return sys.getsizeof(value)
+        sample = value[: min(len(value), 20)]
+        per_item = sum(estimate_size(item) for item in sample) / len(sample)
+        return int(sys.getsizeof(value) + per_item * len(value))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items()
+        )
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """按字节容量淘汰的 LRU 结果缓存"""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        # key -> (value, expires_at, size, stored_at, stale_until)
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float], int, float, Optional[float]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """查询缓存，返回 (是否命中, 值)；过期但仍在陈旧窗口内的条目保留，供 get_stale 使用"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            value, expires_at, _, _, stale_until = entry
+            now = time.monotonic()
+            if expires_at is not None and expires_at <= now:
+                if stale_until is None or stale_until <= now:
+                    self._remove(key)
+                    self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def get_stale(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        """查询已过期但仍在陈旧窗口内的条目
+
+        Returns:
+            (值, 写入至今的秒数, 过期至今的秒数)，没有可用的旧结果时返回 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _, stored_at, stale_until = entry
+            now = time.monotonic()
+            if stale_until is None or stale_until <= now:
+                return None
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return value, now - stored_at, max(0.0, now - expires_at)
+
+    def put(self, key: str, value: Any, ttl: Optional[float], stale: float = 0.0) -> None:
+        """写入缓存，ttl 为 None 表示永不过期；stale 为过期后仍可作为旧结果返回的秒数"""
+        if ttl is not None and ttl <= 0:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        now = time.monotonic()
+        expires_at = None if ttl is None else now + ttl
+        stale_until = expires_at + stale if expires_at is not None and stale > 0 else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size, now, stale_until)
+            self._bytes += size
+            while self._entries and (
+                self._bytes > self.max_bytes or len(self._entries) > self.max_entries
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        size = self._entries.pop(key)[2]
+        self._bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+result_cache = ResultCache()
@@ -0,0 +1,105 @@
+"""
+工具调用分发表。
+
+每个工具名称只解析一次，缓存 ``apis.<name>`` 模块中的 ``execute`` 协程函数；
+找不到的名称会被负缓存，避免每次调用都走一遍失败的 import 流程。
+"""
+
+import importlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+API_PACKAGE = "apis"
+
+
+class ToolNotFoundError(ValueError):
+    """工具模块不存在或没有 execute 方法"""
+
+
+class ToolDispatcher:
+    """工具名称到 execute 函数的分发表"""
+
+    def __init__(self, package: str = API_PACKAGE):
+        self.package = package
+        self._table: Dict[str, Callable[..., Any]] = {}
+        self._missing: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, name: str) -> Callable[..., Any]:
+        """解析工具名称，返回对应模块的 execute 函数
+
+        Raises:
+            ToolNotFoundError: 工具模块不存在或没有 execute 方法
+        """
+        func = self.peek(name)
+        if func is not None:
+            return func
+        with self._lock:
+            return self._load(name)
+
+    def _load(self, name: str) -> Callable[..., Any]:
+        if name in self._table:
+            return self._table[name]
+        if name in self._missing:
+            raise ToolNotFoundError(self._missing[name])
+        self.misses += 1
+        try:
+            module = importlib.import_module(f"{self.package}.{name}")
+        except ImportError as e:
+            reason = f"Tool module {name} not found: {str(e)}"
+            # 只对模块本身不存在的情况做负缓存，依赖缺失等错误可能在安装后恢复
+            if getattr(e, "name", None) in (f"{self.package}.{name}", self.package):
+                self._missing[name] = reason
+            raise ToolNotFoundError(reason) from e
+        except SyntaxError as e:
+            reason = f"Tool module {name} failed to compile: {str(e)}"
+            self._missing[name] = reason
+            raise ToolNotFoundError(reason) from e
+        func = getattr(module, "execute", None)
+        if func is None:
+            reason = f"Module {name} does not have execute method"
+            self._missing[name] = reason
+            raise ToolNotFoundError(reason)
+        self._table[name] = func
+        return func
+
+    def peek(self, name: str) -> Optional[Callable[..., Any]]:
+        """只查询缓存，不触发导入
+
+        Returns:
+            已解析的 execute 函数；尚未解析时返回None
+
+        Raises:
+            ToolNotFoundError: 名称已被负缓存
+        """
+        func = self._table.get(name)
+        if func is not None:
+            self.hits += 1
+            return func
+        reason = self._missing.get(name)
+        if reason is not None:
+            self.hits += 1
+            raise ToolNotFoundError(reason)
+        return None
+
+    def invalidate(self) -> None:
+        """清空分发表和负缓存(工具注册表变化时调用)"""
+        with self._lock:
+            self._table.clear()
+            self._missing.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "resolved": len(self._table),
+            "negative_cached": len(self._missing),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+dispatcher = ToolDispatcher()
@@ -0,0 +1,288 @@
+"""
+工具执行线程池与事件循环延迟监控。
+
+生成的 apis 模块大多在 ``async def execute`` 中直接同步调用 akshare，
+若在主事件循环上 await 会阻塞整个 stdio 服务。这里把每个工具体放到
+独立的有界线程池中运行，每个工作线程持有自己的事件循环。
+
+调用方被取消(客户端取消请求、断开连接或调用超时)时，尚未开始的任务直接丢弃；
+已在运行的任务被标记为取消，工作线程在下一次发起 HTTP 请求(即下一页)时放弃执行。
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = int(os.getenv("AKSHARE_MCP_MAX_WORKERS", "8"))
+DEFAULT_LAG_INTERVAL = float(os.getenv("AKSHARE_MCP_LAG_INTERVAL", "0.05"))
+
+
+class ToolCancelled(BaseException):
+    """工具任务的调用方已取消
+
+    继承 BaseException，与 asyncio.CancelledError 一样不会被工具代码中的 ``except Exception`` 吞掉。
+    """
+
+
+class _Job:
+    __slots__ = ("started", "cancelled", "cancelled_at")
+
+    def __init__(self):
+        self.started = False
+        self.cancelled = False
+        self.cancelled_at = 0.0
+
+
+_current_job: contextvars.ContextVar[Optional[_Job]] = contextvars.ContextVar("akshare_mcp_job", default=None)
+
+
+def checkpoint() -> None:
+    """当前工具任务已被取消时抛出 ToolCancelled，在工作线程中调用"""
+    job = _current_job.get()
+    if job is not None and job.cancelled:
+        raise ToolCancelled("Tool call was cancelled by the caller")
+
+
+_requests_hooked = False
+_hook_lock = threading.Lock()
+
+
+def _hook_requests() -> None:
+    """在 requests 的每次发送前检查取消，多页抓取在下一页之前停止"""
+    global _requests_hooked
+    if _requests_hooked:
+        return
+    with _hook_lock:
+        if _requests_hooked:
+            return
+        import requests
+
+        send = requests.Session.send
+
+        def _send(session, request, **kwargs):
+            checkpoint()
+            return send(session, request, **kwargs)
+
+        requests.Session.send = _send
+        _requests_hooked = True
+
+
+class _InlineExecutor(ThreadPoolExecutor):
+    """在调用线程内同步执行的执行器
+
+    作为工作线程事件循环的默认执行器，使模块内部的
+    ``run_in_executor(None, ...)`` 直接在当前工作线程运行，不再额外派生线程。
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        if not future.set_running_or_notify_cancel():
+            return future
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+        return future
+
+
+class ToolExecutor:
+    """有界的工具执行线程池"""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="akshare-tool"
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._jobs: Set[_Job] = set()
+        # 取消统计: 开始前丢弃的任务、在分页边界放弃的任务、取消后仍运行完成的任务及其多耗的时间
+        self._dropped = 0
+        self._abandoned = 0
+        self._finished_after_cancel = 0
+        self._wasted_seconds = 0.0
+
+    def _worker_loop(self) -> asyncio.AbstractEventLoop:
+        """获取当前工作线程的事件循环，首次调用时创建"""
+        loop = getattr(self._local, "loop", None)
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            loop.set_default_executor(_InlineExecutor(max_workers=1))
+            asyncio.set_event_loop(loop)
+            self._local.loop = loop
+        return loop
+
+    def _invoke(self, job: _Job, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+        with self._lock:
+            if job.cancelled:
+                # 排队期间已取消，不再执行
+                self._jobs.discard(job)
+                raise ToolCancelled("Tool call was cancelled before it started")
+            job.started = True
+            self._running += 1
+        _current_job.set(job)
+        stopped = False
+        try:
+            result = func(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                result = self._worker_loop().run_until_complete(result)
+            with self._lock:
+                self._completed += 1
+            return result
+        except ToolCancelled:
+            stopped = True
+            raise
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._jobs.discard(job)
+                if job.cancelled:
+                    if stopped:
+                        self._abandoned += 1
+                    else:
+                        self._finished_after_cancel += 1
+                    self._wasted_seconds += time.monotonic() - job.cancelled_at
+
+    def _submit(self, job: _Job, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Future:
+        _hook_requests()
+        with self._lock:
+            self._submitted += 1
+            self._jobs.add(job)
+        # 调用方的上下文变量(如进度报告器)随任务传入工作线程
+        return self._pool.submit(contextvars.copy_context().run, self._invoke, job, func, args, kwargs)
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """提交同步函数或协程函数到线程池，返回 concurrent Future"""
+        return self._submit(_Job(), func, args, kwargs)
+
+    async def run(self, func: Callable[..., Awaitable[Any] | Any], *args: Any, **kwargs: Any) -> Any:
+        """在线程池中执行工具函数并等待结果，不阻塞调用方事件循环
+
+        调用方被取消时，未开始的任务被丢弃，运行中的任务在下一次 HTTP 请求前停止。
+        """
+        job = _Job()
+        future = self._submit(job, func, args, kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self._cancel(job, future)
+            raise
+
+    def _cancel(self, job: _Job, future: Future) -> None:
+        with self._lock:
+            # wrap_future 可能已把取消传给了排队中的 future
+            if job.cancelled or (future.done() and not future.cancelled()):
+                return
+            job.cancelled = True
+            job.cancelled_at = time.monotonic()
+            if not job.started:
+                self._dropped += 1
+                self._jobs.discard(job)
+        future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """线程池运行统计"""
+        with self._lock:
+            finished = self._completed + self._failed + self._dropped + self._abandoned
+            return {
+                "max_workers": self.max_workers,
+                "running": self._running,
+                "queued": self._submitted - finished - self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "cancelled_before_start": self._dropped,
+                "abandoned_after_cancel": self._abandoned,
+                "finished_after_cancel": self._finished_after_cancel,
+                "wasted_seconds": round(self._wasted_seconds, 3),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        # 运行中的任务在下一页之前停止，排队中的任务直接丢弃
+        with self._lock:
+            for job in self._jobs:
+                if not job.cancelled:
+                    job.cancelled = True
+                    job.cancelled_at = time.monotonic()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class LoopLagMonitor:
+    """事件循环延迟监控
+
+    周期性 sleep 固定间隔，实际唤醒时间超出预期的部分即为循环被阻塞的时长。
+    """
+
+    def __init__(self, interval: float = DEFAULT_LAG_INTERVAL, window: int = 1200):
+        self.interval = interval
+        self._samples: deque = deque(maxlen=window)
+        self._max_lag = 0.0
+        self._count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._samples.append(lag)
+            self._count += 1
+            if lag > self._max_lag:
+                self._max_lag = lag
+                if lag > 0.1:
+                    logger.warning(f"Event loop stalled for {lag * 1000:.1f} ms")
+
+    def stats(self) -> Dict[str, float]:
+        """返回延迟统计(毫秒)"""
+        samples = sorted(self._samples)
+        if not samples:
+            return {"samples": 0, "last_ms": 0.0, "avg_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "samples": self._count,
+            "last_ms": round(self._samples[-1] * 1000, 3),
+            "avg_ms": round(sum(samples) / len(samples) * 1000, 3),
+            "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+            "max_ms": round(self._max_lag * 1000, 3),
+        }
+
+
+_executor: Optional[ToolExecutor] = None
+_executor_lock = threading.Lock()
+lag_monitor = LoopLagMonitor()
+
+
+def get_executor() -> ToolExecutor:
+    """获取进程级工具线程池"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ToolExecutor()
+    return _executor
@@ -0,0 +1,173 @@
+"""
+工具结果的序列化格式。
+
+每个工具都接受可选的 ``format`` 参数:
+  - records: 每行一个对象，带缩进(原有格式)
+  - columns: ``{"columns": [...], "rows": [[...], ...]}``，列名只出现一次
+  - compact: 每行一个对象，无缩进
+未指定时按行数自动选择: 小结果用 records，大结果用 columns。
+"""
+
+import json
+import os
+from typing import Any, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时使用标准库 json
+    orjson = None
+
+FORMAT_RECORDS = "records"
+FORMAT_COLUMNS = "columns"
+FORMAT_COMPACT = "compact"
+FORMATS = (FORMAT_RECORDS, FORMAT_COLUMNS, FORMAT_COMPACT)
+
+# 超过该行数时默认使用 columns 格式
+COLUMNAR_THRESHOLD = int(os.getenv("AKSHARE_MCP_COLUMNAR_THRESHOLD", "100"))
+
+# 超过该行数时在线程中序列化，避免阻塞事件循环
+SERIALIZE_OFFLOAD_ROWS = 500
+
+# 注入到每个工具 inputSchema 中的服务端参数
+SERVER_ARGUMENTS: Dict[str, Dict[str, Any]] = {
+    "format": {
+        "type": "string",
+        "enum": list(FORMATS),
+        "description": (
+            "返回格式: records(逐行对象), columns(列名+数组行，体积最小), compact(逐行对象无缩进); "
+            f"默认超过{COLUMNAR_THRESHOLD}行时使用columns"
+        ),
+    },
+    "columns": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "只返回指定的列",
+    },
+    "where": {
+        "description": (
+            "行过滤条件，如 \"涨跌幅 > 5\"、\"名称 contains 银行\"；"
+            "支持 == != > >= < <= contains startswith，多个条件用列表或 and 连接"
+        ),
+        "anyOf": [{"type": "string"}, {"type": "array", "items": {"type": "string"}}],
+    },
+    "sort_by": {
+        "description": "排序列，列名前加 - 表示降序，如 \"-成交额\"",
+        "anyOf": [{"type": "string"}, {"type": "array", "items": {"type": "string"}}],
+    },
+    "limit": {"type": "integer", "minimum": 0, "description": "最多返回的行数"},
+    "offset": {"type": "integer", "description": "跳过的行数，负数表示从末尾倒数，如 -20 取最后20行"},
+    "page_size": {
+        "type": "integer",
+        "minimum": 1,
+        "description": "每页行数，结果超过一页时只返回第一页和 next_cursor",
+    },
+    "cursor": {
+        "type": "string",
+        "description": "上一页返回的 next_cursor，用于获取后续页面(不会重新执行工具)",
+    },
+}
+
+# 作用于表格结果的查询参数
+QUERY_ARGUMENTS = ("columns", "where", "sort_by", "limit", "offset")
+
+
+def split_arguments(arguments: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """拆分出服务端参数，返回 (工具参数, 服务端参数)"""
+    tool_args = {k: v for k, v in arguments.items() if k not in SERVER_ARGUMENTS}
+    options = {k: v for k, v in arguments.items() if k in SERVER_ARGUMENTS}
+    return tool_args, options
+
+
+def validate_options(options: Dict[str, Any]) -> None:
+    """在访问上游之前校验服务端参数"""
+    fmt = options.get("format")
+    if fmt and fmt not in FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    for param in ("limit", "offset", "page_size"):
+        value = options.get(param)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+            raise ValueError(f"{param} must be an integer, got {value!r}")
+    if options.get("limit") is not None and options["limit"] < 0:
+        raise ValueError(f"limit must be >= 0, got {options['limit']}")
+    if options.get("page_size") is not None and options["page_size"] < 1:
+        raise ValueError(f"page_size must be >= 1, got {options['page_size']}")
+    if options.get("cursor") is not None and not isinstance(options["cursor"], str):
+        raise ValueError(f"cursor must be a string, got {options['cursor']!r}")
+    if options.get("where"):
+        from .query import parse_conditions
+
+        parse_conditions(options["where"])
+
+
+def row_count(result: Any) -> int:
+    if hasattr(result, "to_dict") or isinstance(result, list):
+        return len(result)
+    return 0
+
+
+def resolve_format(result: Any, requested: Any = None) -> str:
+    """确定输出格式，未指定时按行数选择"""
+    if requested:
+        validate_options({"format": requested})
+        return requested
+    return FORMAT_COLUMNS if row_count(result) > COLUMNAR_THRESHOLD else FORMAT_RECORDS
+
+
+def _json_default(value: Any) -> Any:
+    """编码器无法处理的类型(numpy 标量、时间等)的兜底转换"""
+    from .normalize import normalize_scalar
+
+    return normalize_scalar(value)
+
+
+if orjson is not None:
+    def dumps(payload: Any, indent: bool = False) -> str:
+        """JSON 编码，安装了 orjson 时使用 orjson"""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(payload, default=_json_default, option=option).decode("utf-8")
+else:
+    def dumps(payload: Any, indent: bool = False) -> str:
+        """JSON 编码，安装了 orjson 时使用 orjson"""
+        if indent:
+            return json.dumps(payload, ensure_ascii=False, indent=2, default=_json_default)
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+
+
+def to_payload(result: Any, fmt: str) -> Any:
+    """把工具结果转换为指定格式的可 JSON 序列化对象"""
+    # normalize 依赖 pandas，延迟导入以免拖慢服务启动
+    from .normalize import column_values, is_frame, normalize_result
+
+    frame = normalize_result(result)
+    if not is_frame(frame):
+        return frame
+    names = list(frame.columns)
+    rows = zip(*column_values(frame)) if names else iter(())
+    if fmt == FORMAT_COLUMNS:
+        return {"columns": names, "rows": list(rows)}
+    return [dict(zip(names, row)) for row in rows]
+
+
+def serialize(result: Any, requested: Any = None) -> str:
+    """按指定或自动选择的格式序列化工具结果"""
+    fmt = resolve_format(result, requested)
+    return dumps(to_payload(result, fmt), indent=fmt == FORMAT_RECORDS)
+
+
+def apply_options(result: Any, options: Dict[str, Any]) -> Any:
+    """应用列投影/过滤/排序/分页参数，未指定查询参数时原样返回"""
+    if any(options.get(param) is not None for param in QUERY_ARGUMENTS):
+        from .normalize import is_frame, normalize_result
+        from .query import apply_query
+
+        result = normalize_result(result)
+        if is_frame(result):
+            result = apply_query(result, options)
+    return result
+
+
+def render(result: Any, options: Dict[str, Any]) -> str:
+    """应用列投影/过滤/排序/分页后序列化工具结果"""
+    return serialize(apply_options(result, options), options.get("format"))
@@ -0,0 +1,285 @@
+"""
+后台批量任务。
+
+``submit_job`` 把一个工具按某个参数(证券代码或日期)展开为一组调用，在后台以有限并发执行，
+立即返回任务 ID；``job_status`` 查询进度，``job_result`` 读取合并后的结果(每行带展开参数的值)。
+每次调用都走普通工具调用的完整路径: 交易日历、结果缓存、本地存储以及数据源限流与熔断。
+
+每个任务项的结果写入本地列式存储，任务账本保存在 sqlite 中。服务重启后，未完成的任务
+从尚未完成的任务项继续执行，已写入的结果不会重新下载。
+"""
+
+import asyncio
+import datetime
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from persistence.job_repository import DONE, EMPTY, FAILED, PENDING, RUNNING, JobRepository
+
+from .batch import require_tool
+from .breaker import PROBE_RETRY_DELAY, CircuitOpenError
+from .store import DATA_DIR
+from .trading_calendar import format_like, parse_day, trading_calendars
+
+logger = logging.getLogger(__name__)
+
+JOB_DIR = DATA_DIR / "jobs"
+# 单个任务的默认并发调用数与上限，实际并发还受数据源限流约束
+JOB_CONCURRENCY = int(os.getenv("AKSHARE_MCP_JOB_CONCURRENCY", "4"))
+JOB_MAX_CONCURRENCY = 16
+JOB_MAX_ITEMS = int(os.getenv("AKSHARE_MCP_JOB_MAX_ITEMS", "20000"))
+# 单个任务项的最多尝试次数，重试间隔按次数递增
+JOB_ATTEMPTS = 3
+RETRY_DELAY = 2.0
+
+ToolRunner = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+class JobManager:
+    """批量任务的提交、执行与恢复"""
+
+    def __init__(self, root=JOB_DIR):
+        self.root = root
+        self._repo: Optional[JobRepository] = None
+        self._runner: Optional[ToolRunner] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # 任务 ID -> (本次运行开始时间, 本次运行完成的任务项数)，用于估算剩余时间
+        self._progress: Dict[str, List[float]] = {}
+        self.submitted = 0
+        self.resumed = 0
+        self.items_run = 0
+        self.items_failed = 0
+        self.breaker_waits = 0
+
+    @property
+    def repo(self) -> JobRepository:
+        if self._repo is None:
+            self._repo = JobRepository(self.root / "jobs.db")
+        return self._repo
+
+    def start(self, runner: ToolRunner) -> None:
+        """设置工具调用函数，并恢复上次退出时未完成的任务"""
+        self._runner = runner
+        try:
+            unfinished = self.repo.unfinished_jobs()
+        except Exception as e:
+            logger.warning(f"Failed to read job ledger: {e}")
+            return
+        for job_id in unfinished:
+            self.resumed += 1
+            logger.info(f"Resuming job {job_id}")
+            self._launch(job_id)
+
+    def stop(self) -> None:
+        # 账本中仍为 running，下次启动时继续
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+
+    def _launch(self, job_id: str) -> None:
+        task = asyncio.get_running_loop().create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def expand_values(self, tool: str, spec: Dict[str, Any]) -> List[Any]:
+        """根据 values / values_from / date_range 生成展开参数的取值列表"""
+        given = [key for key in ("values", "values_from", "date_range") if spec.get(key) is not None]
+        if len(given) != 1:
+            raise ValueError("Exactly one of values, values_from or date_range is required")
+        if spec.get("values") is not None:
+            values = spec["values"]
+            if not isinstance(values, list):
+                raise ValueError("values must be an array")
+        elif spec.get("values_from") is not None:
+            source = spec["values_from"]
+            if not isinstance(source, dict) or not source.get("tool") or not source.get("column"):
+                raise ValueError("values_from requires tool and column")
+            from .normalize import to_frame
+
+            frame = to_frame(await self._runner(source["tool"], dict(source.get("arguments") or {})))
+            if frame is None or source["column"] not in frame.columns:
+                raise ValueError(f"Column {source['column']!r} not found in result of {source['tool']}")
+            values = [str(value) for value in frame[source["column"]].tolist() if value is not None]
+        else:
+            date_range = spec["date_range"]
+            start = parse_day(date_range.get("start"))
+            end = parse_day(date_range.get("end")) or datetime.date.today()
+            if start is None:
+                raise ValueError(f"Invalid date_range start {date_range.get('start')!r}")
+            calendar = trading_calendars.for_tool(tool)
+            end = min(end, calendar.today())
+            values, day = [], calendar.next_session(start)
+            while day <= end:
+                values.append(format_like(str(date_range["start"]), day, end=False))
+                day = calendar.next_session(day, inclusive=False)
+        values = list(dict.fromkeys(values))
+        if not values:
+            raise ValueError("Job has no values to run")
+        if len(values) > JOB_MAX_ITEMS:
+            raise ValueError(f"Job has {len(values)} values, more than the limit of {JOB_MAX_ITEMS}")
+        return values
+
+    async def submit(self, tool: str, fan_out: str, arguments: Dict[str, Any], spec: Dict[str, Any],
+                     concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """登记并启动任务，返回任务状态"""
+        if self._runner is None:
+            raise RuntimeError("Job manager is not started")
+        definition = require_tool(tool)
+        properties = (definition.inputSchema or {}).get("properties") or {}
+        if fan_out not in properties:
+            raise ValueError(f"Tool {tool} has no parameter {fan_out!r}")
+        concurrency = concurrency or JOB_CONCURRENCY
+        if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+            raise ValueError(f"concurrency must be a positive integer, got {concurrency!r}")
+        concurrency = min(concurrency, JOB_MAX_CONCURRENCY)
+
+        values = await self.expand_values(tool, spec)
+        job_id = uuid.uuid4().hex[:12]
+        await asyncio.to_thread(self.repo.create_job, job_id, tool, fan_out, arguments, concurrency, values)
+        self.submitted += 1
+        self._launch(job_id)
+        return await self.status(job_id)
+
+    async def _run(self, job_id: str) -> None:
+        job = await asyncio.to_thread(self.repo.get_job, job_id)
+        items = await asyncio.to_thread(self.repo.pending_items, job_id)
+        await asyncio.to_thread(self.repo.set_job_status, job_id, RUNNING)
+        self._progress[job_id] = [time.monotonic(), 0]
+        pending = iter(items)
+
+        async def worker() -> None:
+            for seq, value in pending:
+                await self._run_item(job, seq, value)
+                self._progress[job_id][1] += 1
+
+        try:
+            await asyncio.gather(*[worker() for _ in range(min(job["concurrency"], len(items)))])
+            summary = await asyncio.to_thread(self.repo.item_summary, job_id)
+            failed = summary.get(FAILED, {}).get("items", 0)
+            await asyncio.to_thread(self.repo.set_job_status, job_id, FAILED if failed == job["total"] else DONE)
+            logger.info(f"Job {job_id} finished: {summary}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+            await asyncio.to_thread(self.repo.set_job_status, job_id, FAILED, str(e))
+
+    async def _run_item(self, job: Dict[str, Any], seq: int, value: Any) -> None:
+        arguments = {**job["arguments"], job["fan_out"]: value}
+        status, rows, error, attempt = FAILED, 0, None, 0
+        while attempt < JOB_ATTEMPTS:
+            try:
+                result = await self._runner(job["tool"], arguments)
+                rows = await asyncio.to_thread(self._write_item, job["job_id"], seq, result)
+                status, error, attempt = (DONE if rows else EMPTY), None, attempt + 1
+                break
+            except CircuitOpenError as e:
+                # 熔断期间没有访问上游，等熔断器放行后重试，不消耗尝试次数
+                self.breaker_waits += 1
+                await asyncio.sleep(max(e.retry_in, PROBE_RETRY_DELAY))
+                continue
+            except TypeError as e:
+                # 参数错误，重试没有意义
+                attempt += 1
+                error = str(e)
+                break
+            except Exception as e:
+                attempt += 1
+                error = str(e)
+                if attempt < JOB_ATTEMPTS:
+                    await asyncio.sleep(RETRY_DELAY * attempt)
+        self.items_run += 1
+        if status == FAILED:
+            self.items_failed += 1
+            logger.warning(f"Job {job['job_id']} item {job['fan_out']}={value!r} failed: {error}")
+        await asyncio.to_thread(self.repo.finish_item, job["job_id"], seq, status, rows, attempt, error)
+
+    def _write_item(self, job_id: str, seq: int, result: Any) -> int:
+        """把任务项结果按数值类型写入列式分区(缺失值为 NaN)，返回行数"""
+        from .normalize import restore_numeric, to_frame
+        from .store.columnar import write_partition
+
+        frame = to_frame(result)
+        if frame is None or frame.empty:
+            return 0
+        frame = restore_numeric(frame)
+        integers = [str(name) for name, series in frame.items() if str(series.dtype) == "Int64"]
+        write_partition(self.root / job_id / f"{seq:06d}", frame, {"integers": integers})
+        return len(frame)
+
+    async def status(self, job_id: str) -> Dict[str, Any]:
+        job = await asyncio.to_thread(self.repo.get_job, job_id)
+        if job is None:
+            raise ValueError(f"Unknown job {job_id!r}")
+        summary = await asyncio.to_thread(self.repo.item_summary, job_id)
+        counts = {status: summary.get(status, {}).get("items", 0) for status in (DONE, EMPTY, FAILED, PENDING)}
+        finished = job["total"] - counts[PENDING]
+        status = {
+            "job_id": job_id,
+            "tool": job["tool"],
+            "fan_out": job["fan_out"],
+            "status": job["status"],
+            "running": job_id in self._tasks,
+            "total": job["total"],
+            "finished": finished,
+            "progress": round(finished / job["total"], 4) if job["total"] else 1.0,
+            "items": counts,
+            "rows": summary.get(DONE, {}).get("rows", 0),
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+        }
+        progress = self._progress.get(job_id)
+        if job_id in self._tasks and progress and progress[1]:
+            elapsed = time.monotonic() - progress[0]
+            status["eta_seconds"] = round(elapsed / progress[1] * counts[PENDING], 1)
+        if job["error"]:
+            status["error"] = job["error"]
+        if counts[FAILED]:
+            status["failed_items"] = await asyncio.to_thread(self.repo.failed_items, job_id)
+        return status
+
+    async def result(self, job_id: str) -> Any:
+        """合并已完成任务项的结果，第一列为展开参数的值"""
+        job = await asyncio.to_thread(self.repo.get_job, job_id)
+        if job is None:
+            raise ValueError(f"Unknown job {job_id!r}")
+        items = await asyncio.to_thread(self.repo.completed_items, job_id)
+        return await asyncio.to_thread(self._read_items, job_id, job["fan_out"], items)
+
+    def _read_items(self, job_id: str, fan_out: str, items: List[Any]) -> Any:
+        import pandas as pd
+
+        from .normalize import normalize_frame
+        from .store.columnar import read_meta, read_partition
+
+        frames = []
+        for seq, value in items:
+            path = self.root / job_id / f"{seq:06d}"
+            frame = read_partition(path)
+            if frame is None:
+                continue
+            for name in (read_meta(path) or {}).get("integers", []):
+                frame[name] = frame[name].astype("Int64")
+            if fan_out not in frame.columns:
+                frame.insert(0, fan_out, value)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame({fan_out: []})
+        # 分区中缺失值为 NaN，读出后再规范化为 None
+        return normalize_frame(pd.concat(frames, ignore_index=True))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running_jobs": len(self._tasks),
+            "submitted": self.submitted,
+            "resumed": self.resumed,
+            "items_run": self.items_run,
+            "items_failed": self.items_failed,
+            "breaker_waits": self.breaker_waits,
+        }
+
+
+job_manager = JobManager()
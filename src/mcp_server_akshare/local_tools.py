@@ -0,0 +1,287 @@
+"""
+由本地存储提供的工具实现。
+
+这里注册的函数替代对应工具模块的 execute 方法，在工具线程池中同步执行，
+仍然经过结果缓存、请求合并、数据源限流与熔断。
+存储模块依赖 pandas，统一在函数内延迟导入，不影响服务启动速度。
+"""
+
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 设置为 0 时关闭本地存储，所有调用直接访问上游
+LOCAL_STORE_ENABLED = os.getenv("AKSHARE_MCP_LOCAL_STORE", "1") != "0"
+
+_local_tools: Dict[str, Callable[..., Any]] = {}
+
+
+def local_tool(name: str):
+    """注册由本地存储提供的工具实现"""
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        _local_tools[name] = func
+        return func
+    return decorator
+
+
+def get_local_tool(name: str) -> Optional[Callable[..., Any]]:
+    """获取工具的本地实现，未注册或已关闭本地存储时返回 None"""
+    if not LOCAL_STORE_ENABLED:
+        return None
+    return _local_tools.get(name)
+
+
+# 支持由本地不复权日线计算复权数据的存储 -> 复权引擎
+_ADJUSTERS = {
+    "stock_hist_store": "a_adjuster",
+    "hk_hist_store": "hk_adjuster",
+    "us_hist_store": "us_adjuster",
+}
+
+
+def _daily_bars(store_name: str, symbol: str, start_date: str, end_date: str,
+                adjust: str, **fetch_kwargs: Any) -> Any:
+    """读取日线，复权数据优先由本地不复权日线和复权系数计算"""
+    from .store import history
+
+    store = getattr(history, store_name)
+    if adjust and store_name in _ADJUSTERS:
+        from .store import adjust as adjustment
+
+        engine = getattr(adjustment, _ADJUSTERS[store_name])
+        bars = engine.get(symbol, start_date, end_date, adjust, **fetch_kwargs)
+        if bars is not None:
+            return bars
+    return store.get(symbol, start_date, end_date, "daily", adjust, **fetch_kwargs)
+
+
+def _daily_history(store_name: str, symbol: str, period: str, start_date: str, end_date: str,
+                   adjust: str, **fetch_kwargs: Any) -> Any:
+    """从日线存储读取，周线、月线由日线合成
+
+    周期 K 线包含 start_date 之前的同周/同月交易日，并需要上一根 K 线计算涨跌幅，
+    因此向前多读取一个周期的日线，再按 K 线日期截取。
+    """
+    import pandas as pd
+
+    from .store import history
+    from .store.resample import period_lookback, resample_daily
+
+    if period == "daily":
+        return _daily_bars(store_name, symbol, start_date, end_date, adjust, **fetch_kwargs)
+    start = pd.Timestamp(history.parse_date(start_date))
+    lookback = period_lookback(start, period).strftime("%Y%m%d")
+    daily = _daily_bars(store_name, symbol, lookback, end_date, adjust, **fetch_kwargs)
+    bars = resample_daily(daily, period)
+    if bars.empty:
+        return bars
+    return bars[bars[history.DATE_COLUMN] >= start].reset_index(drop=True)
+
+
+@local_tool("stock_zh_a_hist")
+def stock_zh_a_hist(
+    symbol: str,
+    period: str = "daily",
+    start_date: str = "20210301",
+    end_date: str = "20210616",
+    adjust: str = "",
+    timeout: float = None,
+) -> Any:
+    """A 股历史行情，已缓存的日期从本地分区读取，缺失部分增量拉取"""
+    return _daily_history("stock_hist_store", symbol, period, start_date, end_date, adjust, timeout=timeout)
+
+
+@local_tool("stock_hk_hist")
+def stock_hk_hist(
+    symbol: str,
+    period: str = "daily",
+    start_date: str = "19700101",
+    end_date: str = "22220101",
+    adjust: str = "",
+) -> Any:
+    """港股历史行情，周线、月线由本地日线合成"""
+    return _daily_history("hk_hist_store", symbol, period, start_date, end_date, adjust)
+
+
+@local_tool("stock_us_hist")
+def stock_us_hist(
+    symbol: str,
+    period: str = "daily",
+    start_date: str = "20210101",
+    end_date: str = "20210601",
+    adjust: str = "",
+) -> Any:
+    """美股历史行情，周线、月线由本地日线合成"""
+    return _daily_history("us_hist_store", symbol, period, start_date, end_date, adjust)
+
+
+@local_tool("stock_board_industry_hist_em")
+def stock_board_industry_hist_em(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    period: str = "日k",
+    adjust: str = "",
+) -> Any:
+    """行业板块历史行情，周k、月k由本地日k合成"""
+    from .store.history import BOARD_INDUSTRY_PERIODS
+
+    periods = {label: name for name, label in BOARD_INDUSTRY_PERIODS.items()}
+    if period not in periods:
+        raise ValueError(f"Unsupported period {period!r}, expected one of {', '.join(periods)}")
+    return _daily_history("board_industry_hist_store", symbol, periods[period], start_date, end_date, adjust)
+
+
+@local_tool("stock_board_concept_hist_em")
+def stock_board_concept_hist_em(
+    symbol: str,
+    period: str = "daily",
+    start_date: str = "20220101",
+    end_date: str = "20221128",
+    adjust: str = "",
+) -> Any:
+    """概念板块历史行情，周线、月线由本地日线合成"""
+    return _daily_history("board_concept_hist_store", symbol, period, start_date, end_date, adjust)
+
+
+@local_tool("stock_zh_a_hist_min_em")
+def stock_zh_a_hist_min_em(
+    symbol: str,
+    start_date: str = "1979-09-01 09:32:00",
+    end_date: str = "2222-01-01 09:32:00",
+    period: str = "5",
+    adjust: str = "",
+) -> Any:
+    """A 股分钟线，已收盘交易日从本地分区读取
+
+    5/15/30/60 分钟线由 1 分钟线合成，复权数据由不复权分钟线和日线复权系数计算。
+    """
+    from .store.minute import a_minute_store
+
+    if adjust:
+        from .store.adjust import a_adjuster
+
+        table = a_adjuster.table(symbol, adjust)
+        if table is not None:
+            return table.apply(stock_zh_a_hist_min_em(symbol, start_date, end_date, period, ""), "时间")
+        import akshare as ak
+
+        return ak.stock_zh_a_hist_min_em(
+            symbol=symbol, start_date=start_date, end_date=end_date, period=period, adjust=adjust,
+        )
+    if period != "1":
+        derived = _derive_a_minute_bars(symbol, start_date, end_date, period)
+        if derived is not None:
+            return derived
+    return a_minute_store.get(symbol, start_date, end_date, period, adjust)
+
+
+# 上游 1 分钟线保留的交易日数
+MINUTE_SESSIONS = 5
+
+
+def _derive_a_minute_bars(symbol: str, start_date: str, end_date: str, period: str) -> Any:
+    """由本地 1 分钟线合成 A 股分钟 K 线
+
+    上游 1 分钟线只保留最近几个交易日，请求范围早于 1 分钟线的最早日期时返回 None，
+    由调用方改为读取该周期自身的 K 线；尚未探测到上游边界时按交易日历估计，
+    不为此下载 1 分钟线。换手率需要流通股，取不到时同样返回 None。
+    """
+    import pandas as pd
+
+    from .store.minute import a_minute_store
+    from .store.resample import MINUTE_PERIODS, lookback_start, resample_minutes
+    from .trading_calendar import trading_calendars
+
+    if period not in MINUTE_PERIODS:
+        return None
+    start = pd.Timestamp(start_date)
+    available = a_minute_store.available_from(symbol, "1", "")
+    if available is None:
+        calendar = trading_calendars.get("a")
+        available = calendar.today()
+        for _ in range(MINUTE_SESSIONS - 1):
+            available = calendar.previous_session(available, inclusive=False)
+    if start.date() < available:
+        return None
+    float_shares = _a_float_shares(symbol)
+    if not float_shares:
+        return None
+    minutes = a_minute_store.get(symbol, lookback_start(start), end_date, "1", "")
+    available = a_minute_store.available_from(symbol, "1", "")
+    if minutes.empty or (available is not None and start.date() < available):
+        return None
+    bars = resample_minutes(minutes, period, float_shares=float_shares)
+    times = bars["时间"]
+    return bars[(times >= start) & (times <= pd.Timestamp(end_date))].reset_index(drop=True)
+
+
+# 代码 -> 流通股，每天最多查询一次
+_float_shares: Dict[str, float] = {}
+_float_shares_day: List[Any] = [None]
+
+
+def _a_float_shares(symbol: str) -> Optional[float]:
+    """A 股当前流通股(股)，查询失败时返回 None"""
+    import akshare as ak
+
+    from .cache import today_cst
+
+    if _float_shares_day[0] != today_cst():
+        _float_shares.clear()
+        _float_shares_day[0] = today_cst()
+    if symbol not in _float_shares:
+        try:
+            info = ak.stock_individual_info_em(symbol=symbol)
+            value = info.loc[info["item"] == "流通股", "value"]
+            if len(value):
+                _float_shares[symbol] = float(value.iloc[0])
+        except Exception as e:
+            logger.warning(f"Failed to fetch float shares of {symbol}: {e}")
+    return _float_shares.get(symbol)
+
+
+@local_tool("stock_hk_hist_min_em")
+def stock_hk_hist_min_em(
+    symbol: str,
+    period: str = "5",
+    adjust: str = "",
+    start_date: str = "1979-09-01 09:32:00",
+    end_date: str = "2222-01-01 09:32:00",
+) -> Any:
+    """港股分钟线，已收盘交易日从本地分区读取"""
+    from .store.minute import hk_minute_store
+
+    if adjust == "qfq":
+        import akshare as ak
+
+        return ak.stock_hk_hist_min_em(
+            symbol=symbol, period=period, adjust=adjust, start_date=start_date, end_date=end_date,
+        )
+    return hk_minute_store.get(symbol, start_date, end_date, period, adjust)
+
+
+@local_tool("stock_us_hist_min_em")
+def stock_us_hist_min_em(
+    symbol: str,
+    start_date: str = "1979-09-01 09:32:00",
+    end_date: str = "2222-01-01 09:32:00",
+) -> Any:
+    """美股分钟线，已收盘交易日从本地分区读取"""
+    from .store.minute import us_minute_store
+
+    return us_minute_store.get(symbol, start_date, end_date, "1", "")
+
+
+@local_tool("stock_zh_a_minute")
+def stock_zh_a_minute(symbol: str, period: str = "1", adjust: str = "") -> Any:
+    """新浪 A 股分钟线，接口只返回最近的数据，调用后把已收盘交易日归档到本地"""
+    import akshare as ak
+    from .store.minute import sina_minute_store
+
+    df = ak.stock_zh_a_minute(symbol=symbol, period=period, adjust=adjust)
+    if adjust != "qfq":
+        sina_minute_store.archive(symbol, period, adjust, df)
+    return df
@@ -0,0 +1,132 @@
+"""
+工具结果的统一规范化。
+
+工具返回的 DataFrame 或 ``to_dict("records")`` 列表在工作线程中统一转换为
+规范化的 DataFrame: 按列向量化地把 NaN/NaT 转为 None，时间列转为字符串，
+numpy 标量转为 Python 原生类型，之后可直接 JSON 编码。
+"""
+
+import datetime
+import decimal
+from typing import Any, List
+
+import numpy as np
+import pandas as pd
+
+# 无需转换即可 JSON 编码的 Python 类型
+_JSON_NATIVE = (str, int, float, bool)
+
+
+def _format_datetime_column(series: pd.Series) -> pd.Series:
+    """把 datetime64 列转换为字符串，全部为零点时只保留日期"""
+    values = series
+    if getattr(series.dt, "tz", None) is not None:
+        values = series.dt.tz_localize(None)
+    valid = values.dropna()
+    if len(valid) and (valid == valid.dt.normalize()).all():
+        text = values.dt.strftime("%Y-%m-%d")
+    else:
+        text = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+    return text.astype(object).where(series.notna(), None)
+
+
+def normalize_scalar(value: Any) -> Any:
+    """转换 object 列中无法直接 JSON 编码的单个值"""
+    if value is None or isinstance(value, _JSON_NATIVE):
+        return value
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d") if value == value.normalize() else value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (pd.Timedelta, datetime.timedelta)):
+        return str(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (list, tuple, dict)):
+        return value
+    return str(value)
+
+
+def _normalize_object_column(series: pd.Series) -> pd.Series:
+    mask = series.notna()
+    values = series.where(mask, None)
+    if set(map(type, values[mask].to_numpy())) <= set(_JSON_NATIVE):
+        return values
+    return values.map(normalize_scalar, na_action="ignore").where(mask, None)
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """按列规范化 DataFrame，返回新的 DataFrame(不修改原对象)
+
+    与 ``to_dict("records")`` 一致，索引会被丢弃。
+    """
+    names = [str(name) for name in df.columns]
+    columns = {}
+    for position, (_, series) in enumerate(df.reset_index(drop=True).items()):
+        dtype = series.dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            series = _format_datetime_column(series)
+        elif pd.api.types.is_timedelta64_dtype(dtype):
+            series = series.astype(str).where(series.notna(), None)
+        elif pd.api.types.is_float_dtype(dtype):
+            if series.hasnans:
+                series = series.astype(object).where(series.notna(), None)
+        elif pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            if series.hasnans:  # 可空整数/布尔类型
+                series = series.astype(object).where(series.notna(), None)
+        else:
+            series = _normalize_object_column(series.astype(object))
+        columns[position] = series
+    normalized = pd.DataFrame(columns, index=pd.RangeIndex(len(df)))
+    normalized.columns = names
+    normalized.attrs["normalized"] = True
+    return normalized
+
+
+def is_frame(value: Any) -> bool:
+    return isinstance(value, pd.DataFrame)
+
+
+def to_frame(result: Any) -> pd.DataFrame | None:
+    """把表格类结果转换为 DataFrame，非表格结果返回 None"""
+    if isinstance(result, pd.DataFrame):
+        return result
+    if isinstance(result, pd.Series):
+        return result.to_frame()
+    if isinstance(result, list) and result and all(isinstance(row, dict) for row in result):
+        return pd.DataFrame.from_records(result)
+    return None
+
+
+def normalize_result(result: Any) -> Any:
+    """规范化工具结果: 表格类结果转为规范化 DataFrame，其余原样返回"""
+    if isinstance(result, pd.DataFrame) and result.attrs.get("normalized"):
+        return result
+    frame = to_frame(result)
+    if frame is None:
+        return result
+    return normalize_frame(frame)
+
+
+def restore_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """把规范化结果中只含数值和 None 的 object 列还原为数值类型，缺失值为 NaN
+
+    整数列还原为可空的 Int64，便于按数值写入列式存储。
+    """
+    columns = {}
+    for name, series in df.items():
+        if series.dtype == object:
+            kinds = set(map(type, series.dropna().to_numpy()))
+            if kinds == {int}:
+                series = series.astype("Int64")
+            elif kinds and kinds <= {int, float}:
+                series = series.astype(np.float64)
+        columns[name] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def column_values(df: pd.DataFrame) -> List[List[Any]]:
+    """按列取出 Python 原生值列表(numpy 标量在 tolist 中转换)"""
+    return [series.tolist() for _, series in df.items()]
@@ -0,0 +1,163 @@
+"""
+大结果的游标分页。
+
+表格结果(应用列投影/过滤/排序之后)超过一页的行数时，完整结果以结果句柄的形式保留在
+服务端，响应只序列化第一页，并附带 ``next_cursor``。用同一个工具名和 ``cursor`` 参数再次
+调用即返回后续页面，不再执行工具。每次只编码一页，响应大小和首字节时间与结果总行数无关。
+
+句柄按最近使用淘汰，超过有效期或内存预算后失效，需要重新调用工具。
+"""
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .cache import estimate_size
+from .formatting import (
+    FORMAT_COLUMNS,
+    FORMAT_RECORDS,
+    apply_options,
+    dumps,
+    resolve_format,
+    serialize,
+    to_payload,
+)
+
+# 自动分页的每页行数，0 表示不自动分页(仍可用 page_size 参数显式分页)
+PAGE_ROWS = int(os.getenv("AKSHARE_MCP_PAGE_ROWS", "2000"))
+HANDLE_TTL = float(os.getenv("AKSHARE_MCP_RESULT_HANDLE_TTL", "600"))
+HANDLE_MAX_BYTES = int(float(os.getenv("AKSHARE_MCP_RESULT_HANDLE_MB", "256")) * 1024 * 1024)
+HANDLE_MAX_ENTRIES = 256
+
+
+class CursorError(ValueError):
+    """游标无效、与工具不匹配或结果句柄已过期"""
+
+
+class _Handle:
+    __slots__ = ("tool", "frame", "page_size", "fmt", "size", "expires_at")
+
+    def __init__(self, tool: str, frame: Any, page_size: int, fmt: str, size: int):
+        self.tool = tool
+        self.frame = frame
+        self.page_size = page_size
+        self.fmt = fmt
+        self.size = size
+        self.expires_at = time.monotonic() + HANDLE_TTL
+
+
+class ResultHandles:
+    """服务端保留的分页结果"""
+
+    def __init__(self, max_bytes: int = HANDLE_MAX_BYTES, max_entries: int = HANDLE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._handles: "OrderedDict[str, _Handle]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.pages_served = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def open(self, tool: str, frame: Any, page_size: int, fmt: str) -> str:
+        handle_id = secrets.token_urlsafe(9)
+        handle = _Handle(tool, frame, page_size, fmt, estimate_size(frame))
+        with self._lock:
+            self._purge()
+            self._handles[handle_id] = handle
+            self._bytes += handle.size
+            self.opened += 1
+            # 至少保留刚创建的句柄
+            while len(self._handles) > 1 and (
+                self._bytes > self.max_bytes or len(self._handles) > self.max_entries
+            ):
+                self._remove(next(iter(self._handles)))
+                self.evictions += 1
+        return handle_id
+
+    def get(self, handle_id: str) -> Optional[_Handle]:
+        with self._lock:
+            self._purge()
+            handle = self._handles.get(handle_id)
+            if handle is not None:
+                self._handles.move_to_end(handle_id)
+                handle.expires_at = time.monotonic() + HANDLE_TTL
+            return handle
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        for handle_id in [h for h, handle in self._handles.items() if handle.expires_at <= now]:
+            self._remove(handle_id)
+            self.expired += 1
+
+    def _remove(self, handle_id: str) -> None:
+        self._bytes -= self._handles.pop(handle_id).size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "handles": len(self._handles),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "opened": self.opened,
+                "pages_served": self.pages_served,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
+
+
+result_handles = ResultHandles()
+
+
+def _render_page(handle_id: str, handle: _Handle, offset: int) -> Tuple[str, Dict[str, Any]]:
+    total = len(handle.frame)
+    page = handle.frame.iloc[offset:offset + handle.page_size]
+    end = offset + len(page)
+    info = {
+        "offset": offset,
+        "rows": len(page),
+        "total_rows": total,
+        "next_cursor": f"{handle_id}:{end}" if end < total else None,
+        "expires_in": HANDLE_TTL,
+    }
+    payload = to_payload(page, handle.fmt)
+    body = payload if handle.fmt == FORMAT_COLUMNS else {"records": payload}
+    body["page"] = info
+    result_handles.pages_served += 1
+    return dumps(body, indent=handle.fmt == FORMAT_RECORDS), info
+
+
+def render_result(name: str, result: Any, options: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """应用查询参数后序列化工具结果，超过一页时返回第一页
+
+    Returns:
+        (响应文本, 分页信息)，未分页时分页信息为 None
+    """
+    from .normalize import is_frame
+
+    frame = apply_options(result, options)
+    page_size = options.get("page_size") or PAGE_ROWS
+    if not is_frame(frame) or not page_size or len(frame) <= page_size:
+        return serialize(frame, options.get("format")), None
+    # 格式按完整结果确定，各页保持一致
+    handle_id = result_handles.open(name, frame, page_size, resolve_format(frame, options.get("format")))
+    return _render_page(handle_id, result_handles.get(handle_id), 0)
+
+
+def render_cursor(name: str, cursor: str, options: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """按游标返回已保留结果的后续页面，不执行工具"""
+    handle_id, _, offset = str(cursor).rpartition(":")
+    if not handle_id or not offset.isdigit():
+        raise CursorError(f"Invalid cursor {cursor!r}")
+    handle = result_handles.get(handle_id)
+    if handle is None:
+        raise CursorError(f"Result handle for cursor {cursor!r} expired or unknown, call {name} again without cursor")
+    if handle.tool != name:
+        raise CursorError(f"Cursor {cursor!r} belongs to tool {handle.tool}, not {name}")
+    if options.get("format"):
+        handle.fmt = resolve_format(None, options["format"])
+    return _render_page(handle_id, handle, int(offset))
@@ -0,0 +1,146 @@
+"""
+长时间工具调用的 MCP 进度通知。
+
+akshare 的多页抓取(公告、研报、全市场行情等)都用 tqdm 包装分页循环。客户端在请求中
+带上 ``progressToken`` 时，这里为该次调用创建进度报告器并放入上下文变量，工具在工作线程中
+每完成一页，就通过 ``notifications/progress`` 发送已完成页数与总页数，客户端据此知道
+请求仍在进行，不必超时重试。
+
+tqdm 在首次需要进度时打补丁，没有进度报告器的调用(缓存刷新、后台任务等)不受影响。
+通知按 ``AKSHARE_MCP_PROGRESS_INTERVAL`` 节流，最后一页总会发送。
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 两次进度通知之间的最小间隔(秒)
+PROGRESS_INTERVAL = float(os.getenv("AKSHARE_MCP_PROGRESS_INTERVAL", "0.5"))
+
+SendProgress = Callable[[float, Optional[float]], Awaitable[None]]
+
+current_progress: contextvars.ContextVar[Optional["ProgressReporter"]] = contextvars.ContextVar(
+    "akshare_mcp_progress", default=None
+)
+
+
+class ProgressReporter:
+    """单次工具调用的进度，可在工作线程中更新"""
+
+    def __init__(self, send: SendProgress, loop: asyncio.AbstractEventLoop, interval: float = PROGRESS_INTERVAL):
+        self._send = send
+        self._loop = loop
+        self.interval = interval
+        # 每个进度条 -> [已完成页数, 总页数]，一次调用可能依次经过多个分页循环
+        self._bars: Dict[int, list] = {}
+        self._lock = threading.Lock()
+        self._sent_progress = 0.0
+        self._sent_at = 0.0
+        self._tasks: Set[asyncio.Task] = set()
+        self.closed = False
+
+    def advance(self, bar: Any, done: int, total: Optional[float]) -> None:
+        """进度条 bar 完成了 done 页"""
+        if self.closed:
+            return
+        with self._lock:
+            self._bars[id(bar)] = [done, total]
+            progress = float(sum(d for d, _ in self._bars.values()))
+            totals = [t for _, t in self._bars.values()]
+            total_pages = float(sum(totals)) if all(t is not None for t in totals) else None
+            now = time.monotonic()
+            final = total is not None and done >= total
+            if progress <= self._sent_progress or (not final and now - self._sent_at < self.interval):
+                return
+            self._sent_progress, self._sent_at = progress, now
+        self._loop.call_soon_threadsafe(self._schedule, progress, total_pages)
+
+    def _schedule(self, progress: float, total: Optional[float]) -> None:
+        if self.closed:
+            return
+        task = self._loop.create_task(self._deliver(progress, total))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _deliver(self, progress: float, total: Optional[float]) -> None:
+        try:
+            await self._send(progress, total)
+            progress_notifier.notifications += 1
+        except Exception as e:
+            progress_notifier.failures += 1
+            logger.debug(f"Failed to send progress notification: {e}")
+
+    def close(self) -> None:
+        """调用结束后丢弃迟到的进度(例如合并到后台刷新中的分页循环)"""
+        self.closed = True
+
+
+class ProgressNotifier:
+    """为带 progressToken 的调用创建进度报告器，并把 tqdm 分页循环接到当前报告器"""
+
+    def __init__(self):
+        self._installed = False
+        self._install_lock = threading.Lock()
+        self.calls = 0
+        self.notifications = 0
+        self.failures = 0
+
+    def install(self) -> None:
+        """给 tqdm 打补丁，只执行一次"""
+        with self._install_lock:
+            if self._installed:
+                return
+            from tqdm import tqdm
+
+            iterate = tqdm.__iter__
+            update = tqdm.update
+
+            def __iter__(bar):
+                reporter = current_progress.get()
+                if reporter is None:
+                    yield from iterate(bar)
+                    return
+                done = 0
+                for item in iterate(bar):
+                    yield item
+                    done += 1
+                    reporter.advance(bar, done, bar.total)
+
+            def _update(bar, n=1):
+                displayed = update(bar, n)
+                reporter = current_progress.get()
+                if reporter is not None:
+                    reporter.advance(bar, bar.n, bar.total)
+                return displayed
+
+            tqdm.__iter__ = __iter__
+            tqdm.update = _update
+            self._installed = True
+
+    def reporter(self, session: Any, token: Any) -> ProgressReporter:
+        """为当前请求的 progressToken 创建进度报告器"""
+        self.install()
+        self.calls += 1
+
+        async def send(progress: float, total: Optional[float]) -> None:
+            await session.send_progress_notification(token, progress, total)
+
+        return ProgressReporter(send, asyncio.get_running_loop())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "installed": self._installed,
+            "calls": self.calls,
+            "notifications": self.notifications,
+            "failures": self.failures,
+            "interval": PROGRESS_INTERVAL,
+        }
+
+
+progress_notifier = ProgressNotifier()
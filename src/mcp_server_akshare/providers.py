@@ -0,0 +1,197 @@
+"""
+上游数据源分类与限流。
+
+工具名称中的后缀标识了数据源(``_em`` 东方财富、``_sina`` 新浪、``_ths`` 同花顺等)。
+每个数据源有独立的令牌桶(请求速率)与并发信号量，在分发路径中统一执行，
+避免大量并发调用触发上游限流或封禁。
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+OTHER = "other"
+
+# 名称中的标识 -> 数据源
+PROVIDER_TOKENS = {
+    "em": "eastmoney",
+    "sina": "sina",
+    "ths": "ths",
+    "cninfo": "cninfo",
+    "xq": "xueqiu",
+    "baidu": "baidu",
+    "lg": "legulegu",
+    "tx": "tencent",
+    "sse": "sse",
+    "szse": "szse",
+}
+
+# 名称中没有数据源标识的工具
+PROVIDER_OVERRIDES = {
+    "stock_zh_a_hist": "eastmoney",
+    "stock_hk_hist": "eastmoney",
+    "stock_us_hist": "eastmoney",
+    "stock_zh_a_spot": "sina",
+    "stock_zh_a_daily": "sina",
+    "stock_zh_a_minute": "sina",
+    "stock_hk_spot": "sina",
+    "stock_hk_daily": "sina",
+    "stock_us_spot": "sina",
+    "stock_us_daily": "sina",
+}
+
+# 默认限额: rate 为每秒请求数，burst 为令牌桶容量，concurrency 为最大并发调用数
+DEFAULT_LIMITS = {"rate": 5.0, "burst": 10, "concurrency": 4}
+PROVIDER_LIMITS: Dict[str, Dict[str, float]] = {
+    "eastmoney": {"rate": 8.0, "burst": 16, "concurrency": 6},
+    "sina": {"rate": 3.0, "burst": 6, "concurrency": 3},
+    "ths": {"rate": 2.0, "burst": 4, "concurrency": 2},
+    "cninfo": {"rate": 3.0, "burst": 6, "concurrency": 3},
+    "xueqiu": {"rate": 2.0, "burst": 4, "concurrency": 2},
+}
+
+
+def _load_limits() -> Dict[str, Dict[str, float]]:
+    """合并默认限额与环境变量 AKSHARE_MCP_PROVIDER_LIMITS(JSON)中的配置"""
+    limits = {name: dict(DEFAULT_LIMITS, **conf) for name, conf in PROVIDER_LIMITS.items()}
+    raw = os.getenv("AKSHARE_MCP_PROVIDER_LIMITS")
+    if raw:
+        try:
+            for name, conf in json.loads(raw).items():
+                limits[name] = dict(limits.get(name, DEFAULT_LIMITS), **conf)
+        except (ValueError, AttributeError) as e:
+            logger.error(f"Invalid AKSHARE_MCP_PROVIDER_LIMITS: {e}")
+    return limits
+
+
+def classify_provider(name: str) -> str:
+    """根据工具名称判断上游数据源"""
+    provider = PROVIDER_OVERRIDES.get(name)
+    if provider:
+        return provider
+    for token in reversed(name.split("_")):
+        provider = PROVIDER_TOKENS.get(token)
+        if provider:
+            return provider
+    return OTHER
+
+
+def classify_tools(names: Iterable[str]) -> Dict[str, int]:
+    """统计工具注册表中各数据源的工具数量"""
+    counts: Dict[str, int] = {}
+    for name in names:
+        provider = classify_provider(name)
+        counts[provider] = counts.get(provider, 0) + 1
+    return counts
+
+
+class TokenBucket:
+    """异步令牌桶"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """获取一个令牌，不足时按 FIFO 顺序等待"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class ProviderGate:
+    """单个数据源的速率与并发控制"""
+
+    def __init__(self, name: str, rate: float, burst: float, concurrency: int):
+        self.name = name
+        self.concurrency = int(concurrency)
+        self._bucket = TokenBucket(rate, burst)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.waiting = 0
+        self.max_waiting = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        start = time.monotonic()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self._bucket.acquire()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+        wait = time.monotonic() - start
+        self.calls += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self._bucket.rate,
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "calls": self.calls,
+            "avg_wait_ms": round(self.total_wait / self.calls * 1000, 3) if self.calls else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class ProviderGovernor:
+    """按数据源分配 ProviderGate"""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None):
+        self.limits = limits if limits is not None else _load_limits()
+        self._gates: Dict[str, ProviderGate] = {}
+
+    def gate(self, provider: str) -> ProviderGate:
+        gate = self._gates.get(provider)
+        if gate is None:
+            conf = self.limits.get(provider, DEFAULT_LIMITS)
+            gate = ProviderGate(provider, conf["rate"], conf["burst"], conf["concurrency"])
+            self._gates[provider] = gate
+        return gate
+
+    def slot(self, name: str):
+        """获取工具对应数据源的执行槽位(异步上下文管理器)"""
+        return self.gate(classify_provider(name)).slot()
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: gate.stats() for name, gate in sorted(self._gates.items())}
+
+
+governor = ProviderGovernor()
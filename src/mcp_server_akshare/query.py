@@ -0,0 +1,136 @@
+"""
+服务端的列投影、行过滤、排序与分页。
+
+在序列化之前直接作用于规范化后的 DataFrame，只编码调用方需要的数据:
+  - columns: 需要返回的列名列表
+  - where: 简单比较表达式，如 ``"涨跌幅 > 5"``、``"名称 contains 银行"``，
+    多个条件可用列表或 `` and `` 连接(全部满足)
+  - sort_by: 排序列，前缀 ``-`` 表示降序
+  - offset/limit: 跳过与返回的行数，offset 为负数时从末尾倒数
+"""
+
+import operator
+import re
+from typing import Any, Dict, List
+
+import pandas as pd
+
+OPERATORS = ("==", "!=", ">=", "<=", ">", "<", "=", "contains", "startswith")
+
+_CONDITION = re.compile(
+    r"^\s*(?P<column>.+?)\s*(?P<op>==|!=|>=|<=|>|<|=|\s+contains\s+|\s+startswith\s+)\s*(?P<value>.+?)\s*$"
+)
+_COMPARE = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+_AND = re.compile(r"\s+and\s+", re.IGNORECASE)
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def parse_conditions(where: Any) -> List[tuple]:
+    """解析 where 参数为 (列名, 操作符, 值) 列表
+
+    Raises:
+        ValueError: 表达式无法解析
+    """
+    conditions = []
+    for clause in _as_list(where):
+        for part in _AND.split(str(clause)):
+            match = _CONDITION.match(part)
+            if not match:
+                raise ValueError(
+                    f"Invalid where condition {part!r}, expected '<column> <op> <value>' "
+                    f"with op in {', '.join(OPERATORS)}"
+                )
+            op = match.group("op").strip()
+            value = match.group("value")
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+                value = value[1:-1]
+            conditions.append((match.group("column"), "==" if op == "=" else op, value))
+    return conditions
+
+
+def _to_number(value: str) -> float | None:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _check_columns(df: pd.DataFrame, columns: List[str]) -> None:
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"Unknown column(s) {missing}, available: {list(df.columns)}")
+
+
+def _mask(df: pd.DataFrame, column: str, op: str, value: str) -> pd.Series:
+    series = df[column]
+    if op == "contains":
+        return series.astype(str).str.contains(value, regex=False) & series.notna()
+    if op == "startswith":
+        return series.astype(str).str.startswith(value) & series.notna()
+    left, right = series.astype(str), value
+    number = _to_number(value)
+    if number is not None:
+        numeric = pd.to_numeric(series, errors="coerce")
+        # 整列都无法转换为数字时按字符串比较
+        if numeric.notna().any() or series.isna().all():
+            left, right = numeric, number
+    return _COMPARE[op](left, right) & series.notna()
+
+
+def _sort_key(series: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(series, errors="coerce")
+    if numeric.notna().sum() == series.notna().sum():
+        return numeric
+    return series.astype(str).where(series.notna(), None)
+
+
+def apply_query(df: pd.DataFrame, options: Dict[str, Any]) -> pd.DataFrame:
+    """按服务端参数对 DataFrame 过滤、排序、分页并投影列"""
+    conditions = parse_conditions(options.get("where"))
+    if conditions:
+        _check_columns(df, [c for c, _, _ in conditions])
+        mask = pd.Series(True, index=df.index)
+        for column, op, value in conditions:
+            mask &= _mask(df, column, op, value)
+        df = df[mask]
+
+    sort_by = _as_list(options.get("sort_by"))
+    if sort_by:
+        keys = [key.lstrip("-") for key in sort_by]
+        _check_columns(df, keys)
+        df = df.sort_values(
+            by=keys,
+            ascending=[not key.startswith("-") for key in sort_by],
+            key=_sort_key,
+            na_position="last",
+            kind="stable",
+        )
+
+    offset = options.get("offset")
+    limit = options.get("limit")
+    if offset or limit is not None:
+        start = int(offset or 0)
+        if start < 0:
+            start = max(len(df) + start, 0)
+        stop = None if limit is None else start + int(limit)
+        df = df.iloc[start:stop]
+
+    columns = _as_list(options.get("columns"))
+    if columns:
+        _check_columns(df, columns)
+        df = df[columns]
+    return df.reset_index(drop=True)
@@ -0,0 +1,114 @@
+"""
+进程级工具注册表快照。
+
+工具元数据在首次访问时从 tools_meta.db 加载一次，预先构建好 ``types.Tool``
+对象；之后只有当数据库文件的 mtime 或 ``updated_at`` 发生变化时才重新加载。
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import mcp.types as types
+from persistence.generated_tool_repository import GeneratedToolRepository
+
+from .builtin_tools import get_builtin_tools
+from .formatting import SERVER_ARGUMENTS
+
+logger = logging.getLogger(__name__)
+
+# 两次检查数据库文件 mtime 的最小间隔(秒)
+CHECK_INTERVAL = 2.0
+
+
+def _with_server_arguments(tool: types.Tool) -> types.Tool:
+    """把服务端通用参数注入到工具的 inputSchema 中"""
+    schema = dict(tool.inputSchema or {})
+    properties = dict(schema.get("properties") or {})
+    for param, spec in SERVER_ARGUMENTS.items():
+        properties.setdefault(param, spec)
+    schema["properties"] = properties
+    return types.Tool(name=tool.name, description=tool.description, inputSchema=schema)
+
+
+class ToolRegistry:
+    """工具注册表的内存快照"""
+
+    def __init__(self, repo: Optional[GeneratedToolRepository] = None):
+        self._repo = repo
+        self._lock = threading.Lock()
+        self._tools: List[types.Tool] = []
+        self._by_name: Dict[str, types.Tool] = {}
+        self._mtime: Optional[float] = None
+        self._version: Optional[Tuple[int, Optional[str]]] = None
+        self._next_check = 0.0
+        self.loads = 0
+        self._listeners: List[Callable[[], None]] = []
+
+    @property
+    def repo(self) -> GeneratedToolRepository:
+        if self._repo is None:
+            self._repo = GeneratedToolRepository()
+        return self._repo
+
+    def _db_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.repo.db_path).st_mtime
+        except OSError:
+            return None
+
+    def _load(self, mtime: Optional[float]) -> None:
+        version = self.repo.get_version()
+        if version == self._version and self._tools:
+            self._mtime = mtime
+            return
+        generated = [_with_server_arguments(tool) for tool in self.repo.get_all_tools()]
+        tools = generated + get_builtin_tools()
+        self._by_name = {tool.name: tool for tool in tools}
+        self._tools = tools
+        self._version = version
+        self._mtime = mtime
+        self.loads += 1
+        logger.info(f"Loaded {len(generated)} tools from registry (version {version})")
+        if self.loads > 1:
+            for listener in self._listeners:
+                listener()
+
+    def _refresh_if_needed(self) -> None:
+        now = time.monotonic()
+        if self._version is not None and now < self._next_check:
+            return
+        with self._lock:
+            if self._version is not None and now < self._next_check:
+                return
+            mtime = self._db_mtime()
+            if self._version is None or mtime != self._mtime:
+                self._load(mtime)
+            self._next_check = now + CHECK_INTERVAL
+
+    def add_reload_listener(self, listener: Callable[[], None]) -> None:
+        """注册工具表重新加载后的回调"""
+        self._listeners.append(listener)
+
+    def list_tools(self) -> List[types.Tool]:
+        """返回预构建的工具列表"""
+        self._refresh_if_needed()
+        return self._tools
+
+    def get(self, name: str) -> Optional[types.Tool]:
+        """按名称获取工具定义"""
+        self._refresh_if_needed()
+        return self._by_name.get(name)
+
+    def names(self) -> List[str]:
+        self._refresh_if_needed()
+        return list(self._by_name)
+
+    @property
+    def version(self) -> Optional[Tuple[int, Optional[str]]]:
+        return self._version
+
+
+tool_registry = ToolRegistry()
@@ -3,16 +3,38 @@ MCP server implementation for AKShare.
 """
 
 import asyncio
-import json
+import inspect
 import logging
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import mcp.server.stdio
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
-from persistence.generated_tool_repository import GeneratedToolRepository
+
+from .builtin_tools import get_builtin_handler, set_tool_runner
+from .breaker import CALL_TIMEOUT, breakers
+from .cache import canonical_arguments, make_key, result_cache, stale_ttl_for, ttl_for
+from .dispatch import dispatcher
+from .executor import get_executor, lag_monitor
+from .formatting import (
+    SERIALIZE_OFFLOAD_ROWS,
+    dumps,
+    row_count,
+    split_arguments,
+    validate_options,
+)
+from .jobs import job_manager
+from .local_tools import get_local_tool
+from .pagination import render_cursor, render_result
+from .progress import current_progress, progress_notifier
+from .providers import classify_provider, governor
+from .registry import tool_registry
+from .singleflight import single_flight
+from .spot import spot_snapshots
+from .trading_calendar import trading_calendars
+from .warmup import warmup
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -24,21 +46,19 @@ class AKShareTools(str, Enum):
     """动态生成的工具枚举"""
     @classmethod
     def initialize(cls):
-        """从数据库初始化工具枚举"""
-        repo = GeneratedToolRepository()
-        tools = repo.get_all_tools()
-        for tool in tools:
+        """从工具注册表初始化工具枚举"""
+        for tool in tool_registry.list_tools():
             setattr(cls, tool.name.upper(), tool.name)
         return cls
 
 # Initialize tools when module loads
 AKShareTools.initialize()
+tool_registry.add_reload_listener(dispatcher.invalidate)
 
 @server.list_tools()
 async def handle_list_tools() -> List[types.Tool]:
-    """从数据库获取所有工具"""
-    repo = GeneratedToolRepository()
-    return repo.get_all_tools()
+    """从内存中的工具注册表快照获取所有工具"""
+    return tool_registry.list_tools()
 
 def _get_input_schema(func: callable) -> Dict:
     """从函数签名生成输入schema"""
@@ -46,6 +66,110 @@ def _get_input_schema(func: callable) -> Dict:
     # ... 具体实现根据函数参数生成 ...
 
 
+async def _run_tool(execute: Callable[..., Any], arguments: Dict[str, Any]) -> Any:
+    """在工作线程中执行工具并统一规范化结果(NaN/时间/numpy类型)"""
+    from .normalize import normalize_result
+
+    result = execute(**arguments)
+    if inspect.isawaitable(result):
+        result = await result
+    return normalize_result(result)
+
+
+async def _execute_tool(name: str, arguments: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> Any:
+    """解析并执行工具，返回原始结果(命中缓存时不访问上游)
+
+    Args:
+        meta: 需要随响应返回的元数据(如旧结果的陈旧程度)写入这里
+    """
+    # 首次调用需等待后台的akshare导入完成
+    await warmup.wait()
+
+    # 全市场实时行情由共享快照提供，快照自身控制陈旧时间
+    snapshot = spot_snapshots.for_tool(name)
+    if snapshot is not None:
+        return await snapshot.get()
+
+    # 从分发表解析工具的execute方法，未知工具会被负缓存；
+    # 尚未加载的模块在线程中导入，避免阻塞事件循环
+    execute = dispatcher.peek(name)
+    if execute is None:
+        execute = await asyncio.to_thread(dispatcher.resolve, name)
+
+    tool = tool_registry.get(name)
+    canonical = canonical_arguments(execute, arguments, tool.inputSchema if tool else None)
+    # 按交易日历收缩日期区间，规范化缓存键；请求的日期没有交易时不访问上游
+    changes = trading_calendars.normalize(name, canonical)
+    if changes is None:
+        return []
+    if changes:
+        canonical = {**canonical, **changes}
+        arguments = {**arguments, **changes}
+    key = make_key(name, canonical)
+    hit, result = result_cache.get(key)
+    if hit:
+        return result
+
+    # 有本地存储实现的工具只向上游请求缺失的数据
+    runner = get_local_tool(name) or execute
+
+    async def fetch() -> Any:
+        # 按上游数据源限流后，在工具线程池中调用execute方法，避免同步akshare调用阻塞事件循环
+        # 上游熔断时快速失败；超时或异常计入熔断器
+        async with breakers.guard(classify_provider(name)) as breaker:
+            async with governor.slot(name):
+                breaker.ensure_not_open()
+                try:
+                    value = await asyncio.wait_for(
+                        get_executor().run(_run_tool, runner, arguments), CALL_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"Tool {name} timed out after {CALL_TIMEOUT:.0f}s")
+        result_cache.put(key, value, ttl_for(name, canonical), stale_ttl_for(name))
+        return value
+
+    # 已过期的参考数据立即返回旧结果，由一个后台任务刷新
+    stale = result_cache.get_stale(key)
+    if stale is not None:
+        value, age, stale_for = stale
+
+        async def revalidate() -> Any:
+            # 旧结果过期后到达的调用会通过 single_flight.do 等待这次刷新，需要拿到结果或异常
+            try:
+                return await fetch()
+            except Exception as e:
+                logger.warning(f"Background refresh of {name} failed: {e}")
+                raise
+
+        single_flight.spawn(key, revalidate)
+        if meta is not None:
+            meta["cache"] = {
+                "status": "stale",
+                "age_seconds": round(age, 3),
+                "stale_seconds": round(stale_for, 3),
+                "revalidating": single_flight.in_flight(key),
+            }
+        return value
+
+    # 相同参数的并发调用共享同一次上游请求
+    return await single_flight.do(key, fetch)
+
+
+set_tool_runner(_execute_tool)
+
+
+def _progress_reporter():
+    """当前请求带 progressToken 时返回进度报告器"""
+    try:
+        context = server.request_context
+    except LookupError:
+        return None
+    token = context.meta.progressToken if context.meta is not None else None
+    if token is None:
+        return None
+    return progress_notifier.reporter(context.session, token)
+
+
 @server.call_tool()
 async def handle_call_tool(
     name: str, arguments: Dict[str, Any] | None
@@ -53,27 +177,45 @@ async def handle_call_tool(
     try:
         if arguments is None:
             arguments = {}
-            
-        # 动态导入对应的API模块
-        module_name = f"apis.{name}"
-        try:
-            module = __import__(module_name, fromlist=[''])
-        except ImportError as e:
-            raise ValueError(f"Tool module {name} not found: {str(e)}")
-        
-        # 检查模块中是否有execute方法
-        if not hasattr(module, 'execute'):
-            raise ValueError(f"Module {name} does not have execute method")
-            
-        # 调用execute方法并传入参数
-        result = await module.execute(**arguments)
-        
-        # 转换结果为JSON字符串
-        if hasattr(result, 'to_dict'):  # 检查是否是DataFrame
-            result_json = json.dumps(result.to_dict(orient='records'), ensure_ascii=False, indent=2)
+
+        builtin = get_builtin_handler(name)
+        tool_args, options = split_arguments(arguments)
+        validate_options(options)
+        meta: Dict[str, Any] = {}
+        if options.get("cursor"):
+            # 后续页面直接从服务端保留的结果中读取，不再执行工具
+            result_json, meta["page"] = await asyncio.to_thread(render_cursor, name, options["cursor"], options)
+            return [types.TextContent.model_validate({"type": "text", "text": result_json, "_meta": meta})]
+
+        if builtin is not None:
+            from .normalize import is_frame  # normalize 依赖 pandas，延迟导入
+
+            result = await builtin(tool_args)
+            # 返回表格的内置工具(如 job_result)与普通工具一样支持列投影、过滤与分页
+            if not is_frame(result):
+                return [types.TextContent(type="text", text=dumps(result, indent=True))]
         else:
-            result_json = json.dumps(result, ensure_ascii=False, indent=2)
-            
+            # 客户端带 progressToken 时，分页抓取每完成一页发送一次进度通知
+            reporter = _progress_reporter()
+            context_token = current_progress.set(reporter)
+            try:
+                result = await _execute_tool(name, tool_args, meta)
+            finally:
+                current_progress.reset(context_token)
+                if reporter is not None:
+                    reporter.close()
+
+        # 应用列投影/过滤/分页，并按请求的format(未指定时按行数自动选择)转换为JSON字符串，
+        # 超过一页时只序列化第一页，大结果在线程中处理
+        if row_count(result) > SERIALIZE_OFFLOAD_ROWS:
+            result_json, page = await asyncio.to_thread(render_result, name, result, options)
+        else:
+            result_json, page = render_result(name, result, options)
+        if page is not None:
+            meta["page"] = page
+
+        if meta:
+            return [types.TextContent.model_validate({"type": "text", "text": result_json, "_meta": meta})]
         return [types.TextContent(type="text", text=result_json)]
         
     except Exception as e:
@@ -90,17 +232,30 @@ async def main() -> None:
     """
     Main entry point for the server.
     """
-    # Run the server using stdin/stdout streams
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="akshare",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    lag_monitor.start()
+    spot_snapshots.start()
+    job_manager.start(_execute_tool)
+    # 后台导入akshare并预加载工具模块，initialize/list_tools无需等待
+    warmup.start(
+        preload=[tool.name for tool in tool_registry.list_tools() if get_builtin_handler(tool.name) is None]
+    )
+    try:
+        # Run the server using stdin/stdout streams
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="akshare",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
\ No newline at end of file
+            )
+    finally:
+        lag_monitor.stop()
+        spot_snapshots.stop()
+        job_manager.stop()
+        get_executor().shutdown()
\ No newline at end of file
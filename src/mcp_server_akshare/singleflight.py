@@ -0,0 +1,94 @@
+"""
+并发相同调用的合并(single-flight)。
+
+相同工具、相同规范化参数的调用在执行期间共享同一个上游任务，
+结果分发给所有等待者。
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    __slots__ = ("task", "waiters", "background")
+
+    def __init__(self, task: asyncio.Task, background: bool = False):
+        self.task = task
+        self.waiters = 0
+        # 后台刷新任务不随等待者取消
+        self.background = background
+
+
+class SingleFlight:
+    """按键合并并发调用"""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.background_calls = 0
+
+    def _start(self, key: str, fn: Callable[[], Awaitable[Any]], background: bool = False) -> _Flight:
+        flight = _Flight(asyncio.ensure_future(fn()), background)
+        self._flights[key] = flight
+        self.upstream_calls += 1
+        flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        return flight
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """执行 fn；若同一个键已有进行中的调用则等待其结果
+
+        上游任务独立于任一调用方运行，单个等待者被取消不会影响其他等待者；
+        只有当所有等待者都取消后才取消上游任务。
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._start(key, fn)
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1 and not flight.background:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def spawn(self, key: str, fn: Callable[[], Awaitable[Any]]) -> bool:
+        """在后台执行 fn，不等待结果；同一个键已有进行中的调用时不重复启动
+
+        Returns:
+            是否启动了新的调用
+        """
+        if key in self._flights:
+            return False
+        self._start(key, fn, background=True)
+        self.background_calls += 1
+        return True
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # 取出异常，避免无人等待时出现 "exception was never retrieved"
+            flight.task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._flights),
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "background_calls": self.background_calls,
+        }
+
+
+single_flight = SingleFlight()
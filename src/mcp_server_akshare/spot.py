@@ -0,0 +1,227 @@
+"""
+全市场实时行情快照。
+
+``stock_zh_a_spot``、``stock_hk_spot_em`` 等工具每次都下载整个市场的行情。这里每个工具
+在内存中只保留一份快照，并按代码建立哈希索引: 全表工具直接返回快照，单个代码的报价
+(``spot_quote`` 内置工具)按索引取行，不再逐个代码访问上游。
+
+快照的有效期按所属市场的交易时段计算: 盘中为允许的陈旧时间，收盘后冻结到下一个交易时段开始。
+快照过期后，由第一个读取者触发刷新，并发读取者共享同一次上游请求；
+服务运行时后台任务在快照过期前主动刷新最近被读取过的市场，空闲市场不再刷新。
+刷新与普通工具调用一样经过数据源限流与熔断。
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .breaker import CALL_TIMEOUT, breakers
+from .cache import session_calendar
+from .executor import get_executor
+from .providers import classify_provider, governor
+from .singleflight import single_flight
+
+logger = logging.getLogger(__name__)
+
+# 快照允许的最大陈旧时间(秒)
+SPOT_MAX_AGE = float(os.getenv("AKSHARE_MCP_SPOT_MAX_AGE", "10"))
+# 超过该时间(秒)没有读取的快照不再后台刷新
+SPOT_IDLE_TIMEOUT = float(os.getenv("AKSHARE_MCP_SPOT_IDLE", "300"))
+# 后台刷新在快照陈旧时间达到该比例时开始，读取者通常不必等待
+REFRESH_AHEAD = 0.8
+
+# 市场 -> (全表工具, 代码列)
+SPOT_MARKETS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "a": ("stock_zh_a_spot", ("代码",)),
+    "kc": ("stock_kc_a_spot_em", ("代码",)),
+    "b": ("stock_zh_b_spot_em", ("代码",)),
+    "ah": ("stock_zh_ah_spot_em", ("A股代码", "H股代码")),
+    "hk": ("stock_hk_spot_em", ("代码",)),
+    "us": ("stock_us_spot_em", ("代码",)),
+}
+
+_EXCHANGE_SUFFIX = re.compile(r"\.(?:sh|sz|bj|hk)$")
+_EXCHANGE_PREFIX = re.compile(r"^(?:(?:sh|sz|bj|hk)(?=\d)|gb_|\d+\.)")
+
+
+def code_aliases(code: Any) -> List[str]:
+    """代码的查找键: 原样(小写)以及去掉交易所标识的形式，如 sh600000/600000.SH -> 600000、105.AAPL -> aapl"""
+    text = str(code).strip().lower()
+    stripped = _EXCHANGE_PREFIX.sub("", _EXCHANGE_SUFFIX.sub("", text))
+    return [text] if stripped == text else [text, stripped]
+
+
+class SpotSnapshot:
+    """单个全表行情工具的快照与代码索引"""
+
+    def __init__(self, market: str, tool: str, code_columns: Iterable[str], max_age: float = SPOT_MAX_AGE):
+        self.market = market
+        self.tool = tool
+        self.code_columns = tuple(code_columns)
+        self.max_age = max_age
+        self.frame: Any = None
+        self.index: Dict[str, int] = {}
+        self.fetched_at: Optional[float] = None
+        # 本次快照的有效期(秒)，收盘后为到下一个交易时段开始的时间
+        self.ttl = max_age
+        self.last_read = 0.0
+        self.reads = 0
+        self.stale_reads = 0
+        self.lookups = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.failed_at = 0.0
+        self.refreshing = False
+        self.last_refresh_seconds: Optional[float] = None
+
+    def age(self) -> Optional[float]:
+        return None if self.fetched_at is None else time.monotonic() - self.fetched_at
+
+    def _load(self) -> Tuple[Any, Dict[str, int]]:
+        """在工作线程中下载全表、规范化并建立代码索引"""
+        import akshare as ak
+
+        from .normalize import normalize_result
+
+        frame = normalize_result(getattr(ak, self.tool)())
+        index: Dict[str, int] = {}
+        for column in self.code_columns:
+            if column not in frame.columns:
+                continue
+            for position, code in enumerate(frame[column].tolist()):
+                if code is None:
+                    continue
+                for alias in code_aliases(code):
+                    index.setdefault(alias, position)
+        return frame, index
+
+    async def _refresh(self) -> None:
+        started = time.monotonic()
+        async with breakers.guard(classify_provider(self.tool)) as breaker:
+            async with governor.slot(self.tool):
+                breaker.ensure_not_open()
+                try:
+                    frame, index = await asyncio.wait_for(get_executor().run(self._load), CALL_TIMEOUT)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"Spot snapshot {self.tool} timed out after {CALL_TIMEOUT:.0f}s")
+        self.frame, self.index = frame, index
+        self.fetched_at = time.monotonic()
+        self.ttl = session_calendar(self.tool).session_ttl(self.max_age)
+        self.refreshes += 1
+        self.last_refresh_seconds = round(self.fetched_at - started, 3)
+
+    async def refresh(self) -> None:
+        """刷新快照，并发的刷新请求共享同一次上游调用"""
+        self.refreshing = True
+        try:
+            await single_flight.do(f"spot:{self.tool}", self._refresh)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            self.failed_at = time.monotonic()
+            raise
+        finally:
+            self.refreshing = False
+
+    async def get(self, max_age: Optional[float] = None) -> Any:
+        """返回全表快照，指定 max_age 时不超过 max_age 秒，否则按交易时段决定是否过期"""
+        self.reads += 1
+        self.last_read = time.monotonic()
+        age = self.age()
+        if age is None or age > (self.ttl if max_age is None else max_age):
+            self.stale_reads += 1
+            await self.refresh()
+        return self.frame
+
+    async def lookup(self, codes: Iterable[Any], max_age: Optional[float] = None) -> Tuple[Any, List[str]]:
+        """按代码取行，返回 (匹配的行, 未找到的代码)"""
+        frame = await self.get(max_age)
+        index = self.index
+        positions, missing = [], []
+        for code in codes:
+            self.lookups += 1
+            position = next((index[a] for a in code_aliases(code) if a in index), None)
+            if position is None:
+                missing.append(str(code))
+            else:
+                positions.append(position)
+        return frame.iloc[positions].reset_index(drop=True), missing
+
+    def stats(self) -> Dict[str, Any]:
+        age = self.age()
+        return {
+            "tool": self.tool,
+            "rows": 0 if self.frame is None else len(self.frame),
+            "age_seconds": None if age is None else round(age, 3),
+            "max_age": self.max_age,
+            "ttl": round(self.ttl, 3),
+            "reads": self.reads,
+            "stale_reads": self.stale_reads,
+            "lookups": self.lookups,
+            "refreshes": self.refreshes,
+            "last_refresh_seconds": self.last_refresh_seconds,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+class SpotSnapshots:
+    """各市场快照及后台刷新任务"""
+
+    def __init__(self, markets: Dict[str, Tuple[str, Tuple[str, ...]]] = SPOT_MARKETS,
+                 idle_timeout: float = SPOT_IDLE_TIMEOUT):
+        self.snapshots = {market: SpotSnapshot(market, tool, columns) for market, (tool, columns) in markets.items()}
+        self._by_tool = {snapshot.tool: snapshot for snapshot in self.snapshots.values()}
+        self.idle_timeout = idle_timeout
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, market: str) -> SpotSnapshot:
+        snapshot = self.snapshots.get(market)
+        if snapshot is None:
+            raise ValueError(f"Unknown spot market {market!r}, expected one of {', '.join(self.snapshots)}")
+        return snapshot
+
+    def for_tool(self, name: str) -> Optional[SpotSnapshot]:
+        """全表行情工具对应的快照，其他工具返回 None"""
+        return self._by_tool.get(name)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            # 检查间隔不超过提前刷新的时间窗口，避免读取者遇到过期快照
+            shortest = min(snapshot.max_age for snapshot in self.snapshots.values())
+            await asyncio.sleep(max(0.05, min(1.0, shortest * (1 - REFRESH_AHEAD))))
+            now = time.monotonic()
+            for snapshot in self.snapshots.values():
+                if snapshot.fetched_at is None or snapshot.refreshing \
+                        or now - snapshot.last_read > self.idle_timeout:
+                    continue
+                # 刷新失败后等待一个陈旧周期再重试，由读取者的请求决定是否立即重试
+                if now - snapshot.failed_at < snapshot.max_age:
+                    continue
+                if snapshot.age() >= snapshot.ttl * REFRESH_AHEAD:
+                    asyncio.ensure_future(self._refresh_quietly(snapshot))
+
+    async def _refresh_quietly(self, snapshot: SpotSnapshot) -> None:
+        try:
+            await snapshot.refresh()
+        except Exception as e:
+            logger.warning(f"Background refresh of {snapshot.tool} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {market: snapshot.stats() for market, snapshot in self.snapshots.items()}
+
+
+spot_snapshots = SpotSnapshots()
@@ -0,0 +1,26 @@
+"""
+本地行情数据存储。
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+DATA_DIR = Path(
+    os.getenv(
+        "AKSHARE_MCP_DATA_DIR",
+        os.path.join(Path(__file__).resolve().parents[3], "data", "store"),
+    )
+)
+
+_stores: List[Any] = []
+
+
+def register_store(store: Any) -> None:
+    """登记存储实例，供 server_stats 汇总统计信息"""
+    _stores.append(store)
+
+
+def store_stats() -> Dict[str, Any]:
+    """已加载存储的统计信息(本包只在首次使用时导入具体存储模块)"""
+    return {store.dataset: store.stats() for store in _stores}
@@ -0,0 +1,296 @@
+"""
+本地复权计算。
+
+除权除息的参考价为 (P - 派息 + 配股价 x 配股比例) / (1 + 送转比例 + 配股比例)，是前收盘价 P
+的仿射变换，多次除权的复合仍是仿射变换。因此在相邻两个除权日之间的区间(段)内，
+复权价 = 不复权价 x scale + offset，每段一组系数。
+
+系数由一次复权参考数据(上游的 qfq 或 hfq 全量日线)与本地不复权日线按段最小二乘拟合得到，
+之后任意区间的复权日线都由本地不复权数据计算，不再重复下载。除权日通过不复权日线识别:
+上游的涨跌额相对除权参考价计算，除权日的 前收盘 + 涨跌额 != 收盘。
+出现新的除权日后重新获取参考数据。
+"""
+
+import datetime
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..cache import today_cst
+from . import register_store
+from .columnar import partition_lock, path_segment
+from .history import DATE_COLUMN, HistoryStore, hk_hist_store, stock_hist_store, us_hist_store
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ("开盘", "收盘", "最高", "最低")
+# 拟合残差上限: 上游复权价保留两位小数，超过说明识别的除权日不完整，改为直接访问上游
+MAX_RESIDUAL = 0.011
+# 判断除权日的容差(价格最小变动 0.01 加上浮点误差)
+EVENT_TOLERANCE = 0.0051
+FIRST_DATE = "19700101"
+
+
+def detect_events(raw: pd.DataFrame) -> np.ndarray:
+    """识别不复权日线中的除权除息日，返回除权日的 datetime64[D] 数组"""
+    if raw.empty or "涨跌额" not in raw:
+        return np.array([], dtype="datetime64[D]")
+    close = raw["收盘"].to_numpy(np.float64)
+    change = raw["涨跌额"].to_numpy(np.float64)
+    gap = np.abs(close[:-1] + change[1:] - close[1:])
+    dates = pd.to_datetime(raw[DATE_COLUMN]).to_numpy("datetime64[D]")
+    return dates[1:][gap > EVENT_TOLERANCE]
+
+
+def _refine(x: np.ndarray, y: np.ndarray, scale: float, offset: float, tol: float) -> Tuple[float, float]:
+    """在最小二乘结果附近寻找使所有点满足 |scale*x + offset - y| <= tol 的可行区域中心
+
+    上游复权价经过四舍五入，最小二乘估计会有系统偏差，导致部分价格相差一个最小变动单位。
+    对固定的 scale，offset 的可行区间宽度是 scale 的凹函数，用三分法求最大宽度。
+    """
+    def bounds(m: float) -> Tuple[float, float]:
+        r = y - m * x
+        return r.max() - tol, r.min() + tol
+
+    span = max(abs(scale) * 1e-3, 1e-9)
+    lo_m, hi_m = scale - span, scale + span
+    for _ in range(60):
+        m1 = lo_m + (hi_m - lo_m) / 3
+        m2 = hi_m - (hi_m - lo_m) / 3
+        lo1, hi1 = bounds(m1)
+        lo2, hi2 = bounds(m2)
+        if hi1 - lo1 < hi2 - lo2:
+            lo_m = m1
+        else:
+            hi_m = m2
+    m = (lo_m + hi_m) / 2
+    lo, hi = bounds(m)
+    if hi < lo:
+        return scale, offset
+    return m, (lo + hi) / 2
+
+
+class AdjustmentTable:
+    """单个代码、单种复权方式的分段仿射系数"""
+
+    def __init__(self, starts: np.ndarray, scale: np.ndarray, offset: np.ndarray, as_of: str, decimals: int = 2):
+        self.starts = np.asarray(starts, dtype="datetime64[D]")
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.offset = np.asarray(offset, dtype=np.float64)
+        self.as_of = as_of
+        self.decimals = decimals
+
+    @classmethod
+    def fit(cls, raw: pd.DataFrame, reference: pd.DataFrame) -> Optional["AdjustmentTable"]:
+        """用不复权日线和复权参考日线拟合每段的系数，无法精确拟合时返回 None"""
+        if raw.empty or reference.empty:
+            return None
+        ref = reference.copy()
+        ref[DATE_COLUMN] = pd.to_datetime(ref[DATE_COLUMN])
+        merged = pd.DataFrame({DATE_COLUMN: pd.to_datetime(raw[DATE_COLUMN])}).join(
+            raw[list(PRICE_COLUMNS)]
+        ).merge(ref[[DATE_COLUMN, *PRICE_COLUMNS]], on=DATE_COLUMN, suffixes=("", "_ref"))
+        if merged.empty:
+            return None
+
+        dates = merged[DATE_COLUMN].to_numpy("datetime64[D]")
+        starts = np.r_[dates[:1], detect_events(raw)]
+        starts = np.unique(starts[starts >= dates[0]])
+        segment = np.searchsorted(starts, dates, side="right") - 1
+
+        # 每段用开高低收四个价格做一元线性回归，按段向量化求和
+        x = merged[list(PRICE_COLUMNS)].to_numpy(np.float64).ravel()
+        y = merged[[f"{c}_ref" for c in PRICE_COLUMNS]].to_numpy(np.float64).ravel()
+        seg = np.repeat(segment, len(PRICE_COLUMNS))
+        valid = np.isfinite(x) & np.isfinite(y)
+        x, y, seg = x[valid], y[valid], seg[valid]
+        count = len(starts)
+        n = np.bincount(seg, minlength=count).astype(np.float64)
+        sx = np.bincount(seg, x, count)
+        sy = np.bincount(seg, y, count)
+        sxx = np.bincount(seg, x * x, count)
+        sxy = np.bincount(seg, x * y, count)
+        denom = n * sxx - sx * sx
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(np.abs(denom) > 1e-9, (n * sxy - sx * sy) / denom, sy / sx)
+            offset = np.where(np.abs(denom) > 1e-9, (sy - scale * sx) / n, 0.0)
+        scale = np.nan_to_num(scale, nan=1.0)
+        offset = np.nan_to_num(offset)
+        # 参考数据的小数位数(A 股两位，基金三位)
+        decimals = 3 if np.any(np.abs(np.round(y, 2) - y) > 1e-6) else 2
+        order = np.argsort(seg, kind="stable")
+        bounds = np.r_[0, np.cumsum(n.astype(np.int64))]
+        for i in range(count):
+            rows = order[bounds[i]:bounds[i + 1]]
+            if len(rows):
+                scale[i], offset[i] = _refine(x[rows], y[rows], scale[i], offset[i], 0.5001 * 10 ** -decimals)
+
+        residual = np.abs(x * scale[seg] + offset[seg] - y)
+        if residual.size and residual.max() > MAX_RESIDUAL:
+            logger.info(f"Adjustment fit residual {residual.max():.4f} too large, falling back to upstream")
+            return None
+        as_of = pd.Timestamp(dates[-1]).strftime("%Y%m%d")
+        return cls(starts, scale, offset, as_of, decimals)
+
+    def apply(self, df: pd.DataFrame, date_column: str = DATE_COLUMN) -> pd.DataFrame:
+        """把不复权 K 线换算为复权 K 线，涨跌额、涨跌幅、振幅按复权价重新计算"""
+        if df.empty:
+            return df
+        out = df.copy()
+        dates = pd.to_datetime(out[date_column]).to_numpy("datetime64[D]")
+        segment = np.clip(np.searchsorted(self.starts, dates, side="right") - 1, 0, None)
+        scale, offset = self.scale[segment], self.offset[segment]
+        for name in PRICE_COLUMNS:
+            if name in out:
+                out[name] = np.round(out[name].to_numpy(np.float64) * scale + offset, self.decimals)
+        if "均价" in out:
+            out["均价"] = np.round(out["均价"].to_numpy(np.float64) * scale + offset, 3)
+        if {"收盘", "最高", "最低"} <= set(out.columns):
+            close = out["收盘"].to_numpy(np.float64)
+            # 第一根 K 线的前收盘价由不复权涨跌额换算(除权日的涨跌额相对除权参考价，已在新段内)
+            first_prev = np.nan
+            if "涨跌额" in df:
+                first_prev = (float(df["收盘"].iloc[0]) - float(df["涨跌额"].iloc[0])) * scale[0] + offset[0]
+            prev_close = np.r_[first_prev, close[:-1]]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if "涨跌额" in out:
+                    out["涨跌额"] = np.round(close - prev_close, self.decimals)
+                if "涨跌幅" in out:
+                    out["涨跌幅"] = np.round((close - prev_close) / prev_close * 100, 2)
+                if "振幅" in out:
+                    out["振幅"] = np.round((out["最高"] - out["最低"]).to_numpy() / prev_close * 100, 2)
+        return out
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "as_of": self.as_of,
+            "decimals": self.decimals,
+            "starts": [str(d) for d in self.starts],
+            "scale": self.scale.tolist(),
+            "offset": self.offset.tolist(),
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "AdjustmentTable":
+        return cls(
+            np.array(data["starts"], dtype="datetime64[D]"),
+            np.array(data["scale"]),
+            np.array(data["offset"]),
+            data["as_of"],
+            data.get("decimals", 2),
+        )
+
+
+class AdjustmentEngine:
+    """基于本地不复权日线计算复权日线"""
+
+    def __init__(self, store: HistoryStore):
+        self.store = store
+        self.dataset = f"{store.dataset}_adjust"
+        self.root = store.root / "adjust_factors" / store.dataset
+        self._tables: Dict[Tuple[str, str], Optional[AdjustmentTable]] = {}
+        self._failed: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self.reference_fetches = 0
+        self.local_hits = 0
+        self.fallbacks = 0
+        register_store(self)
+
+    def _path(self, symbol: str, adjust: str) -> Path:
+        return self.root / path_segment(adjust) / f"{path_segment(symbol)}.json"
+
+    def _load(self, symbol: str, adjust: str) -> Optional[AdjustmentTable]:
+        key = (symbol, adjust)
+        with self._lock:
+            if key in self._tables:
+                return self._tables[key]
+        try:
+            with open(self._path(symbol, adjust), encoding="utf-8") as f:
+                table = AdjustmentTable.from_json(json.load(f))
+        except (OSError, ValueError, KeyError):
+            table = None
+        with self._lock:
+            self._tables[key] = table
+        return table
+
+    def _save(self, symbol: str, adjust: str, table: AdjustmentTable) -> None:
+        path = self._path(symbol, adjust)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(table.to_json(), f)
+        os.replace(tmp, path)
+        with self._lock:
+            self._tables[(symbol, adjust)] = table
+
+    def table(self, symbol: str, adjust: str, raw: Optional[pd.DataFrame] = None,
+              **fetch_kwargs: Any) -> Optional[AdjustmentTable]:
+        """获取复权系数，出现参考数据之后的除权日时重新拟合
+
+        Args:
+            raw: 本次请求读取的不复权日线(可能包含今天)，一并用于识别新的除权日
+        """
+        today = today_cst()
+        yesterday = (today - datetime.timedelta(days=1)).strftime("%Y%m%d")
+        with partition_lock(self._path(symbol, adjust)):
+            table = self._load(symbol, adjust)
+            if table is not None:
+                # 检查参考数据之后已收盘的交易日，以及本次请求中的数据(可能包含今天)
+                recent = self.store.get(symbol, table.as_of, yesterday, "daily", "", **fetch_kwargs) \
+                    if table.as_of <= yesterday else pd.DataFrame()
+                as_of = np.datetime64(datetime.datetime.strptime(table.as_of, "%Y%m%d").date())
+                events = detect_events(recent)
+                if raw is not None:
+                    events = np.concatenate([events, detect_events(raw)])
+                if not np.any(events > as_of):
+                    return table
+                logger.info(f"New ex-rights event for {symbol} after {table.as_of}, refitting {adjust} factors")
+            elif self._failed.get((symbol, adjust)) == str(today):
+                return None
+
+            history = self.store.get(symbol, FIRST_DATE, today.strftime("%Y%m%d"), "daily", "", **fetch_kwargs)
+            reference = self.store.fetcher(
+                symbol=symbol, period="daily", start_date=FIRST_DATE,
+                end_date=today.strftime("%Y%m%d"), adjust=adjust, **fetch_kwargs,
+            )
+            with self._lock:
+                self.reference_fetches += 1
+            table = AdjustmentTable.fit(history, reference if reference is not None else pd.DataFrame())
+            if table is None:
+                # 当天不再重复尝试拟合
+                self._failed[(symbol, adjust)] = str(today)
+                with self._lock:
+                    self._tables.pop((symbol, adjust), None)
+                return None
+            self._save(symbol, adjust, table)
+            return table
+
+    def get(self, symbol: str, start_date: str, end_date: str, adjust: str, **fetch_kwargs: Any) -> Optional[pd.DataFrame]:
+        """读取复权日线，无法由本地数据计算时返回 None"""
+        raw = self.store.get(symbol, start_date, end_date, "daily", "", **fetch_kwargs)
+        table = self.table(symbol, adjust, raw, **fetch_kwargs)
+        with self._lock:
+            if table is None:
+                self.fallbacks += 1
+            else:
+                self.local_hits += 1
+        return None if table is None else table.apply(raw)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "reference_fetches": self.reference_fetches,
+                "local_hits": self.local_hits,
+                "fallbacks": self.fallbacks,
+            }
+
+
+a_adjuster = AdjustmentEngine(stock_hist_store)
+hk_adjuster = AdjustmentEngine(hk_hist_store)
+us_adjuster = AdjustmentEngine(us_hist_store)
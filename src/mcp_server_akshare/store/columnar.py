@@ -0,0 +1,116 @@
+"""
+基于 numpy 的列式分区文件。
+
+每个分区是一个目录: 每列一个 ``.npy`` 文件(定宽类型: float64/int64/datetime64/定长字符串)，
+外加 ``meta.json`` 记录列名和附加元数据。读取时可以内存映射，写入时先写临时目录
+再整体替换，读者不会看到写了一半的分区。
+"""
+
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import DATA_DIR  # noqa: F401  (各存储模块从这里导入)
+
+META_FILE = "meta.json"
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def path_segment(value: str) -> str:
+    """校验用作单级目录/文件名的参数(代码、复权方式等)，拒绝可能跳出存储目录的值"""
+    text = str(value)
+    if text in ("", ".", "..") or "/" in text or "\\" in text or "\0" in text:
+        raise ValueError(f"Invalid path segment {value!r}")
+    return text
+
+
+def partition_lock(path: Path) -> threading.Lock:
+    """获取分区的进程内写锁"""
+    key = str(path)
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = threading.Lock()
+        return lock
+
+
+def _to_array(series: pd.Series) -> np.ndarray:
+    """把列转换为定宽 numpy 数组"""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        if series.dt.tz is not None:
+            series = series.dt.tz_localize(None)
+        return series.to_numpy("datetime64[ns]")
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series.to_numpy(bool)
+    if pd.api.types.is_integer_dtype(series.dtype) and not series.hasnans:
+        return series.to_numpy(np.int64)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(np.float64, na_value=np.nan)
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred in ("date", "datetime", "datetime64"):
+        return pd.to_datetime(series, errors="coerce").to_numpy("datetime64[ns]")
+    if inferred in ("integer", "floating", "mixed-integer-float"):
+        # 规范化后含 None 的数值列为 object 类型，按数值保存而不是转为字符串
+        return pd.to_numeric(series).to_numpy(np.float64, na_value=np.nan)
+    return np.asarray(series.fillna("").astype(str).to_numpy(), dtype=str)
+
+
+def write_partition(path: Path, df: pd.DataFrame, meta: Optional[Dict[str, Any]] = None) -> None:
+    """原子地写入分区(覆盖已有内容)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir()
+    columns = [str(c) for c in df.columns]
+    for index, (_, series) in enumerate(df.items()):
+        np.save(tmp / f"{index}.npy", _to_array(series), allow_pickle=False)
+    with open(tmp / META_FILE, "w", encoding="utf-8") as f:
+        json.dump({"columns": columns, "rows": len(df), **(meta or {})}, f, ensure_ascii=False)
+
+    old = path.with_name(f"{path.name}.old-{os.getpid()}-{threading.get_ident()}")
+    if path.exists():
+        os.replace(path, old)
+    os.replace(tmp, path)
+    if old.exists():
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def read_meta(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(Path(path) / META_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_columns(path: Path, mmap: bool = True) -> Optional[Dict[str, np.ndarray]]:
+    """读取分区的所有列，mmap 为 True 时返回只读内存映射数组"""
+    meta = read_meta(path)
+    if meta is None:
+        return None
+    mode = "r" if mmap else None
+    try:
+        return {
+            name: np.load(Path(path) / f"{index}.npy", mmap_mode=mode, allow_pickle=False)
+            for index, name in enumerate(meta["columns"])
+        }
+    except OSError:
+        return None
+
+
+def read_partition(path: Path) -> Optional[pd.DataFrame]:
+    """读取分区为 DataFrame，分区不存在时返回 None"""
+    columns = read_columns(path, mmap=False)
+    if columns is None:
+        return None
+    return pd.DataFrame(columns)
@@ -0,0 +1,272 @@
+"""
+日线历史行情的本地分区存储与增量补齐。
+
+按 (数据集, 周期, 复权方式, 代码) 分区保存 K 线，并记录已覆盖的日期区间。
+请求被拆分为已缓存区间和缺失区间，只有缺失的日期才访问上游，拉取后合并回分区。
+当天及之后的 K 线可能尚未收盘，只返回不落盘。
+
+含交易日却拉取为空的区间(停牌，或上游临时返回空表)只在当天视为已覆盖，次日重新拉取；
+早于已有最早 K 线(上市之前)的空区间不会再有数据，记为永久覆盖。
+"""
+
+import datetime
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..cache import VOLATILE_ADJUSTS, today_cst
+from ..trading_calendar import trading_calendars
+from . import register_store
+from .columnar import DATA_DIR, partition_lock, path_segment, read_meta, read_partition, write_partition
+
+logger = logging.getLogger(__name__)
+
+DATE_COLUMN = "日期"
+
+Range = Tuple[int, int]  # 闭区间，元素为 date.toordinal()
+
+
+def parse_date(value: Any) -> datetime.date:
+    """解析 20210301 / 2021-03-01 / 2021-03-01 09:30:00 等格式的日期"""
+    digits = "".join(ch for ch in str(value) if ch.isdigit())[:8]
+    if len(digits) != 8:
+        raise ValueError(f"Invalid date {value!r}, expected YYYYMMDD")
+    return datetime.datetime.strptime(digits, "%Y%m%d").date()
+
+
+def format_date(ordinal: int) -> str:
+    return datetime.date.fromordinal(ordinal).strftime("%Y%m%d")
+
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """合并重叠或相邻的闭区间"""
+    merged: List[Range] = []
+    for start, end in sorted(r for r in ranges if r[0] <= r[1]):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(start: int, end: int, covered: List[Range]) -> List[Range]:
+    """返回 [start, end] 中未被 covered 覆盖的区间"""
+    missing: List[Range] = []
+    cursor = start
+    for c_start, c_end in merge_ranges(covered):
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            missing.append((cursor, c_start - 1))
+        cursor = max(cursor, c_end + 1)
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+def _dates(df: pd.DataFrame) -> np.ndarray:
+    return pd.to_datetime(df[DATE_COLUMN]).to_numpy("datetime64[D]")
+
+
+class HistoryStore:
+    """日线行情的分区存储"""
+
+    def __init__(
+        self,
+        dataset: str,
+        fetcher: Callable[..., pd.DataFrame],
+        root: Path = DATA_DIR,
+        volatile_adjusts: Tuple[str, ...] = VOLATILE_ADJUSTS,
+        settle_days: int = 1,
+        market: str = "a",
+    ):
+        """
+        Args:
+            dataset: 数据集名称，用作存储子目录
+            fetcher: 上游拉取函数，参数为 symbol/period/start_date/end_date/adjust
+            root: 存储根目录
+            volatile_adjusts: 会随除权事件整体变化的复权方式(如前复权)，其覆盖记录只在当天有效
+            settle_days: 距今多少天之前的交易日视为已收盘(美股按北京时间跨日收盘，需要 2 天)
+            market: 交易日历所属市场，缺失区间内没有交易日时不访问上游
+        """
+        self.dataset = dataset
+        self.fetcher = fetcher
+        self.root = Path(root)
+        self.volatile_adjusts = volatile_adjusts
+        self.settle_days = settle_days
+        self.calendar = trading_calendars.get(market)
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.full_hits = 0
+        self.upstream_calls = 0
+        self.rows_from_store = 0
+        self.rows_fetched = 0
+        register_store(self)
+
+    def partition_path(self, symbol: str, period: str, adjust: str) -> Path:
+        return self.root / self.dataset / path_segment(f"{period}_{adjust or 'none'}") / path_segment(symbol)
+
+    def _coverage(self, meta: Optional[Dict[str, Any]], adjust: str) -> List[Range]:
+        if not meta:
+            return []
+        if adjust in self.volatile_adjusts and meta.get("valid_on") != str(today_cst()):
+            return []
+        return [(parse_date(s).toordinal(), parse_date(e).toordinal()) for s, e in meta.get("coverage", [])]
+
+    def _empty_coverage(self, meta: Optional[Dict[str, Any]]) -> List[Range]:
+        """当天拉取为空的区间，次日失效"""
+        if not meta or meta.get("empty_on") != str(today_cst()):
+            return []
+        return [(parse_date(s).toordinal(), parse_date(e).toordinal()) for s, e in meta.get("empty", [])]
+
+    def get(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        period: str = "daily",
+        adjust: str = "",
+        **fetch_kwargs: Any,
+    ) -> pd.DataFrame:
+        """读取 [start_date, end_date] 的 K 线，缺失的日期从上游补齐"""
+        start = parse_date(start_date).toordinal()
+        end = parse_date(end_date).toordinal()
+        # 今天的 K 线可能尚未收盘，只把已收盘的交易日视为不可变
+        closed_end = today_cst().toordinal() - self.settle_days
+        path = self.partition_path(symbol, period, adjust)
+
+        with partition_lock(path):
+            meta = read_meta(path)
+            coverage = self._coverage(meta, adjust)
+            empty = self._empty_coverage(meta)
+            stored = read_partition(path) if coverage else None
+            missing = subtract_ranges(start, end, coverage + empty)
+
+            fetched = []
+            # 拉取为空的缺失区间
+            returned_empty: List[Range] = []
+            if missing:
+                logger.debug(f"{self.dataset} {symbol}: fetching {len(missing)} missing segment(s) from upstream")
+            for seg_start, seg_end in missing:
+                # 节假日、周末组成的缺口没有数据，只记录覆盖范围
+                if not self.calendar.has_session(
+                    datetime.date.fromordinal(seg_start), datetime.date.fromordinal(seg_end)
+                ):
+                    continue
+                df = self.fetcher(
+                    symbol=symbol,
+                    period=period,
+                    start_date=format_date(seg_start),
+                    end_date=format_date(seg_end),
+                    adjust=adjust,
+                    **fetch_kwargs,
+                )
+                with self._stats_lock:
+                    self.upstream_calls += 1
+                if df is not None and not df.empty:
+                    df = df.copy()
+                    df[DATE_COLUMN] = pd.to_datetime(df[DATE_COLUMN])
+                    fetched.append(df)
+                else:
+                    returned_empty.append((seg_start, seg_end))
+
+            frames = [f for f in [stored, *fetched] if f is not None and not f.empty]
+            combined = (
+                pd.concat(frames, ignore_index=True)
+                .drop_duplicates(subset=DATE_COLUMN, keep="last")
+                .sort_values(DATE_COLUMN, kind="stable")
+                .reset_index(drop=True)
+                if frames else pd.DataFrame()
+            )
+
+            # 早于最早一根 K 线的空区间是上市之前，其余空区间只在当天有效
+            first = _dates(combined)[0].astype(datetime.date).toordinal() if not combined.empty else None
+            transient = [r for r in returned_empty if first is None or r[1] >= first]
+            settled = [r for r in missing if r not in transient]
+            new_coverage = merge_ranges(
+                coverage + [(s, min(e, closed_end)) for s, e in settled if s <= closed_end]
+            )
+            new_empty = merge_ranges(
+                empty + [(s, min(e, closed_end)) for s, e in transient if s <= closed_end]
+            )
+            if missing and (new_coverage != merge_ranges(coverage) or new_empty != merge_ranges(empty)):
+                closed = combined[_dates(combined) <= np.datetime64(datetime.date.fromordinal(closed_end))] \
+                    if not combined.empty else combined
+                write_partition(path, closed, {
+                    "coverage": [[format_date(s), format_date(e)] for s, e in new_coverage],
+                    "valid_on": str(today_cst()),
+                    "empty": [[format_date(s), format_date(e)] for s, e in new_empty],
+                    "empty_on": str(today_cst()),
+                })
+
+        with self._stats_lock:
+            self.requests += 1
+            if not missing:
+                self.full_hits += 1
+            self.rows_fetched += sum(len(f) for f in fetched)
+            self.rows_from_store += 0 if stored is None else len(stored)
+
+        if combined.empty:
+            return combined
+        dates = _dates(combined)
+        lo = np.searchsorted(dates, np.datetime64(datetime.date.fromordinal(start)), side="left")
+        hi = np.searchsorted(dates, np.datetime64(datetime.date.fromordinal(end)), side="right")
+        return combined.iloc[lo:hi].reset_index(drop=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "requests": self.requests,
+                "full_hits": self.full_hits,
+                "upstream_calls": self.upstream_calls,
+                "rows_from_store": self.rows_from_store,
+                "rows_fetched": self.rows_fetched,
+            }
+
+
+def _fetch_stock_zh_a_hist(**kwargs: Any) -> pd.DataFrame:
+    import akshare as ak
+
+    return ak.stock_zh_a_hist(**kwargs)
+
+
+def _fetch_stock_hk_hist(timeout: Any = None, **kwargs: Any) -> pd.DataFrame:
+    import akshare as ak
+
+    return ak.stock_hk_hist(**kwargs)
+
+
+def _fetch_stock_us_hist(timeout: Any = None, **kwargs: Any) -> pd.DataFrame:
+    import akshare as ak
+
+    return ak.stock_us_hist(**kwargs)
+
+
+def _fetch_stock_board_industry_hist_em(period: str, timeout: Any = None, **kwargs: Any) -> pd.DataFrame:
+    import akshare as ak
+
+    return ak.stock_board_industry_hist_em(period=BOARD_INDUSTRY_PERIODS.get(period, period), **kwargs)
+
+
+def _fetch_stock_board_concept_hist_em(timeout: Any = None, **kwargs: Any) -> pd.DataFrame:
+    import akshare as ak
+
+    return ak.stock_board_concept_hist_em(**kwargs)
+
+
+# 行业板块接口使用中文周期名称
+BOARD_INDUSTRY_PERIODS = {"daily": "日k", "weekly": "周k", "monthly": "月k"}
+
+stock_hist_store = HistoryStore("stock_zh_a_hist", _fetch_stock_zh_a_hist)
+hk_hist_store = HistoryStore("stock_hk_hist", _fetch_stock_hk_hist, market="hk")
+us_hist_store = HistoryStore("stock_us_hist", _fetch_stock_us_hist, settle_days=2, market="us")
+board_industry_hist_store = HistoryStore("stock_board_industry_hist_em", _fetch_stock_board_industry_hist_em)
+board_concept_hist_store = HistoryStore("stock_board_concept_hist_em", _fetch_stock_board_concept_hist_em)
@@ -0,0 +1,317 @@
+"""
+分钟线的本地存储。
+
+每个 (数据集, 周期, 复权方式, 代码) 一个目录，其中每个交易日一个列式分区(``YYYYMMDD``)。
+已收盘的交易日写入后不再修改，新的交易日只追加新分区。读取时按日期二分定位分区，
+分区内的列以内存映射方式打开，并在时间列上二分查找首尾位置后切片，不复制未用到的数据。
+"""
+
+import bisect
+import datetime
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..cache import today_cst
+from ..trading_calendar import trading_calendars
+from . import register_store
+from .columnar import DATA_DIR, partition_lock, path_segment, read_columns, write_partition
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+# 保持内存映射的分区数上限
+MAX_MAPPED_PARTITIONS = int(os.getenv("AKSHARE_MCP_MAPPED_PARTITIONS", "4096"))
+
+
+def _day(ordinal: int) -> str:
+    return datetime.date.fromordinal(ordinal).strftime("%Y%m%d")
+
+
+def _ordinal(day: str) -> int:
+    return datetime.datetime.strptime(day, "%Y%m%d").date().toordinal()
+
+
+def _bound(value: Any) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).to_datetime64(), "ns")
+
+
+class _SymbolIndex:
+    """单个代码目录的日期索引"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.days: List[int] = sorted(
+            _ordinal(p.name) for p in path.iterdir() if p.is_dir() and p.name.isdigit() and len(p.name) == 8
+        ) if path.is_dir() else []
+        # 上游没有数据的工作日(节假日、停牌)，以及上游可提供的最早日期
+        self.empty: Set[int] = set()
+        self.unavailable_before: Optional[int] = None
+        try:
+            with open(path / INDEX_FILE, encoding="utf-8") as f:
+                meta = json.load(f)
+            self.empty = {_ordinal(d) for d in meta.get("empty", [])}
+            if meta.get("unavailable_before"):
+                self.unavailable_before = _ordinal(meta["unavailable_before"])
+        except (OSError, ValueError):
+            pass
+
+    def covers(self, ordinal: int) -> bool:
+        if self.unavailable_before is not None and ordinal < self.unavailable_before:
+            return True
+        if ordinal in self.empty:
+            return True
+        i = bisect.bisect_left(self.days, ordinal)
+        return i < len(self.days) and self.days[i] == ordinal
+
+    def save(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / f"{INDEX_FILE}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "empty": [_day(d) for d in sorted(self.empty)],
+                "unavailable_before": _day(self.unavailable_before) if self.unavailable_before else None,
+            }, f)
+        os.replace(tmp, self.path / INDEX_FILE)
+
+
+class MinuteStore:
+    """按交易日分区的分钟线存储"""
+
+    def __init__(
+        self,
+        dataset: str,
+        fetcher: Callable[..., pd.DataFrame],
+        time_column: str = "时间",
+        root: Path = DATA_DIR,
+        settle_days: int = 1,
+        market: str = "a",
+    ):
+        """
+        Args:
+            dataset: 数据集名称，用作存储子目录
+            fetcher: 上游拉取函数，参数为 symbol/period/adjust，返回该代码上游可提供的全部分钟线
+            time_column: 时间列名称
+            root: 存储根目录
+            settle_days: 距今多少天之前的交易日视为已收盘(美股按北京时间跨日收盘，需要 2 天)
+            market: 交易日历所属市场
+        """
+        self.dataset = dataset
+        self.fetcher = fetcher
+        self.time_column = time_column
+        self.root = Path(root)
+        self.settle_days = settle_days
+        self.calendar = trading_calendars.get(market)
+        self._indexes: Dict[Path, _SymbolIndex] = {}
+        self._mapped: "OrderedDict[Tuple[Path, int], Dict[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.full_hits = 0
+        self.upstream_calls = 0
+        self.days_written = 0
+        register_store(self)
+
+    def symbol_path(self, symbol: str, period: str, adjust: str) -> Path:
+        return self.root / self.dataset / path_segment(f"{period}_{adjust or 'none'}") / path_segment(symbol)
+
+    def _index(self, path: Path) -> _SymbolIndex:
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is None:
+                index = self._indexes[path] = _SymbolIndex(path)
+            return index
+
+    def _columns(self, path: Path, ordinal: int) -> Optional[Dict[str, np.ndarray]]:
+        """获取交易日分区的内存映射列(LRU 缓存)"""
+        key = (path, ordinal)
+        with self._lock:
+            columns = self._mapped.get(key)
+            if columns is not None:
+                self._mapped.move_to_end(key)
+                return columns
+        mapped = read_columns(path / _day(ordinal), mmap=True)
+        if mapped is None:
+            return None
+        # 转为普通 ndarray 视图(仍共享映射内存)，避免 np.memmap 切片的额外开销
+        columns = {name: np.asarray(values) for name, values in mapped.items()}
+        with self._lock:
+            self._mapped[key] = columns
+            while len(self._mapped) > MAX_MAPPED_PARTITIONS:
+                self._mapped.popitem(last=False)
+        return columns
+
+    def available_from(self, symbol: str, period: str, adjust: str) -> Optional[datetime.date]:
+        """上游可提供的最早交易日(尚未探测到上游边界时为 None)"""
+        index = self._index(self.symbol_path(symbol, period, adjust))
+        if index.unavailable_before is None:
+            return None
+        return datetime.date.fromordinal(index.unavailable_before)
+
+    def read(self, symbol: str, period: str, adjust: str, start: Any, end: Any) -> pd.DataFrame:
+        """只从本地读取 [start, end] 内的分钟线"""
+        lo_ts, hi_ts = _bound(start), _bound(end)
+        path = self.symbol_path(symbol, period, adjust)
+        index = self._index(path)
+        days = index.days
+        first = pd.Timestamp(lo_ts).date().toordinal()
+        last = pd.Timestamp(hi_ts).date().toordinal()
+        lo = bisect.bisect_left(days, first)
+        hi = bisect.bisect_right(days, last)
+
+        parts: List[Dict[str, np.ndarray]] = []
+        for ordinal in days[lo:hi]:
+            columns = self._columns(path, ordinal)
+            if columns is None:
+                continue
+            if first < ordinal < last:
+                parts.append(columns)
+                continue
+            # 只有首尾两个交易日需要在时间列上二分截取
+            times = columns[self.time_column]
+            i = np.searchsorted(times, lo_ts, side="left")
+            j = np.searchsorted(times, hi_ts, side="right")
+            if i < j:
+                parts.append({name: values[i:j] for name, values in columns.items()})
+
+        if not parts:
+            return pd.DataFrame()
+        if len(parts) == 1:
+            return pd.DataFrame({name: np.asarray(values) for name, values in parts[0].items()})
+        return pd.DataFrame({name: np.concatenate([p[name] for p in parts]) for name in parts[0]})
+
+    def archive(self, symbol: str, period: str, adjust: str, df: pd.DataFrame) -> None:
+        """归档上游返回的分钟线(用于没有日期范围参数的接口)"""
+        with partition_lock(self.symbol_path(symbol, period, adjust)):
+            self._append(symbol, period, adjust, df)
+
+    def _append(self, symbol: str, period: str, adjust: str, df: pd.DataFrame) -> Tuple[pd.DataFrame, Set[int]]:
+        """把已收盘交易日的分钟线追加为新分区，已存在的交易日不会被改写，调用方需持有分区锁
+
+        Returns:
+            (时间列已转换为 datetime64 的数据, 数据中出现的交易日)
+        """
+        if df is None or df.empty:
+            return pd.DataFrame(), set()
+        df = df.copy()
+        df[self.time_column] = pd.to_datetime(df[self.time_column])
+        df = df.sort_values(self.time_column, kind="stable").drop_duplicates(self.time_column, keep="last")
+        day_of_row = df[self.time_column].dt.normalize()
+        closed_end = today_cst().toordinal() - self.settle_days
+
+        path = self.symbol_path(symbol, period, adjust)
+        index = self._index(path)
+        seen: Set[int] = set()
+        for stamp, group in df.groupby(day_of_row, sort=True):
+            ordinal = stamp.date().toordinal()
+            seen.add(ordinal)
+            if ordinal > closed_end or ordinal in index.days:
+                continue
+            write_partition(path / _day(ordinal), group.reset_index(drop=True), {"day": _day(ordinal)})
+            with self._lock:
+                bisect.insort(index.days, ordinal)
+                index.empty.discard(ordinal)
+                self.days_written += 1
+        return df, seen
+
+    def get(
+        self,
+        symbol: str,
+        start_date: Any,
+        end_date: Any,
+        period: str = "1",
+        adjust: str = "",
+        **fetch_kwargs: Any,
+    ) -> pd.DataFrame:
+        """读取 [start_date, end_date] 的分钟线，本地缺少交易日时从上游补齐"""
+        lo_ts, hi_ts = _bound(start_date), _bound(end_date)
+        today = today_cst().toordinal()
+        closed_end = today - self.settle_days
+        path = self.symbol_path(symbol, period, adjust)
+
+        with partition_lock(path):
+            index = self._index(path)
+            first = pd.Timestamp(lo_ts).date().toordinal()
+            if index.unavailable_before is not None:
+                first = max(first, index.unavailable_before)
+            last = min(pd.Timestamp(hi_ts).date().toordinal(), today)
+            # 非交易日没有分钟线；其他未覆盖的日期都需要访问上游
+            is_trading_day = self.calendar.is_trading_day
+            missing = [
+                d for d in range(first, last + 1)
+                if not index.covers(d) and is_trading_day(datetime.date.fromordinal(d))
+            ]
+
+            fresh = None
+            if missing:
+                # 上游分钟线接口总是返回全部可用数据再按日期截取，因此一次拉取全量并归档
+                df = self.fetcher(symbol=symbol, period=period, adjust=adjust, **fetch_kwargs)
+                with self._lock:
+                    self.upstream_calls += 1
+                df, seen = self._append(symbol, period, adjust, df)
+                if seen:
+                    earliest, latest = min(seen), max(seen)
+                    if missing[0] < earliest:
+                        index.unavailable_before = earliest
+                    index.empty.update(d for d in missing if earliest < d < latest and d not in seen)
+                    index.save()
+                    # 未收盘的交易日只返回不落盘
+                    fresh = df[df[self.time_column].dt.normalize() > pd.Timestamp(datetime.date.fromordinal(closed_end))]
+
+        with self._lock:
+            self.requests += 1
+            if not missing:
+                self.full_hits += 1
+
+        result = self.read(symbol, period, adjust, lo_ts, hi_ts)
+        if fresh is not None and not fresh.empty:
+            times = fresh[self.time_column]
+            fresh = fresh[(times >= lo_ts) & (times <= hi_ts)]
+            result = pd.concat([result, fresh], ignore_index=True) if not result.empty else fresh.reset_index(drop=True)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "full_hits": self.full_hits,
+                "upstream_calls": self.upstream_calls,
+                "days_written": self.days_written,
+                "mapped_partitions": len(self._mapped),
+            }
+
+
+def _fetch_stock_zh_a_hist_min_em(symbol: str, period: str, adjust: str, **kwargs: Any) -> pd.DataFrame:
+    import akshare as ak
+
+    return ak.stock_zh_a_hist_min_em(symbol=symbol, period=period, adjust=adjust)
+
+
+def _fetch_stock_hk_hist_min_em(symbol: str, period: str, adjust: str, **kwargs: Any) -> pd.DataFrame:
+    import akshare as ak
+
+    return ak.stock_hk_hist_min_em(symbol=symbol, period=period, adjust=adjust)
+
+
+def _fetch_stock_us_hist_min_em(symbol: str, period: str, adjust: str, **kwargs: Any) -> pd.DataFrame:
+    import akshare as ak
+
+    return ak.stock_us_hist_min_em(symbol=symbol)
+
+
+def _fetch_stock_zh_a_minute(symbol: str, period: str, adjust: str, **kwargs: Any) -> pd.DataFrame:
+    import akshare as ak
+
+    return ak.stock_zh_a_minute(symbol=symbol, period=period, adjust=adjust)
+
+
+a_minute_store = MinuteStore("stock_zh_a_hist_min_em", _fetch_stock_zh_a_hist_min_em)
+hk_minute_store = MinuteStore("stock_hk_hist_min_em", _fetch_stock_hk_hist_min_em, market="hk")
+us_minute_store = MinuteStore("stock_us_hist_min_em", _fetch_stock_us_hist_min_em, settle_days=2, market="us")
+sina_minute_store = MinuteStore("stock_zh_a_minute", _fetch_stock_zh_a_minute, time_column="day")
@@ -0,0 +1,184 @@
+"""
+K 线周期转换。
+
+由 1 分钟线合成 5/15/30/60 分钟线。A 股上午 09:30-11:30、下午 13:00-15:00 交易，
+分钟线按交易时段内的分钟序号分箱(而不是按自然时间)，午间休市不会产生跨休市的 K 线，
+与东方财富的分钟 K 线一致: 60 分钟线为 10:30、11:30、14:00、15:00 四根。
+每根 K 线以区间结束时间标记，09:30 集合竞价的成交并入第一根 K 线。
+换手率按成交量与流通股计算。
+
+由日线合成周线、月线。日线只包含交易日，按自然周(周一开始)/自然月分组，
+每根 K 线以组内最后一个交易日标记，节假日缩短的周、月不需要额外处理。
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+MINUTE_PERIODS = ("5", "15", "30", "60")
+DAILY_PERIODS = ("weekly", "monthly")
+
+MORNING_OPEN = 9 * 60 + 30
+AFTERNOON_OPEN = 13 * 60
+SESSION_MINUTES = 120
+
+# 上游分钟 K 线(非 1 分钟)的列顺序
+MINUTE_BAR_COLUMNS = ["时间", "开盘", "收盘", "最高", "最低", "涨跌幅", "涨跌额", "成交量", "成交额", "振幅", "换手率"]
+
+
+def _group_bounds(keys: np.ndarray):
+    """分组键单调不减时，返回每组首尾行的位置，用于 ufunc.reduceat 向量化聚合"""
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+    return starts, ends
+
+
+def _trading_minute(times: pd.Series) -> np.ndarray:
+    """时间 -> 当日第几个交易分钟(1-240)，集合竞价及更早的记录归为第 1 分钟"""
+    clock = (times.dt.hour * 60 + times.dt.minute).to_numpy()
+    minute = np.where(
+        clock >= AFTERNOON_OPEN,
+        SESSION_MINUTES + clock - AFTERNOON_OPEN,
+        clock - MORNING_OPEN,
+    )
+    return np.clip(minute, 1, 2 * SESSION_MINUTES)
+
+
+def _clock(minute: np.ndarray) -> np.ndarray:
+    """交易分钟序号 -> 当日时刻(分钟)"""
+    return np.where(minute > SESSION_MINUTES, AFTERNOON_OPEN + minute - SESSION_MINUTES, MORNING_OPEN + minute)
+
+
+def bar_labels(times: pd.Series, period: int) -> pd.Series:
+    """计算每条 1 分钟线所属 K 线的结束时间"""
+    minute = _trading_minute(times)
+    end_minute = -(-minute // period) * period
+    return times.dt.normalize() + pd.to_timedelta(_clock(end_minute), unit="min")
+
+
+def resample_minutes(df: pd.DataFrame, period: str, time_column: str = "时间",
+                     float_shares: Optional[float] = None) -> pd.DataFrame:
+    """把 1 分钟线合成为 period 分钟线
+
+    Args:
+        df: 按时间升序的 1 分钟线，包含 开盘/收盘/最高/最低/成交量(手)/成交额 列
+        period: 目标周期，'5'/'15'/'30'/'60'
+        float_shares: 流通股(股)，用于计算换手率
+
+    Returns:
+        与上游分钟 K 线相同列的 DataFrame。涨跌幅、涨跌额、振幅相对于上一根 K 线的收盘价，
+        第一根 K 线没有前收盘价时为空；未给出流通股时换手率为空。
+    """
+    if period not in MINUTE_PERIODS:
+        raise ValueError(f"Unsupported period {period!r}, expected one of {', '.join(MINUTE_PERIODS)}")
+    if df.empty:
+        return pd.DataFrame(columns=MINUTE_BAR_COLUMNS)
+
+    times = pd.to_datetime(df[time_column])
+    labels = bar_labels(times, int(period))
+    keys = labels.to_numpy()
+    starts, ends = _group_bounds(keys)
+
+    def reduce(column: str, ufunc) -> np.ndarray:
+        values = df[column].to_numpy()
+        if not np.issubdtype(values.dtype, np.integer):
+            values = values.astype(np.float64)
+        return ufunc.reduceat(values, starts)
+
+    open_ = df["开盘"].to_numpy(np.float64)[starts]
+    close = df["收盘"].to_numpy(np.float64)[ends]
+    high = reduce("最高", np.fmax)
+    low = reduce("最低", np.fmin)
+    prev_close = np.r_[np.nan, close[:-1]]
+    volume = reduce("成交量", np.add)
+    if float_shares:
+        turnover = np.round(volume * 100 / float_shares * 100, 2)
+    else:
+        turnover = np.full(len(starts), np.nan)
+
+    return pd.DataFrame({
+        "时间": keys[starts],
+        "开盘": open_,
+        "收盘": close,
+        "最高": high,
+        "最低": low,
+        "涨跌幅": np.round((close - prev_close) / prev_close * 100, 2),
+        "涨跌额": np.round(close - prev_close, 3),
+        "成交量": volume,
+        "成交额": reduce("成交额", np.add),
+        "振幅": np.round((high - low) / prev_close * 100, 2),
+        "换手率": turnover,
+    })
+
+
+def lookback_start(start: pd.Timestamp, days: int = 7) -> pd.Timestamp:
+    """计算涨跌幅需要前一根 K 线，读取时向前多取几天"""
+    return start.normalize() - pd.Timedelta(days=days)
+
+
+def period_start(date: pd.Timestamp, period: str) -> pd.Timestamp:
+    """date 所在周(周一)或月的第一天"""
+    date = date.normalize()
+    if period == "weekly":
+        return date - pd.Timedelta(days=date.weekday())
+    return date.replace(day=1)
+
+
+def period_lookback(start: pd.Timestamp, period: str) -> pd.Timestamp:
+    """合成 start 所在周期及其前一根 K 线(用于涨跌幅)需要的日线起始日期"""
+    return period_start(period_start(start, period) - pd.Timedelta(days=1), period)
+
+
+def resample_daily(df: pd.DataFrame, period: str, date_column: str = "日期") -> pd.DataFrame:
+    """把按日期升序的日线合成为周线或月线
+
+    开高低收按首/最大/最小/末聚合，成交量、成交额、换手率求和，涨跌幅、涨跌额、振幅
+    相对于上一根 K 线的收盘价重新计算，其他列取组内最后一个值。列顺序与输入相同。
+    """
+    if period not in DAILY_PERIODS:
+        raise ValueError(f"Unsupported period {period!r}, expected one of {', '.join(DAILY_PERIODS)}")
+    if df.empty:
+        return df.copy()
+
+    dates = pd.to_datetime(df[date_column])
+    if period == "weekly":
+        keys = (dates - pd.to_timedelta(dates.dt.weekday, unit="D")).to_numpy()
+    else:
+        keys = dates.to_numpy().astype("datetime64[M]")
+    starts, ends = _group_bounds(keys)
+
+    def column(name: str) -> np.ndarray:
+        return df[name].to_numpy(np.float64)
+
+    out = {}
+    for name in df.columns:
+        if name == date_column:
+            out[name] = dates.to_numpy()[ends]
+        elif name == "开盘":
+            out[name] = column(name)[starts]
+        elif name == "最高":
+            out[name] = np.fmax.reduceat(column(name), starts)
+        elif name == "最低":
+            out[name] = np.fmin.reduceat(column(name), starts)
+        elif name in ("成交量", "成交额", "换手率"):
+            values = df[name].to_numpy()
+            if not np.issubdtype(values.dtype, np.integer):
+                values = values.astype(np.float64)
+            out[name] = np.add.reduceat(values, starts)
+        else:
+            out[name] = df[name].to_numpy()[ends]
+
+    result = pd.DataFrame(out)
+    if {"收盘", "最高", "最低"} <= set(result.columns):
+        close = result["收盘"].to_numpy(np.float64)
+        prev_close = np.r_[np.nan, close[:-1]]
+        if "涨跌幅" in result:
+            result["涨跌幅"] = np.round((close - prev_close) / prev_close * 100, 2)
+        if "涨跌额" in result:
+            result["涨跌额"] = np.round(close - prev_close, 3)
+        if "振幅" in result:
+            result["振幅"] = np.round((result["最高"] - result["最低"]).to_numpy() / prev_close * 100, 2)
+    if "换手率" in result:
+        result["换手率"] = np.round(result["换手率"], 2)
+    return result
@@ -0,0 +1,428 @@
+"""
+A 股、港股、美股交易日历。
+
+交易日列表从上游拉取后保存在数据目录中，每天最多刷新一次。加载后按日期序号建立
+定长查找表(是否交易日、前一个/后一个交易日)，``is_trading_day``、``previous_session``、
+``next_session`` 都是 O(1) 的数组下标访问。日历尚未加载或日期超出已知范围时，
+按周一至周五为交易日处理。
+
+日历同时提供交易时段时钟: 实时类工具在盘中按秒级过期，收盘后缓存冻结到下一个交易时段开始。
+
+分发路径用日历规范化日期参数: 按交易日查询的工具在非交易日直接返回空结果，
+区间查询的首尾日期收缩到交易日，使 ``end_date=2222-01-01`` 和今天、周日和上周五
+得到相同的缓存键，区间内没有交易日时不访问上游。
+"""
+
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from .store import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_DIR = DATA_DIR / "calendar"
+# 日历过期后两次刷新尝试之间的最小间隔(秒)
+REFRESH_RETRY_INTERVAL = 3600
+
+# 按单个交易日查询的工具及其日期参数，非交易日上游只会返回空表
+SESSION_DATE_TOOLS = {
+    "stock_zt_pool_em": "date",
+    "stock_zt_pool_previous_em": "date",
+    "stock_zt_pool_strong_em": "date",
+    "stock_zt_pool_sub_new_em": "date",
+    "stock_zt_pool_zbgc_em": "date",
+    "stock_zt_pool_dtgc_em": "date",
+    "stock_lhb_detail_daily_sina": "date",
+    "stock_margin_detail_sse": "date",
+    "stock_margin_detail_szse": "date",
+    "stock_margin_szse": "date",
+    "stock_sse_deal_daily": "date",
+    "stock_intraday_sina": "date",
+}
+
+# 按交易日返回行情的区间查询工具及其 (起始, 结束) 日期参数
+RANGE_TOOLS = {
+    "stock_zh_a_hist": ("start_date", "end_date"),
+    "stock_zh_a_hist_min_em": ("start_date", "end_date"),
+    "stock_zh_a_hist_tx": ("start_date", "end_date"),
+    "stock_zh_a_cdr_daily": ("start_date", "end_date"),
+    "stock_zh_b_daily": ("start_date", "end_date"),
+    "stock_hk_hist": ("start_date", "end_date"),
+    "stock_hk_hist_min_em": ("start_date", "end_date"),
+    "stock_us_hist": ("start_date", "end_date"),
+    "stock_us_hist_min_em": ("start_date", "end_date"),
+    "stock_board_industry_hist_em": ("start_date", "end_date"),
+    "stock_board_concept_hist_em": ("start_date", "end_date"),
+    "stock_board_industry_index_ths": ("start_date", "end_date"),
+    "stock_board_concept_index_ths": ("start_date", "end_date"),
+    "stock_dzjy_mrmx": ("start_date", "end_date"),
+    "stock_dzjy_mrtj": ("start_date", "end_date"),
+    "stock_margin_sse": ("start_date", "end_date"),
+}
+
+# 各市场交易时段(当地时间)，A 股从开盘集合竞价算起，港股含开市前时段和收市竞价
+MARKET_HOURS = {
+    "a": ((datetime.time(9, 15), datetime.time(11, 30)), (datetime.time(13, 0), datetime.time(15, 0))),
+    "hk": ((datetime.time(9, 0), datetime.time(12, 0)), (datetime.time(13, 0), datetime.time(16, 10))),
+    "us": ((datetime.time(9, 30), datetime.time(16, 0)),),
+}
+# 每个交易时段结束后仍按盘中处理的秒数(收盘后数据的最终更新、科创板盘后固定价格交易)
+CLOSE_GRACE = float(os.getenv("AKSHARE_MCP_CLOSE_GRACE", "600"))
+
+MARKET_TIMEZONES = {
+    "a": ZoneInfo("Asia/Shanghai"),
+    "hk": ZoneInfo("Asia/Hong_Kong"),
+    "us": ZoneInfo("America/New_York"),
+}
+
+
+def market_for_tool(name: str) -> str:
+    """根据工具名称判断所属市场"""
+    if "_hk_" in name:
+        return "hk"
+    if "_us_" in name:
+        return "us"
+    return "a"
+
+
+def parse_day(value: Any) -> Optional[datetime.date]:
+    """解析 20210616 / 2021-06-16 / 2021-06-16 09:32:00 等格式的日期，无法解析时返回 None"""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if not isinstance(value, str):
+        return None
+    digits = "".join(c for c in value[:10] if c.isdigit())
+    if len(digits) != 8:
+        return None
+    try:
+        return datetime.date(int(digits[:4]), int(digits[4:6]), int(digits[6:]))
+    except ValueError:
+        return None
+
+
+def format_like(original: str, day: datetime.date, end: bool) -> str:
+    """按原参数的格式输出日期，带时间的参数取当天的开始或结束时刻"""
+    if "-" not in original[:10]:
+        return day.strftime("%Y%m%d")
+    text = day.isoformat()
+    if len(original) > 10:
+        text += " 23:59:59" if end else " 00:00:00"
+    return text
+
+
+def _weekday_back(ordinal: int) -> int:
+    while datetime.date.fromordinal(ordinal).weekday() >= 5:
+        ordinal -= 1
+    return ordinal
+
+
+def _weekday_forward(ordinal: int) -> int:
+    while datetime.date.fromordinal(ordinal).weekday() >= 5:
+        ordinal += 1
+    return ordinal
+
+
+# (首个交易日序号, 每天是否交易日, 不晚于当天的最近交易日偏移, 不早于当天的最近交易日偏移)
+_Table = Tuple[int, bytearray, array, array]
+_EMPTY_TABLE: _Table = (0, bytearray(), array("i"), array("i"))
+
+
+def build_table(ordinals: Iterable[int]) -> _Table:
+    """由交易日序号建立查找表，没有前一个/后一个交易日时偏移为 -1"""
+    days = sorted(set(ordinals))
+    if not days:
+        return _EMPTY_TABLE
+    base = days[0]
+    size = days[-1] - base + 1
+    flags = bytearray(size)
+    for ordinal in days:
+        flags[ordinal - base] = 1
+    prev = array("i", [-1]) * size
+    nxt = array("i", [-1]) * size
+    last = -1
+    for i in range(size):
+        if flags[i]:
+            last = i
+        prev[i] = last
+    last = -1
+    for i in range(size - 1, -1, -1):
+        if flags[i]:
+            last = i
+        nxt[i] = last
+    return base, flags, prev, nxt
+
+
+class TradingCalendar:
+    """单个市场的交易日历"""
+
+    def __init__(self, market: str, loader: Callable[[], Iterable[Any]], root=CALENDAR_DIR):
+        self.market = market
+        self.loader = loader
+        self.tz = MARKET_TIMEZONES[market]
+        self.path = root / f"{market}.json"
+        self._table: _Table = _EMPTY_TABLE
+        self.fetched_on: Optional[str] = None
+        self.source = "weekday"
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._last_attempt = 0.0
+        self._next_check = 0.0
+        self.errors = 0
+
+    def today(self) -> datetime.date:
+        """市场所在时区的当前日期"""
+        return datetime.datetime.now(self.tz).date()
+
+    def _ensure_loaded(self) -> _Table:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load_file()
+                    self._loaded = True
+        # 查询路径上每分钟最多检查一次日历是否过期
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + 60
+            if self.fetched_on != str(self.today()) and now - self._last_attempt > REFRESH_RETRY_INTERVAL:
+                self.refresh_async()
+        return self._table
+
+    def _load_file(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        sessions = [parse_day(d) for d in saved.get("sessions", [])]
+        self._table = build_table(d.toordinal() for d in sessions if d is not None)
+        self.fetched_on = saved.get("fetched_on")
+        self.source = "file"
+
+    def refresh(self) -> bool:
+        """从上游拉取交易日列表并保存，失败时保留已有日历"""
+        with self._lock:
+            if not self._loaded:
+                self._load_file()
+                self._loaded = True
+            if self.fetched_on == str(self.today()):
+                return True
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            self._last_attempt = time.monotonic()
+        try:
+            sessions = sorted({d for d in map(parse_day, self.loader()) if d is not None})
+            if not sessions:
+                raise ValueError("empty calendar")
+            table = build_table(d.toordinal() for d in sessions)
+            fetched_on = str(self.today())
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"fetched_on": fetched_on, "sessions": [d.strftime("%Y%m%d") for d in sessions]}, f)
+            os.replace(tmp, self.path)
+            with self._lock:
+                self._table = table
+                self.fetched_on = fetched_on
+                self.source = "upstream"
+            logger.info(f"Loaded {self.market} trading calendar: {len(sessions)} sessions up to {sessions[-1]}")
+            return True
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Failed to refresh {self.market} trading calendar: {e}")
+            return False
+        finally:
+            self._refreshing = False
+
+    def refresh_async(self) -> None:
+        """在后台线程中刷新，不阻塞调用方"""
+        if not self._refreshing:
+            threading.Thread(target=self.refresh, name=f"calendar-{self.market}", daemon=True).start()
+
+    def is_trading_day(self, day: datetime.date) -> bool:
+        base, flags, _, _ = self._ensure_loaded()
+        i = day.toordinal() - base
+        if 0 <= i < len(flags):
+            return bool(flags[i])
+        return day.weekday() < 5
+
+    def previous_session(self, day: datetime.date, inclusive: bool = True) -> datetime.date:
+        """不晚于 day(inclusive=False 时早于 day)的最近交易日"""
+        base, flags, prev, _ = self._ensure_loaded()
+        ordinal = day.toordinal() - (0 if inclusive else 1)
+        i = ordinal - base
+        if i >= len(flags):
+            ordinal = _weekday_back(ordinal)
+            i = ordinal - base
+            if i >= len(flags):
+                return datetime.date.fromordinal(ordinal)
+        if i >= 0:
+            if prev[i] >= 0:
+                return datetime.date.fromordinal(base + prev[i])
+            ordinal = base - 1
+        return datetime.date.fromordinal(_weekday_back(ordinal))
+
+    def next_session(self, day: datetime.date, inclusive: bool = True) -> datetime.date:
+        """不早于 day(inclusive=False 时晚于 day)的最近交易日"""
+        base, flags, _, nxt = self._ensure_loaded()
+        ordinal = day.toordinal() + (0 if inclusive else 1)
+        i = ordinal - base
+        if i < 0:
+            ordinal = _weekday_forward(ordinal)
+            i = ordinal - base
+            if i < 0:
+                return datetime.date.fromordinal(ordinal)
+        if i < len(flags):
+            if nxt[i] >= 0:
+                return datetime.date.fromordinal(base + nxt[i])
+            ordinal = base + len(flags)
+        return datetime.date.fromordinal(_weekday_forward(ordinal))
+
+    def _session_bounds(self, day: datetime.date):
+        """day 各交易时段的 (开始, 结束 + 宽限期) Unix 时间戳"""
+        return [
+            (
+                datetime.datetime.combine(day, start, self.tz).timestamp(),
+                datetime.datetime.combine(day, end, self.tz).timestamp() + CLOSE_GRACE,
+            )
+            for start, end in MARKET_HOURS[self.market]
+        ]
+
+    def seconds_until_open(self, now: Optional[float] = None) -> float:
+        """距下一个交易时段开始的秒数，交易时段内(含收盘宽限期)返回 0"""
+        now = time.time() if now is None else now
+        day = datetime.datetime.fromtimestamp(now, self.tz).date()
+        if self.is_trading_day(day):
+            for start, end in self._session_bounds(day):
+                if now < start:
+                    return start - now
+                if now < end:
+                    return 0.0
+        return self._session_bounds(self.next_session(day, inclusive=False))[0][0] - now
+
+    def session_ttl(self, open_ttl: float, now: Optional[float] = None) -> float:
+        """盘中返回 open_ttl，休市时返回到下一个交易时段开始的秒数"""
+        return max(open_ttl, self.seconds_until_open(now))
+
+    def has_session(self, start: datetime.date, end: datetime.date) -> bool:
+        """[start, end] 内是否有交易日"""
+        return start <= end and self.next_session(start) <= end
+
+    def stats(self) -> Dict[str, Any]:
+        base, flags, _, _ = self._table
+        return {
+            "source": self.source,
+            "fetched_on": self.fetched_on,
+            "sessions": sum(flags),
+            "first": str(datetime.date.fromordinal(base)) if flags else None,
+            "last": str(datetime.date.fromordinal(base + len(flags) - 1)) if flags else None,
+            "errors": self.errors,
+        }
+
+
+def _load_a_sessions() -> Iterable[Any]:
+    import akshare as ak
+
+    return ak.tool_trade_date_hist_sina()["trade_date"]
+
+
+def _load_hk_sessions() -> Iterable[Any]:
+    """恒生指数有行情的日期即港股交易日"""
+    import akshare as ak
+
+    return ak.stock_hk_index_daily_sina(symbol="HSI")["date"]
+
+
+def _load_us_sessions() -> Iterable[Any]:
+    """标普 500 指数有行情的日期即美股交易日"""
+    import akshare as ak
+
+    return ak.index_us_stock_sina(symbol=".INX")["date"]
+
+
+class TradingCalendars:
+    """各市场交易日历，以及分发路径上的日期参数规范化"""
+
+    def __init__(self, calendars: Dict[str, TradingCalendar]):
+        self.calendars = calendars
+        self.skipped_calls = 0
+        self.clamped_calls = 0
+
+    def get(self, market: str) -> TradingCalendar:
+        return self.calendars[market]
+
+    def for_tool(self, name: str) -> TradingCalendar:
+        return self.calendars[market_for_tool(name)]
+
+    def refresh(self) -> None:
+        for calendar in self.calendars.values():
+            calendar.refresh()
+
+    def normalize(self, name: str, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """按交易日历规范化日期参数
+
+        Returns:
+            None 表示请求的日期或区间内没有交易日，不需要访问上游；否则返回需要改写的参数
+            (可能为空)。区间结束日期晚于今天时收缩到今天，非交易日的结束日期改为前一个交易日，
+            非交易日的起始日期改为后一个交易日。
+        """
+        param = SESSION_DATE_TOOLS.get(name)
+        if param is not None:
+            day = parse_day(arguments.get(param))
+            if day is not None and not self.for_tool(name).is_trading_day(day):
+                self.skipped_calls += 1
+                return None
+            return {}
+
+        params = RANGE_TOOLS.get(name)
+        if params is None:
+            return {}
+        start_param, end_param = params
+        start, end = parse_day(arguments.get(start_param)), parse_day(arguments.get(end_param))
+        if start is None or end is None:
+            return {}
+        calendar = self.for_tool(name)
+        today = calendar.today()
+        clamped_start, clamped_end = start, end
+        if end > today:
+            clamped_end = today
+        elif not calendar.is_trading_day(end):
+            clamped_end = calendar.previous_session(end)
+        if not calendar.is_trading_day(start):
+            clamped_start = calendar.next_session(start)
+        if clamped_start > clamped_end:
+            self.skipped_calls += 1
+            return None
+
+        changes = {}
+        if clamped_start != start:
+            changes[start_param] = format_like(arguments[start_param], clamped_start, end=False)
+        if clamped_end != end:
+            changes[end_param] = format_like(arguments[end_param], clamped_end, end=True)
+        if changes:
+            self.clamped_calls += 1
+        return changes
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "skipped_calls": self.skipped_calls,
+            "clamped_calls": self.clamped_calls,
+            **{market: calendar.stats() for market, calendar in self.calendars.items()},
+        }
+
+
+trading_calendars = TradingCalendars({
+    "a": TradingCalendar("a", _load_a_sessions),
+    "hk": TradingCalendar("hk", _load_hk_sessions),
+    "us": TradingCalendar("us", _load_us_sessions),
+})
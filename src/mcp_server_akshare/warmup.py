@@ -0,0 +1,101 @@
+"""
+后台预热 akshare/pandas 导入。
+
+akshare 的导入本身就需要数秒。服务启动时在后台线程中完成导入并预加载
+apis 工具模块，``initialize``/``list_tools`` 无需等待；第一次 ``call_tool``
+会等待核心依赖导入完成。
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterable, Optional
+
+from .dispatch import ToolNotFoundError, dispatcher
+from .trading_calendar import trading_calendars
+
+logger = logging.getLogger(__name__)
+
+CORE_MODULES = ("numpy", "pandas", "akshare")
+
+
+class ImportWarmup:
+    """后台导入预热"""
+
+    def __init__(self, modules: Iterable[str] = CORE_MODULES):
+        self.modules = tuple(modules)
+        self._ready: Future = Future()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at: Optional[float] = None
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.preloaded = 0
+        self.waits = 0
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def start(self, preload: Iterable[str] = ()) -> None:
+        """启动后台预热线程
+
+        Args:
+            preload: 核心依赖导入完成后需要预先解析的工具名称
+        """
+        if self._thread is not None:
+            return
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, args=(list(preload),), name="akshare-warmup", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, preload: list) -> None:
+        for module in self.modules:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                self.errors[module] = str(e)
+                logger.error(f"Failed to import {module} during warmup: {e}")
+            self.timings[module] = round(time.perf_counter() - start, 3)
+        self.timings["core_ready"] = round(time.perf_counter() - self._started_at, 3)
+        self._ready.set_result(True)
+        logger.info(f"Core imports ready in {self.timings['core_ready']}s")
+
+        for name in preload:
+            try:
+                dispatcher.resolve(name)
+                self.preloaded += 1
+            except ToolNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Failed to preload tool {name}: {e}")
+        self.timings["preload_done"] = round(time.perf_counter() - self._started_at, 3)
+        logger.info(f"Preloaded {self.preloaded} tool modules in {self.timings['preload_done']}s")
+
+        # 交易日历加载前按周一至周五为交易日处理
+        trading_calendars.refresh()
+        self.timings["calendars_ready"] = round(time.perf_counter() - self._started_at, 3)
+
+    async def wait(self) -> None:
+        """等待核心依赖导入完成，未启动预热时立即返回"""
+        if self._thread is None or self._ready.done():
+            return
+        self.waits += 1
+        await asyncio.wrap_future(self._ready)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "ready": self._ready.done(),
+            "preloaded_tools": self.preloaded,
+            "waits": self.waits,
+            "timings": dict(self.timings),
+            "errors": dict(self.errors),
+        }
+
+
+warmup = ImportWarmup()
@@ -88,6 +88,16 @@ class GeneratedToolRepository:
         finally:
             conn.close()
     
+    def get_version(self) -> tuple:
+        """获取工具表版本标识(工具数量, 最近更新时间)，用于判断缓存是否失效"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*), MAX(updated_at) FROM generated_tools")
+            return tuple(cursor.fetchone())
+        finally:
+            conn.close()
+
     def delete_tool(self, name: str):
         """删除指定工具"""
         conn = sqlite3.connect(self.db_path)
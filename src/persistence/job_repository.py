@@ -0,0 +1,186 @@
+import sqlite3
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+EMPTY = "empty"
+FAILED = "failed"
+
+
+class JobRepository:
+    def __init__(self, db_path: Optional[str] = None):
+        """初始化仓库，未指定路径时使用本目录下的数据库文件"""
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.db_path = str(db_path or os.path.join(current_dir, "jobs.db"))
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._ensure_table_exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _ensure_table_exists(self):
+        """确保任务表和任务项表存在"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                tool TEXT NOT NULL,
+                fan_out TEXT NOT NULL,
+                arguments TEXT NOT NULL,
+                concurrency INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                value TEXT NOT NULL,
+                status TEXT NOT NULL,
+                rows INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (job_id, seq)
+            )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def create_job(self, job_id: str, tool: str, fan_out: str, arguments: Dict[str, Any],
+                   concurrency: int, values: List[Any]):
+        """登记任务及其全部任务项"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+            INSERT INTO jobs (id, tool, fan_out, arguments, concurrency, status, total)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (job_id, tool, fan_out, json.dumps(arguments, ensure_ascii=False), concurrency, PENDING, len(values)))
+            cursor.executemany('''
+            INSERT INTO job_items (job_id, seq, value, status) VALUES (?, ?, ?, ?)
+            ''', [(job_id, seq, json.dumps(value, ensure_ascii=False), PENDING) for seq, value in enumerate(values)])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """获取任务定义与状态"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT id, tool, fan_out, arguments, concurrency, status, total, error, created_at, updated_at
+            FROM jobs WHERE id = ?
+            ''', (job_id,))
+            result = cursor.fetchone()
+            if result is None:
+                return None
+            return {
+                "job_id": result[0],
+                "tool": result[1],
+                "fan_out": result[2],
+                "arguments": json.loads(result[3]),
+                "concurrency": result[4],
+                "status": result[5],
+                "total": result[6],
+                "error": result[7],
+                "created_at": result[8],
+                "updated_at": result[9],
+            }
+        finally:
+            conn.close()
+
+    def unfinished_jobs(self) -> List[str]:
+        """未完成的任务(进程退出或崩溃时正在运行的任务)"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at', (PENDING, RUNNING))
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def set_job_status(self, job_id: str, status: str, error: Optional[str] = None):
+        conn = self._connect()
+        try:
+            conn.execute('''
+            UPDATE jobs SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?
+            ''', (status, error, job_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def pending_items(self, job_id: str) -> List[Tuple[int, Any]]:
+        """尚未完成的任务项 (序号, 参数值)"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT seq, value FROM job_items WHERE job_id = ? AND status = ? ORDER BY seq
+            ''', (job_id, PENDING))
+            return [(seq, json.loads(value)) for seq, value in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def finish_item(self, job_id: str, seq: int, status: str, rows: int, attempts: int,
+                    error: Optional[str] = None):
+        """记录任务项的结果"""
+        conn = self._connect()
+        try:
+            conn.execute('''
+            UPDATE job_items SET status = ?, rows = ?, attempts = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE job_id = ? AND seq = ?
+            ''', (status, rows, attempts, error, job_id, seq))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def item_summary(self, job_id: str) -> Dict[str, Dict[str, int]]:
+        """按状态汇总任务项数量与行数"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT status, COUNT(*), SUM(rows) FROM job_items WHERE job_id = ? GROUP BY status
+            ''', (job_id,))
+            return {status: {"items": count, "rows": rows or 0} for status, count, rows in cursor.fetchall()}
+        finally:
+            conn.close()
+
+    def completed_items(self, job_id: str) -> List[Tuple[int, Any]]:
+        """有结果数据的任务项 (序号, 参数值)"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT seq, value FROM job_items WHERE job_id = ? AND status = ? ORDER BY seq
+            ''', (job_id, DONE))
+            return [(seq, json.loads(value)) for seq, value in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def failed_items(self, job_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """失败的任务项及错误信息"""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT value, attempts, error FROM job_items WHERE job_id = ? AND status = ? ORDER BY seq LIMIT ?
+            ''', (job_id, FAILED, limit))
+            return [{"value": json.loads(value), "attempts": attempts, "error": error}
+                    for value, attempts, error in cursor.fetchall()]
+        finally:
+            conn.close()
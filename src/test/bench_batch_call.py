@@ -0,0 +1,78 @@
+"""
+批量调用基准测试
+
+用模拟的上游函数(固定延迟)替换 stock_individual_info_em，比较:
+  - 逐个代码调用 N 次工具(N 次往返、N 次 JSON 编码)
+  - 一次 batch_call 并发调用并合并为一张表
+并检查合并结果的行数、键列和失败代码的 error 列。并发受数据源限流约束。不访问网络。
+
+运行: python test/bench_batch_call.py [--symbols 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("AKSHARE_MCP_DATA_DIR", tempfile.mkdtemp(prefix="akshare-batch-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import akshare as ak
+import pandas as pd
+
+from mcp_server_akshare import server
+from mcp_server_akshare.cache import result_cache
+
+LATENCY = 0.2  # 模拟单次上游请求的延迟(秒)
+BAD_SYMBOL = "999999"
+
+
+def individual_info(symbol: str = "000001", timeout=None):
+    time.sleep(LATENCY)
+    if symbol == BAD_SYMBOL:
+        raise KeyError("data")
+    items = ["股票代码", "股票简称", "总股本", "流通股", "总市值", "流通市值", "行业", "上市时间"]
+    return pd.DataFrame({"item": items, "value": [symbol, f"股票{symbol}", 1e9, 8e8, 1.2e10, 9.6e9, "银行", 19910403]})
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=50)
+    args = parser.parse_args()
+
+    ak.stock_individual_info_em = individual_info
+    symbols = [f"{600000 + i:06d}" for i in range(args.symbols)]
+
+    start = time.perf_counter()
+    sequential_bytes = 0
+    for symbol in symbols:
+        content = (await server.handle_call_tool("stock_individual_info_em", {"symbol": symbol}))[0]
+        sequential_bytes += len(content.text)
+    sequential = time.perf_counter() - start
+    print(f"逐个调用 {args.symbols} 次: {sequential:.2f} s | 响应共 {sequential_bytes / 1024:.1f} KiB")
+
+    result_cache.clear()
+    start = time.perf_counter()
+    content = (await server.handle_call_tool("batch_call", {
+        "tool": "stock_individual_info_em",
+        "calls": [{"symbol": symbol} for symbol in symbols + [BAD_SYMBOL]],
+        "format": "columns",
+    }))[0]
+    batched = time.perf_counter() - start
+    body = json.loads(content.text)
+    print(f"batch_call {args.symbols + 1} 组参数: {batched:.2f} s ({sequential / batched:.1f}x) | "
+          f"响应 {len(content.text) / 1024:.1f} KiB | 列 {body['columns']}")
+
+    rows = body["rows"]
+    errors = [row for row in rows if row[body["columns"].index("error")] is not None]
+    ok = body["columns"][0] == "symbol" and len(rows) == args.symbols * 8 + 1
+    ok &= len(errors) == 1 and errors[0][0] == BAD_SYMBOL
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+工具分发开销基准测试
+
+对比旧的 ``__import__(f"apis.{name}")`` + ``hasattr`` 方式与 ToolDispatcher
+缓存分发表在全部工具上的单次分发耗时，并包含未知工具名称的负缓存路径。
+
+运行: python test/bench_dispatch.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server_akshare.dispatch import ToolDispatcher, ToolNotFoundError
+
+ROUNDS = 20
+UNKNOWN_TOOLS = [f"stock_unknown_tool_{i}" for i in range(20)]
+
+
+def discover_tool_names() -> list:
+    """发现 apis 目录下所有工具名称"""
+    api_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "apis")
+    return sorted(
+        os.path.splitext(f)[0] for f in os.listdir(api_dir)
+        if f.endswith(".py") and not f.startswith("__")
+    )
+
+
+def legacy_dispatch(name: str):
+    """旧版 handle_call_tool 中的分发逻辑"""
+    try:
+        module = __import__(f"apis.{name}", fromlist=[''])
+    except ImportError as e:
+        raise ValueError(f"Tool module {name} not found: {str(e)}")
+    if not hasattr(module, 'execute'):
+        raise ValueError(f"Module {name} does not have execute method")
+    return module.execute
+
+
+def bench(dispatch, names: list) -> float:
+    """返回每次分发的平均耗时(微秒)"""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for name in names:
+            try:
+                dispatch(name)
+            except ValueError:
+                pass
+    return (time.perf_counter() - start) / (ROUNDS * len(names)) * 1e6
+
+
+def main():
+    names = discover_tool_names()
+    dispatcher = ToolDispatcher()
+
+    # 预热: 先导入所有模块，排除首次导入耗时
+    available = []
+    for name in names:
+        try:
+            dispatcher.resolve(name)
+            available.append(name)
+        except ToolNotFoundError as e:
+            print(f"跳过 {name}: {e}")
+
+    print(f"{'='*50}")
+    print(f"工具数量: {len(available)}/{len(names)}, 每组重复 {ROUNDS} 轮")
+    print(f"{'='*50}")
+    rows = [
+        ("已知工具", available),
+        ("未知工具", UNKNOWN_TOOLS),
+    ]
+    for label, group in rows:
+        before = bench(legacy_dispatch, group)
+        after = bench(dispatcher.resolve, group)
+        print(f"{label}: 旧版 {before:8.2f} us/次 | 分发表 {after:8.2f} us/次 | 提升 {before / after:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
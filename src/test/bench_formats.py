@@ -0,0 +1,90 @@
+"""
+响应格式基准测试
+
+用合成的全市场行情表(5000 行)和多年分钟线(60000 行)对比 records / columns /
+compact 三种格式的输出字节数与序列化耗时。数据为本地合成，不访问网络。
+
+运行: python test/bench_formats.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server_akshare.formatting import FORMATS, serialize
+
+REPEAT = 3
+
+
+def make_spot_table(rows: int = 5000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "序号": np.arange(1, rows + 1),
+        "代码": [f"{i:06d}" for i in range(rows)],
+        "名称": [f"股票{i}" for i in range(rows)],
+        "最新价": rng.uniform(1, 200, rows).round(2),
+        "涨跌幅": rng.normal(0, 2, rows).round(2),
+        "涨跌额": rng.normal(0, 1, rows).round(2),
+        "成交量": rng.integers(1000, 10_000_000, rows),
+        "成交额": rng.uniform(1e5, 1e10, rows).round(1),
+        "振幅": rng.uniform(0, 10, rows).round(2),
+        "最高": rng.uniform(1, 200, rows).round(2),
+        "最低": rng.uniform(1, 200, rows).round(2),
+        "今开": rng.uniform(1, 200, rows).round(2),
+        "昨收": rng.uniform(1, 200, rows).round(2),
+        "量比": rng.uniform(0, 5, rows).round(2),
+        "换手率": rng.uniform(0, 20, rows).round(2),
+        "市盈率-动态": rng.uniform(-100, 300, rows).round(2),
+    })
+
+
+def make_minute_series(rows: int = 60000) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    times = pd.date_range("2020-01-02 09:30", periods=rows, freq="min")
+    close = 10 + rng.normal(0, 0.01, rows).cumsum()
+    return pd.DataFrame({
+        "时间": times.strftime("%Y-%m-%d %H:%M:%S"),
+        "开盘": close.round(2),
+        "收盘": close.round(2),
+        "最高": (close + 0.02).round(2),
+        "最低": (close - 0.02).round(2),
+        "成交量": rng.integers(100, 100000, rows),
+        "成交额": rng.uniform(1e4, 1e7, rows).round(1),
+        "均价": close.round(3),
+    })
+
+
+def bench(result, fmt: str):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        text = serialize(result, fmt)
+        best = min(best, time.perf_counter() - start)
+    return len(text.encode("utf-8")), best * 1000
+
+
+def main():
+    datasets = [
+        ("全市场行情 DataFrame", make_spot_table()),
+        ("分钟线 DataFrame", make_minute_series()),
+    ]
+    datasets.append(("全市场行情 records", datasets[0][1].to_dict("records")))
+
+    for label, data in datasets:
+        print(f"{'='*50}")
+        print(f"{label} ({len(data)} 行)")
+        print(f"{'='*50}")
+        baseline = None
+        for fmt in FORMATS:
+            size, ms = bench(data, fmt)
+            baseline = baseline or size
+            print(f"{fmt:8s}: {size / 1024:10.1f} KB ({size / baseline:5.1%}) | {ms:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+日线历史存储冷/热基准测试
+
+对一组股票按相互重叠的日期窗口请求 stock_zh_a_hist，对比:
+  - 直连上游: 每次请求都下载整个窗口
+  - 冷存储: 存储为空，首个窗口全量下载，后续窗口只补缺失日期
+  - 热存储: 所有窗口均已覆盖，完全从本地分区读取
+
+默认使用模拟上游(固定延迟 + 按行数的传输耗时)，不访问网络；
+加 --live 使用真实的 akshare 接口。
+
+运行: python test/bench_history_store.py [--live] [--symbols 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server_akshare.store.history import HistoryStore
+
+# 相互重叠的请求窗口，模拟不同调用方对同一股票的回测/查询
+WINDOWS = [
+    ("20190101", "20231231"),
+    ("20200601", "20240630"),
+    ("20180101", "20211231"),
+    ("20220101", "20240930"),
+]
+
+LATENCY = 0.15         # 模拟上游单次请求延迟(秒)
+LATENCY_PER_ROW = 2e-5  # 模拟上游按行的传输耗时(秒)
+
+
+def simulated_fetch(symbol: str, period: str, start_date: str, end_date: str, adjust: str, **kwargs):
+    days = pd.bdate_range(start_date, end_date)
+    time.sleep(LATENCY + LATENCY_PER_ROW * len(days))
+    rng = np.random.default_rng(int(symbol))
+    close = 10 + rng.normal(0, 0.1, len(days)).cumsum()
+    return pd.DataFrame({
+        "日期": [d.date() for d in days],
+        "股票代码": symbol,
+        "开盘": close.round(2),
+        "收盘": close.round(2),
+        "最高": (close + 0.1).round(2),
+        "最低": (close - 0.1).round(2),
+        "成交量": rng.integers(1000, 1_000_000, len(days)),
+        "成交额": rng.uniform(1e6, 1e9, len(days)).round(1),
+        "振幅": rng.uniform(0, 10, len(days)).round(2),
+        "涨跌幅": rng.normal(0, 2, len(days)).round(2),
+        "涨跌额": rng.normal(0, 0.2, len(days)).round(2),
+        "换手率": rng.uniform(0, 5, len(days)).round(2),
+    })
+
+
+def live_fetch(**kwargs):
+    import akshare as ak
+
+    return ak.stock_zh_a_hist(**kwargs)
+
+
+def run(label: str, symbols, call):
+    start = time.perf_counter()
+    rows = 0
+    for symbol in symbols:
+        for start_date, end_date in WINDOWS:
+            rows += len(call(symbol, start_date, end_date))
+    elapsed = time.perf_counter() - start
+    requests = len(symbols) * len(WINDOWS)
+    print(f"{label:8s}: {elapsed:8.2f} s | {elapsed / requests * 1000:8.1f} ms/请求 | {rows} 行")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="使用真实的 akshare 接口")
+    parser.add_argument("--symbols", type=int, default=20)
+    args = parser.parse_args()
+
+    fetch = live_fetch if args.live else simulated_fetch
+    symbols = [f"{600000 + i:06d}" for i in range(args.symbols)]
+    print(f"{len(symbols)} 只股票 x {len(WINDOWS)} 个重叠窗口 ({'live' if args.live else 'simulated'})")
+
+    with tempfile.TemporaryDirectory() as root:
+        store = HistoryStore("stock_zh_a_hist", fetch, root=root)
+        direct = run("直连上游", symbols, lambda s, a, b: fetch(
+            symbol=s, period="daily", start_date=a, end_date=b, adjust=""))
+        cold = run("冷存储", symbols, lambda s, a, b: store.get(s, a, b))
+        cold_stats = store.stats()
+        warm = run("热存储", symbols, lambda s, a, b: store.get(s, a, b))
+
+    print(
+        f"冷存储上游请求数: {cold_stats['upstream_calls']} (直连 {len(symbols) * len(WINDOWS)})，"
+        f"下载 {cold_stats['rows_fetched']} 行"
+    )
+    print(f"加速比: 冷存储 {direct / cold:.1f}x, 热存储 {direct / warm:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+分钟线存储读取基准测试
+
+把一年(约 250 个交易日)的合成 1 分钟线写入 MinuteStore，然后测量从内存映射分区中
+读取不同长度区间的耗时，并与模拟上游(固定延迟 + 按行的传输耗时)对比。数据为本地合成，不访问网络。
+
+运行: python test/bench_minute_store.py
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server_akshare.cache import today_cst
+from mcp_server_akshare.store.minute import MinuteStore
+
+DAYS = 250
+REPEAT = 200
+LATENCY = 0.3          # 模拟上游单次请求延迟(秒)
+LATENCY_PER_ROW = 5e-6  # 模拟上游按行的传输与解析耗时(秒)
+
+
+def session(day: datetime.date) -> pd.DatetimeIndex:
+    """A 股交易时段的 1 分钟时间戳(含午间休市)"""
+    return pd.date_range(f"{day} 09:31", f"{day} 11:30", freq="min").append(
+        pd.date_range(f"{day} 13:01", f"{day} 15:00", freq="min")
+    )
+
+
+def make_minutes(days) -> pd.DataFrame:
+    stamps = np.concatenate([session(d.date()).values for d in days])
+    rows = len(stamps)
+    rng = np.random.default_rng(0)
+    close = 10 + rng.normal(0, 0.01, rows).cumsum()
+    return pd.DataFrame({
+        "时间": pd.DatetimeIndex(stamps).astype(str),
+        "开盘": close.round(2),
+        "收盘": close.round(2),
+        "最高": (close + 0.01).round(2),
+        "最低": (close - 0.01).round(2),
+        "成交量": rng.integers(100, 100000, rows),
+        "成交额": rng.uniform(1e4, 1e7, rows).round(1),
+        "均价": close.round(3),
+    })
+
+
+def main():
+    end = today_cst() - datetime.timedelta(days=1)
+    days = pd.bdate_range(end=end, periods=DAYS)
+    history = make_minutes(days)
+
+    def fetch(symbol, period, adjust, **kwargs):
+        time.sleep(LATENCY + LATENCY_PER_ROW * len(history))
+        return history
+
+    with tempfile.TemporaryDirectory() as root:
+        store = MinuteStore("bench", fetch, root=root)
+        start = time.perf_counter()
+        store.get("600000", f"{days[0].date()} 09:30:00", f"{end} 15:00:00")
+        print(f"首次请求(上游 + 写入 {DAYS} 个分区): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        for span in (1, 5, 30, 120):
+            lo = f"{days[-span].date()} 09:30:00"
+            hi = f"{end} 15:00:00"
+            best = float("inf")
+            for _ in range(REPEAT):
+                t = time.perf_counter()
+                rows = len(store.get("600000", lo, hi))
+                best = min(best, time.perf_counter() - t)
+            upstream = LATENCY + LATENCY_PER_ROW * len(history)
+            print(
+                f"{span:4d} 个交易日 ({rows:6d} 行): {best * 1e6:9.1f} us | "
+                f"模拟上游 {upstream * 1000:.0f} ms ({upstream / best:,.0f}x)"
+            )
+        print(store.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+大结果分页基准测试
+
+用合成的大表替换 stock_us_spot_em，比较:
+  - 完整序列化整个结果(关闭自动分页)的耗时与响应大小
+  - 自动分页时第一页的耗时与响应大小，以及按 next_cursor 取完全部页面的总耗时
+并检查各页拼接后与完整结果的行数一致。不访问网络。
+
+运行: python test/bench_pagination.py [--rows 200000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import akshare as ak
+
+from mcp_server_akshare import pagination, server
+
+
+def make_table(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "代码": [f"105.S{i:06d}" for i in range(rows)],
+        "名称": [f"股票{i}" for i in range(rows)],
+        "最新价": rng.uniform(1, 500, rows).round(2),
+        "涨跌幅": rng.normal(0, 2, rows).round(2),
+        "成交量": rng.integers(1000, 10 ** 8, rows),
+    })
+
+
+async def call(arguments):
+    start = time.perf_counter()
+    content = (await server.handle_call_tool("stock_us_spot_em", arguments))[0]
+    return content.text, time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    table = make_table(args.rows)
+    ak.stock_us_spot_em = lambda: table
+    await call({"limit": 1})  # 填充结果缓存，下面只测量序列化
+
+    page_rows = pagination.PAGE_ROWS
+    pagination.PAGE_ROWS = 0
+    text, full = await call({})
+    print(f"完整结果 {args.rows} 行: {full * 1000:.1f} ms | {len(text) / 1024:.0f} KiB")
+    pagination.PAGE_ROWS = page_rows or 2000
+
+    text, first = await call({})
+    body = json.loads(text)
+    print(f"第一页 {body['page']['rows']} 行: {first * 1000:.1f} ms | {len(text) / 1024:.0f} KiB "
+          f"({full / first:.0f}x 更快)")
+
+    rows, pages, start = len(body["rows"]), 1, time.perf_counter()
+    cursor = body["page"]["next_cursor"]
+    while cursor:
+        text, _ = await call({"cursor": cursor})
+        body = json.loads(text)
+        rows += len(body["rows"])
+        pages += 1
+        cursor = body["page"]["next_cursor"]
+    print(f"取完 {pages} 页: {(time.perf_counter() - start + first) * 1000:.1f} ms | 共 {rows} 行 | "
+          f"{'OK' if rows == args.rows else 'FAIL'}")
+    print(pagination.result_handles.stats())
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
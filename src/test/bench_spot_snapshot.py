@@ -0,0 +1,83 @@
+"""
+全市场行情快照基准测试
+
+模拟一个客户端循环查询 N 只股票的实时报价:
+  - 逐个代码访问上游(模拟 stock_bid_ask_em 的单次请求延迟)
+  - 通过 spot_quote 从共享快照按代码索引取行(一次模拟的全表下载，之后全部命中快照)
+同时测量并发读取过期快照时的上游请求数。数据为本地合成，不访问网络。
+
+运行: python test/bench_spot_snapshot.py [--symbols 200]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import akshare as ak
+
+from mcp_server_akshare.spot import SpotSnapshot
+
+MARKET_ROWS = 5500
+LATENCY = 0.15       # 模拟单个代码请求的延迟(秒)
+FULL_LATENCY = 2.0   # 模拟全表下载的延迟(秒)
+
+
+def make_market() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    codes = [f"{'sh' if i % 2 else 'sz'}{600000 + i:06d}" for i in range(MARKET_ROWS)]
+    return pd.DataFrame({
+        "代码": codes,
+        "名称": [f"股票{i}" for i in range(MARKET_ROWS)],
+        "最新价": rng.uniform(2, 200, MARKET_ROWS).round(2),
+        "涨跌幅": rng.normal(0, 2, MARKET_ROWS).round(2),
+        "成交量": rng.integers(1000, 10 ** 7, MARKET_ROWS),
+    })
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=200)
+    args = parser.parse_args()
+
+    market = make_market()
+    upstream = {"calls": 0}
+
+    def full_table():
+        upstream["calls"] += 1
+        time.sleep(FULL_LATENCY)
+        return market
+
+    ak.stock_zh_a_spot = full_table
+    symbols = [code[2:] for code in market["代码"].sample(args.symbols, random_state=1)]
+
+    print(f"逐个代码访问上游 ({args.symbols} 只): 约 {args.symbols * LATENCY:.1f} s (模拟，未实际等待)")
+
+    snapshot = SpotSnapshot("a", "stock_zh_a_spot", ("代码",), max_age=60)
+    start = time.perf_counter()
+    rows, missing = await snapshot.lookup(symbols)
+    cold = time.perf_counter() - start
+    print(f"快照首次查询(含全表下载): {cold:.2f} s | {len(rows)} 行 | 未找到 {len(missing)}")
+
+    repeat = 200
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await snapshot.lookup(symbols)
+    warm = (time.perf_counter() - start) / repeat
+    print(f"快照查询 {args.symbols} 只: {warm * 1000:.3f} ms/次 ({args.symbols * LATENCY / warm:,.0f}x)")
+
+    snapshot.fetched_at -= snapshot.ttl + 1
+    before = upstream["calls"]
+    await asyncio.gather(*[snapshot.lookup(symbols[:1]) for _ in range(50)])
+    print(f"50 个并发读取过期快照: 上游请求 {upstream['calls'] - before} 次")
+    print(snapshot.stats())
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""
+参考数据 stale-while-revalidate 基准测试
+
+用模拟的慢速上游(固定延迟)替换 stock_info_a_code_name，把参考数据的有效期设为很短，
+测量缓存过期后连续调用的延迟分布与上游请求数: 过期后的调用应立即返回旧结果，
+并且只触发一次后台刷新。旧结果超出可返回时长后到达的调用应等待进行中的后台刷新并拿到结果。
+不访问网络。
+
+运行: python test/bench_stale_reference.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("AKSHARE_MCP_TTL_REFERENCE", "0.5")
+os.environ.setdefault("AKSHARE_MCP_STALE_REFERENCE", "1.0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import akshare as ak
+import pandas as pd
+
+from mcp_server_akshare import server
+
+LATENCY = 2.0  # 模拟上游延迟(秒)
+CALLS = 500
+
+
+async def main():
+    upstream = {"calls": 0}
+    table = pd.DataFrame({"code": [f"{i:06d}" for i in range(5500)], "name": [f"股票{i}" for i in range(5500)]})
+
+    def code_name():
+        upstream["calls"] += 1
+        time.sleep(LATENCY)
+        return table
+
+    ak.stock_info_a_code_name = code_name
+    start = time.perf_counter()
+    await server._execute_tool("stock_info_a_code_name", {})
+    print(f"首次调用: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    await asyncio.sleep(float(os.environ["AKSHARE_MCP_TTL_REFERENCE"]) + 0.1)
+    latencies = []
+    meta = {}
+    for _ in range(CALLS):
+        meta = {}
+        start = time.perf_counter()
+        await server._execute_tool("stock_info_a_code_name", {}, meta)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99) - 1]
+    print(f"过期后 {CALLS} 次调用: p50 {p50 * 1e6:.1f} us | p99 {p99 * 1e6:.1f} us | 最后一次元数据 {meta}")
+
+    await asyncio.sleep(LATENCY + 0.2)
+    print(f"上游请求: {upstream['calls']} 次(首次 1 + 后台刷新 1)")
+    ok = upstream["calls"] == 2
+
+    # 后台刷新进行中，旧结果超出可返回时长，新的调用加入这次刷新
+    await asyncio.sleep(float(os.environ["AKSHARE_MCP_TTL_REFERENCE"]) + 0.1)
+    await server._execute_tool("stock_info_a_code_name", {})
+    await asyncio.sleep(float(os.environ["AKSHARE_MCP_STALE_REFERENCE"]) + 0.1)
+    meta = {}
+    result = await server._execute_tool("stock_info_a_code_name", {}, meta)
+    print(f"旧结果超出可返回时长后的调用: {type(result).__name__} | 元数据 {meta} | 上游请求 {upstream['calls']} 次")
+    ok &= result is not None and len(result) == len(table) and upstream["calls"] == 3
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
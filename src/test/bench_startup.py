@@ -0,0 +1,71 @@
+"""
+服务冷启动基准测试
+
+以子进程方式通过 stdio 启动 MCP 服务，测量:
+  - 进程启动到 initialize 完成的耗时
+  - 到第一次 list_tools 返回的耗时
+  - 到第一次 call_tool 返回的耗时(包含等待后台 akshare 导入)
+
+运行: python test/bench_startup.py [tool_name]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TOOL = "stock_info_a_code_name"
+
+# 冷启动预算(秒)，超出时以非零状态退出，便于发现回归
+LIST_TOOLS_BUDGET = float(os.getenv("BENCH_LIST_TOOLS_BUDGET", "3.0"))
+
+
+async def run_once(tool_name: str) -> dict:
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-c", "import asyncio; from mcp_server_akshare import main; asyncio.run(main())"],
+        env={**os.environ, "PYTHONPATH": SRC_DIR},
+    )
+    timings = {}
+    start = time.perf_counter()
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            timings["initialize"] = time.perf_counter() - start
+
+            tools = await session.list_tools()
+            timings["first_list_tools"] = time.perf_counter() - start
+            timings["tool_count"] = len(tools.tools)
+
+            result = await session.call_tool(tool_name, {})
+            timings["first_call_tool"] = time.perf_counter() - start
+            timings["first_call_is_error"] = result.isError
+
+            await session.call_tool(tool_name, {})
+            timings["second_call_tool"] = time.perf_counter() - timings["first_call_tool"] - start
+    return timings
+
+
+def main():
+    tool_name = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TOOL
+    timings = asyncio.run(run_once(tool_name))
+
+    print(f"{'='*50}")
+    print(f"冷启动基准 (工具: {tool_name}, 共 {timings['tool_count']} 个工具)")
+    print(f"{'='*50}")
+    print(f"initialize 完成:      {timings['initialize']:.3f}s")
+    print(f"首次 list_tools 返回: {timings['first_list_tools']:.3f}s")
+    print(f"首次 call_tool 返回:  {timings['first_call_tool']:.3f}s (isError={timings['first_call_is_error']})")
+    print(f"第二次 call_tool 耗时: {timings['second_call_tool']:.3f}s")
+
+    if timings["first_list_tools"] > LIST_TOOLS_BUDGET:
+        print(f"首次 list_tools 超出预算 {LIST_TOOLS_BUDGET}s")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+"""
+本地复权计算检查
+
+用合成的不复权日线/分钟线和按除权规则生成的 qfq/hfq 参考日线检查 store/adjust.py:
+  - 含多个除权日(派息、送转、二者兼有)时拟合的系数换算出的复权日线与参考数据完全一致
+    (送转后复权价恰好落在半个最小变动单位上时，上游数据本身的舍入方向不确定，这类价格允许相差一个单位)
+  - 再次请求不重新获取参考数据；出现新的除权日后重新拟合，前复权的历史价格随之整体变化
+  - stock_zh_a_hist_min_em 的复权分支把日线系数应用到 1 分钟线，得到与参考规则一致的价格
+不访问网络。
+
+运行: python test/check_adjust.py
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+
+os.environ["AKSHARE_MCP_DATA_DIR"] = tempfile.mkdtemp(prefix="akshare-adjust-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from mcp_server_akshare import local_tools
+from mcp_server_akshare.store import adjust, history, minute
+from mcp_server_akshare.store.adjust import PRICE_COLUMNS, a_adjuster
+from mcp_server_akshare.store.history import stock_hist_store
+from mcp_server_akshare.store.minute import a_minute_store
+from mcp_server_akshare.trading_calendar import trading_calendars
+
+SYMBOL = "600000"
+# 除权日: (派息, 送转比例)
+EVENTS = {
+    datetime.date(2024, 1, 15): (0.5, 0.0),
+    datetime.date(2024, 2, 5): (0.2, 0.3),
+    datetime.date(2024, 3, 18): (0.3, 0.1),  # 第二阶段才出现的除权日
+}
+MINUTE_START, MINUTE_END = "2024-03-14 09:30:00", "2024-03-21 15:00:00"
+TIES = "_tie_"  # 参考数据中标记半单位价格的列前缀
+today = {"value": datetime.date(2024, 3, 1)}
+
+
+def make_bars():
+    """生成不复权 1 分钟线，并按日聚合为日线(除权日的涨跌额相对除权参考价)"""
+    calendar = trading_calendars.get("a")
+    days = [d.date() for d in pd.bdate_range("2024-01-02", "2024-03-29") if calendar.is_trading_day(d.date())]
+    rng = np.random.default_rng(7)
+    minutes, daily = [], []
+    prev_close = 10.0
+    for day in days:
+        dividend, bonus = EVENTS.get(day, (0.0, 0.0))
+        base = round((prev_close - dividend) / (1 + bonus), 2)
+        stamps = pd.date_range(f"{day} 09:31", f"{day} 11:30", freq="min").append(
+            pd.date_range(f"{day} 13:01", f"{day} 15:00", freq="min")
+        )
+        close = (base + rng.normal(0, 0.01, len(stamps)).cumsum()).round(2)
+        bars = pd.DataFrame({
+            "时间": stamps.strftime("%Y-%m-%d %H:%M:%S"),
+            "开盘": np.r_[base, close[:-1]],
+            "收盘": close,
+            "最高": np.maximum(np.r_[base, close[:-1]], close) + 0.01,
+            "最低": np.minimum(np.r_[base, close[:-1]], close) - 0.01,
+            "成交量": rng.integers(100, 10000, len(stamps)),
+        })
+        minutes.append(bars)
+        daily.append({
+            "日期": day.strftime("%Y-%m-%d"),
+            "开盘": bars["开盘"].iloc[0],
+            "收盘": bars["收盘"].iloc[-1],
+            "最高": bars["最高"].max(),
+            "最低": bars["最低"].min(),
+            "涨跌额": round(bars["收盘"].iloc[-1] - base, 2),
+        })
+        prev_close = bars["收盘"].iloc[-1]
+    daily = pd.DataFrame(daily)
+    daily[list(PRICE_COLUMNS)] = daily[list(PRICE_COLUMNS)].round(2)
+    return daily, pd.concat(minutes, ignore_index=True)
+
+
+def factors(day: datetime.date, adjust: str, last_day: datetime.date):
+    """按除权参考价规则计算某天价格的复权仿射系数 (scale, offset)，只计入 last_day 之前公布的除权日"""
+    scale, offset = 1.0, 0.0
+    events = sorted((d, e) for d, e in EVENTS.items() if d <= last_day)
+    if adjust == "qfq":
+        for event_day, (dividend, bonus) in events:
+            if event_day > day:
+                scale, offset = scale / (1 + bonus), (offset - dividend) / (1 + bonus)
+    else:
+        for event_day, (dividend, bonus) in reversed(events):
+            if event_day <= day:
+                scale, offset = scale * (1 + bonus), offset * (1 + bonus) + dividend
+    return scale, offset
+
+
+def expected(bars: pd.DataFrame, time_column: str, adjust: str, last_day: datetime.date) -> pd.DataFrame:
+    """按参考规则换算价格，TIES 前缀的列标记恰好落在半个最小变动单位上的价格"""
+    days = pd.to_datetime(bars[time_column]).dt.date
+    coef = np.array([factors(day, adjust, last_day) for day in days])
+    out = bars.copy()
+    for name in PRICE_COLUMNS:
+        value = bars[name].to_numpy() * coef[:, 0] + coef[:, 1]
+        out[TIES + name] = np.abs(value * 100 - np.floor(value * 100) - 0.5) < 1e-6
+        out[name] = np.round(value, 2)
+    return out
+
+
+DAILY, MINUTES = make_bars()
+
+
+def visible(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """只返回已收盘(今天之前)的 K 线"""
+    return df[pd.to_datetime(df[column]).dt.date < today["value"]]
+
+
+def daily_fetcher(symbol, period, start_date, end_date, adjust, **kwargs):
+    df = visible(DAILY, "日期")
+    if adjust:
+        df = expected(df, "日期", adjust, today["value"] - datetime.timedelta(days=1))
+        df["涨跌额"] = df["收盘"].diff().round(2)
+    dates = pd.to_datetime(df["日期"])
+    return df[(dates >= pd.Timestamp(start_date)) & (dates <= pd.Timestamp(end_date))].reset_index(drop=True)
+
+
+def minute_fetcher(symbol, period, adjust, **kwargs):
+    return visible(MINUTES, "时间").reset_index(drop=True)
+
+
+def tie_count(reference: pd.DataFrame) -> int:
+    return int(sum(reference[TIES + name].sum() for name in PRICE_COLUMNS))
+
+
+def same(actual: pd.DataFrame, reference: pd.DataFrame, columns) -> bool:
+    """舍入无歧义的价格完全一致，半单位价格相差不超过一个最小变动单位"""
+    if len(actual) != len(reference):
+        return False
+    for c in columns:
+        if c == "涨跌额":
+            # 涨跌额受当天和前一天收盘价的舍入影响
+            close_ties = reference[TIES + "收盘"].to_numpy()
+            ties = close_ties | np.r_[False, close_ties[:-1]]
+        else:
+            ties = reference[TIES + c].to_numpy()
+        diff = np.abs(actual[c].to_numpy(np.float64) - reference[c].to_numpy(np.float64))
+        if c == "涨跌额":
+            # 第一根 K 线的涨跌额由不复权涨跌额换算，参考数据中没有前一天可比
+            diff[0] = 0
+        if np.any(diff[~ties] != 0) or np.any(diff[ties] > 0.0100001):
+            return False
+    return True
+
+
+def check_daily(adjust: str, start: str, end: str) -> bool:
+    actual = a_adjuster.get(SYMBOL, start, end, adjust)
+    reference = daily_fetcher(SYMBOL, "daily", "19700101", end, adjust)
+    reference = reference[pd.to_datetime(reference["日期"]) >= pd.Timestamp(start)].reset_index(drop=True)
+    passed = actual is not None and same(actual, reference, [*PRICE_COLUMNS, "涨跌额"])
+    print(f"  {adjust} 日线 {start}-{end}: {0 if actual is None else len(actual)} 行, "
+          f"{tie_count(reference)} 个半单位价格 | {'OK' if passed else 'FAIL'}")
+    return passed
+
+
+def main():
+    for module in (adjust, history, minute):
+        module.today_cst = lambda: today["value"]
+    stock_hist_store.fetcher = daily_fetcher
+    a_minute_store.fetcher = minute_fetcher
+    ok = True
+
+    print("第一阶段(两个除权日):")
+    for adj in ("qfq", "hfq"):
+        ok &= check_daily(adj, "20240102", "20240229")
+    fetches = a_adjuster.reference_fetches
+    for adj in ("qfq", "hfq"):
+        ok &= check_daily(adj, "20240110", "20240220")
+    print(f"  参考数据获取: {fetches} 次, 再次请求后 {a_adjuster.reference_fetches} 次")
+    ok &= fetches == 2 and a_adjuster.reference_fetches == 2
+
+    old = a_adjuster.get(SYMBOL, "20240102", "20240131", "qfq")
+    today["value"] = datetime.date(2024, 4, 1)
+    print("第二阶段(新增 2024-03-18 除权日):")
+    ok &= check_daily("qfq", "20240102", "20240329")
+    new = a_adjuster.get(SYMBOL, "20240102", "20240131", "qfq")
+    shifted = old is not None and new is not None \
+        and not np.allclose(old["收盘"].to_numpy(np.float64), new["收盘"].to_numpy(np.float64))
+    print(f"  重新拟合: 参考数据获取 {a_adjuster.reference_fetches} 次 | 历史前复权价变化: {shifted}")
+    ok &= a_adjuster.reference_fetches == 3 and shifted
+
+    print("分钟线(跨 2024-03-18 除权日):")
+    raw = MINUTES[(MINUTES["时间"] >= MINUTE_START) & (MINUTES["时间"] <= MINUTE_END)].reset_index(drop=True)
+    for adj in ("qfq", "hfq"):
+        if a_adjuster.table(SYMBOL, adj) is None:
+            # 没有可用系数时 stock_zh_a_hist_min_em 会改为访问上游
+            print(f"  {adj} 复权系数不可用 | FAIL")
+            ok = False
+            continue
+        actual = local_tools.stock_zh_a_hist_min_em(SYMBOL, MINUTE_START, MINUTE_END, "1", adj)
+        reference = expected(raw, "时间", adj, today["value"])
+        passed = same(actual, reference, PRICE_COLUMNS)
+        print(f"  {adj} 1 分钟线: {len(actual)} 行, {tie_count(reference)} 个半单位价格 | {'OK' if passed else 'FAIL'}")
+        ok &= passed
+    print(f"  hfq 随新除权日重新拟合: 参考数据获取 {a_adjuster.reference_fetches} 次")
+    ok &= a_adjuster.reference_fetches == 4
+
+    print(a_adjuster.stats())
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
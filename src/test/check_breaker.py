@@ -0,0 +1,77 @@
+"""
+熔断器错误分类检查
+
+  - 工具包装成普通 Exception 的参数错误/无数据错误不计入熔断: 连续多次调用无效代码后，
+    同一数据源的正常调用不会被快速拒绝
+  - 网络错误(包括被工具包装后的异常链)、HTTP 5xx 达到阈值后熔断
+不访问网络。
+
+运行: python test/check_breaker.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from mcp_server_akshare.breaker import FAILURE_THRESHOLD, BreakerBoard, CircuitOpenError
+
+
+def wrapped(error: BaseException) -> Exception:
+    """模拟生成工具的 ``except Exception as e: raise Exception(f"...: {e}")``"""
+    try:
+        raise error
+    except BaseException as e:
+        try:
+            raise Exception(f"获取数据失败: {e}")
+        except Exception as outer:
+            return outer
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+async def call(board: BreakerBoard, provider: str, error=None) -> str:
+    try:
+        async with board.guard(provider):
+            if error is not None:
+                raise error
+        return "ok"
+    except CircuitOpenError:
+        return "rejected"
+    except Exception:
+        return "error"
+
+
+async def main():
+    ok = True
+    cases = [
+        ("无效代码(KeyError)", lambda: wrapped(KeyError("data")), False),
+        ("无数据(普通 Exception)", lambda: Exception("no data"), False),
+        ("HTTP 404", lambda: wrapped(http_error(404)), False),
+        ("连接失败", lambda: wrapped(requests.exceptions.ConnectionError("reset")), True),
+        ("读取超时", lambda: requests.exceptions.ReadTimeout("read timed out"), True),
+        ("HTTP 502", lambda: wrapped(http_error(502)), True),
+    ]
+    for label, make, opens in cases:
+        board = BreakerBoard()
+        for _ in range(FAILURE_THRESHOLD + 1):
+            await call(board, "eastmoney", make())
+        after = await call(board, "eastmoney")
+        state = board.get("eastmoney").stats()
+        passed = (after == "rejected") == opens
+        ok &= passed
+        print(f"{label:24s} x{FAILURE_THRESHOLD + 1}: 之后的正常调用 {after:8s} | {state['state']:6s} "
+              f"failures={state['failures']} tool_errors={state['tool_errors']} | {'OK' if passed else 'FAIL'}")
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+结果缓存过期时间检查
+
+检查 ttl_for 对各类工具的判断:
+  - 结束日期已过去的交易日/区间查询(涨停池、日线、通用 start_date/end_date)永不过期
+  - 报告期类工具(业绩报表、十大股东、基金持仓等)的 date 参数是报告期，之后仍会补充披露，按日线 TTL 过期
+  - 前复权、结束日期未到的区间、实时行情(盘外缓存到下次开盘)不会永久缓存
+不访问网络。
+
+运行: python test/check_cache_ttl.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server_akshare.cache import DAILY_TTL, ttl_for
+
+PAST_RANGE = {"symbol": "000001", "start_date": "20240101", "end_date": "20240131"}
+
+CASES = [
+    ("stock_zt_pool_em", {"date": "20240102"}, None),
+    ("stock_zh_a_hist", {**PAST_RANGE, "adjust": ""}, None),
+    ("stock_zh_a_hist", {**PAST_RANGE, "adjust": "hfq"}, None),
+    ("stock_zh_a_hist", {**PAST_RANGE, "adjust": "qfq"}, DAILY_TTL),
+    ("stock_zh_a_hist", {**PAST_RANGE, "end_date": "22220101"}, DAILY_TTL),
+    ("stock_zh_index_daily_em", {"symbol": "sh000001", "start_date": "20240101", "end_date": "20240131"}, None),
+    ("stock_yjbb_em", {"date": "20240930"}, DAILY_TTL),
+    ("stock_yjyg_em", {"date": "20240930"}, DAILY_TTL),
+    ("stock_lrb_em", {"date": "20240930"}, DAILY_TTL),
+    ("stock_fhps_em", {"date": "20231231"}, DAILY_TTL),
+    ("stock_gdfx_free_top_10_em", {"symbol": "sh688686", "date": "20240930"}, DAILY_TTL),
+    ("stock_report_fund_hold", {"symbol": "基金持仓", "date": "20240630"}, DAILY_TTL),
+]
+
+
+def main():
+    ok = True
+    for name, arguments, expected in CASES:
+        ttl = ttl_for(name, arguments)
+        passed = ttl == expected
+        ok &= passed
+        label = "永不过期" if ttl is None else f"{ttl:.0f} s"
+        print(f"{name:28s} {arguments} -> {label} | {'OK' if passed else 'FAIL'}")
+    spot = ttl_for("stock_zh_a_spot_em", {})
+    print(f"{'stock_zh_a_spot_em':28s} {{}} -> {spot:.0f} s")
+    ok &= spot is not None
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
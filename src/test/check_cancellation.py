@@ -0,0 +1,103 @@
+"""
+取消传播检查
+
+在本地起一个每次响应延迟固定时间的 HTTP 服务，用逐页 requests 抓取的模拟工具替换
+stock_research_report_em，检查:
+  - 调用方取消后，运行中的任务在下一页之前停止，而不是下载完所有页
+  - 排队中的任务在开始前被丢弃
+  - 执行器统计中的取消计数
+只访问本机。
+
+运行: python test/check_cancellation.py
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import akshare as ak
+import pandas as pd
+import requests
+
+from mcp_server_akshare import server
+from mcp_server_akshare.executor import ToolExecutor, get_executor
+
+PAGES = 20
+PAGE_LATENCY = 0.1
+requests_served = {"count": 0}
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        requests_served["count"] += 1
+        time.sleep(PAGE_LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+def make_tool(url: str):
+    def research_report(symbol: str = "000001") -> pd.DataFrame:
+        frames = []
+        for page in range(1, PAGES + 1):
+            requests.get(url, params={"page": page}, timeout=5)
+            frames.append(pd.DataFrame({"股票代码": [symbol], "页": [page]}))
+        return pd.concat(frames, ignore_index=True)
+
+    return research_report
+
+
+async def check_abandon() -> bool:
+    task = asyncio.ensure_future(server.handle_call_tool("stock_research_report_em", {"symbol": "000001"}))
+    await asyncio.sleep(PAGE_LATENCY * 3.5)
+    task.cancel()
+    cancelled_at = requests_served["count"]
+    await asyncio.sleep(PAGE_LATENCY * 3)
+    extra = requests_served["count"] - cancelled_at
+    stats = get_executor().stats()
+    print(f"取消前 {cancelled_at} 页 | 取消后又请求 {extra} 页(共 {PAGES} 页) | {stats}")
+    return extra <= 1 and stats["abandoned_after_cancel"] == 1 and stats["running"] == 0
+
+
+async def check_queued() -> bool:
+    executor = ToolExecutor(max_workers=2)
+    calls = {"count": 0}
+
+    def slow():
+        calls["count"] += 1
+        time.sleep(PAGE_LATENCY * 2)
+
+    tasks = [asyncio.ensure_future(executor.run(slow)) for _ in range(6)]
+    await asyncio.sleep(PAGE_LATENCY / 2)
+    for task in tasks:
+        task.cancel()
+    await asyncio.sleep(PAGE_LATENCY * 4)
+    stats = executor.stats()
+    print(f"6 个任务(2 个工作线程)全部取消: 实际执行 {calls['count']} 个 | {stats}")
+    executor.shutdown()
+    return calls["count"] == 2 and stats["cancelled_before_start"] == 4 and stats["queued"] == 0
+
+
+async def main():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    ak.stock_research_report_em = make_tool(f"http://127.0.0.1:{httpd.server_address[1]}/report")
+
+    ok = await check_abandon()
+    ok &= await check_queued()
+    httpd.shutdown()
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
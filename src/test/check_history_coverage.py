@@ -0,0 +1,94 @@
+"""
+日线存储覆盖范围检查
+
+用模拟的上游函数检查 HistoryStore 对空结果的处理:
+  - 含交易日的区间拉取为空(上游临时返回空表)时，当天不重复请求，次日重新拉取并补齐数据
+  - 早于最早一根 K 线(上市之前)的空区间记为永久覆盖，次日也不再请求
+  - 返回数据的区间整体记为覆盖
+  - 含路径分隔符或 .. 的代码被拒绝，不访问上游，也不在存储目录之外写文件
+不访问网络。
+
+运行: python test/check_history_coverage.py
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from mcp_server_akshare.store import history
+from mcp_server_akshare.store.history import HistoryStore
+
+LISTED = "2024-01-02"
+today = {"value": datetime.date(2024, 3, 1)}
+upstream = {"calls": 0, "glitch": False}
+
+
+def fetcher(symbol, period, start_date, end_date, adjust, **kwargs):
+    upstream["calls"] += 1
+    if upstream["glitch"]:
+        return pd.DataFrame()
+    days = pd.bdate_range(max(pd.Timestamp(start_date), pd.Timestamp(LISTED)), pd.Timestamp(end_date))
+    return pd.DataFrame({"日期": days.strftime("%Y-%m-%d"), "收盘": range(len(days))})
+
+
+def fetch_count(store, start, end, symbol="600000"):
+    before = upstream["calls"]
+    rows = len(store.get(symbol, start, end))
+    return upstream["calls"] - before, rows
+
+
+def main():
+    history.today_cst = lambda: today["value"]
+    sandbox = Path(tempfile.mkdtemp(prefix="akshare-history-"))
+    store = HistoryStore("check", fetcher, root=sandbox / "store")
+    ok = True
+
+    calls, rows = fetch_count(store, "19700101", "20240131")
+    print(f"首次请求(上市前起始): 上游 {calls} 次, {rows} 行")
+    ok &= calls == 1 and rows == 22
+    calls, rows = fetch_count(store, "19700101", "20240131")
+    ok &= calls == 0 and rows == 22
+
+    upstream["glitch"] = True
+    calls, rows = fetch_count(store, "20240201", "20240229")
+    again, _ = fetch_count(store, "20240201", "20240229")
+    print(f"上游返回空表: 上游 {calls} 次, {rows} 行 | 当天再次请求: 上游 {again} 次")
+    ok &= calls == 1 and rows == 0 and again == 0
+
+    upstream["glitch"] = False
+    today["value"] = datetime.date(2024, 3, 2)
+    calls, rows = fetch_count(store, "20240201", "20240229")
+    print(f"次日请求: 上游 {calls} 次, {rows} 行")
+    ok &= calls == 1 and rows == 21
+
+    fetch_count(store, "20240101", "20240131", "600001")
+    calls, rows = fetch_count(store, "20230601", "20230630", "600001")
+    today["value"] = datetime.date(2024, 3, 3)
+    again, _ = fetch_count(store, "20230601", "20230630", "600001")
+    print(f"上市之前: 上游 {calls} 次, {rows} 行 | 次日再次请求: 上游 {again} 次")
+    ok &= calls == 1 and rows == 0 and again == 0
+
+    before = upstream["calls"]
+    rejected = 0
+    for symbol in ("../../escape", "..", "a/b", "a\\b", ""):
+        try:
+            store.get(symbol, "20240101", "20240131")
+        except ValueError:
+            rejected += 1
+    outside = [p.name for p in sandbox.iterdir() if p.name != "store"]
+    print(f"非法代码: 拒绝 {rejected}/5 个, 上游 {upstream['calls'] - before} 次, 存储目录外文件 {outside}")
+    ok &= rejected == 5 and upstream["calls"] == before and not outside
+
+    print(store.stats())
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+后台批量任务检查
+
+用模拟的上游函数替换 stock_info_a_code_name、stock_research_report_em 和 stock_zt_pool_em，检查:
+  - values_from 展开全部代码、有限并发执行、失败的任务项重试后记为失败
+  - job_result 合并结果带代码列，数值列中的缺失值读出为 null，并支持过滤与分页参数
+  - 任务中途停止(模拟进程退出)后，新的任务管理器从账本恢复，已完成的任务项不再请求上游
+  - date_range 按交易日展开
+  - 数据源熔断期间，任务项等待熔断器放行后继续，而不是用完重试次数后失败
+不访问网络。
+
+运行: python test/check_jobs.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+DATA_DIR = tempfile.mkdtemp(prefix="akshare-jobs-")
+os.environ["AKSHARE_MCP_DATA_DIR"] = DATA_DIR
+os.environ["AKSHARE_MCP_BREAKER_RESET"] = "0.5"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import akshare as ak
+import pandas as pd
+
+from mcp_server_akshare import jobs, server
+from mcp_server_akshare.breaker import breakers
+from mcp_server_akshare.jobs import JobManager, job_manager
+
+CODES = [f"{600000 + i:06d}" for i in range(60)]
+BAD_CODE = CODES[7]
+LATENCY = 0.02
+calls = {"report": 0, "zt": 0, "lhb": 0}
+
+
+def code_name():
+    return pd.DataFrame({"code": CODES, "name": [f"股票{c}" for c in CODES]})
+
+
+def research_report(symbol: str = "000001"):
+    calls["report"] += 1
+    time.sleep(LATENCY)
+    if symbol == BAD_CODE:
+        raise ConnectionError("upstream reset")
+    return pd.DataFrame({"报告名称": [f"{symbol}-{i}" for i in range(3)], "评级": ["买入", "增持", "买入"],
+                         "目标价": [10.5, float("nan"), 8.0]})
+
+
+def zt_pool(date: str = "20240102"):
+    calls["zt"] += 1
+    return pd.DataFrame({"代码": ["600000"], "名称": ["浦发银行"]})
+
+
+def lhb_detail(date: str = "20240102"):
+    calls["lhb"] += 1
+    return pd.DataFrame({"代码": ["600000"], "上榜日": [date]})
+
+
+async def call(name, arguments):
+    return json.loads((await server.handle_call_tool(name, arguments))[0].text)
+
+
+async def wait(manager, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = await manager.status(job_id)
+        if not status["running"] and status["status"] in ("done", "failed"):
+            return status
+        await asyncio.sleep(0.05)
+    raise TimeoutError(job_id)
+
+
+async def main():
+    ak.stock_info_a_code_name = code_name
+    ak.stock_research_report_em = research_report
+    ak.stock_zt_pool_em = zt_pool
+    ak.stock_lhb_detail_daily_sina = lhb_detail
+    jobs.RETRY_DELAY = 0.01
+    job_manager.start(server._execute_tool)
+    ok = True
+
+    start = time.perf_counter()
+    submitted = await call("submit_job", {
+        "tool": "stock_research_report_em",
+        "fan_out": "symbol",
+        "values_from": {"tool": "stock_info_a_code_name", "column": "code"},
+        "concurrency": 8,
+    })
+    job_id = submitted["job_id"]
+    status = await wait(job_manager, job_id)
+    elapsed = time.perf_counter() - start
+    print(f"{len(CODES)} 个代码, 并发 8(受数据源限流约束): {elapsed:.2f} s | {status['items']} | "
+          f"失败项 {status.get('failed_items')}")
+    ok &= status["status"] == "done" and status["items"]["done"] == len(CODES) - 1 and status["items"]["failed"] == 1
+    ok &= calls["report"] == len(CODES) + jobs.JOB_ATTEMPTS - 1
+
+    page = await call("job_result", {"job_id": job_id, "where": "评级 == 买入", "page_size": 50})
+    print(f"job_result: 列 {page['columns']} | {page['page']}")
+    ok &= page["columns"][0] == "symbol" and page["page"]["total_rows"] == (len(CODES) - 1) * 2
+    ok &= page["rows"][0][3] == 10.5
+    prices = await call("job_result", {"job_id": job_id, "where": "目标价 > 9", "format": "records", "page_size": 10})
+    print(f"目标价 > 9: {prices['page']['total_rows']} 行 | 首行 {prices['records'][0]}")
+    ok &= prices["page"]["total_rows"] == len(CODES) - 1
+    missing = await call("job_result", {"job_id": job_id, "where": "评级 == 增持", "format": "records", "page_size": 1})
+    ok &= missing["records"][0]["目标价"] is None
+    rest = await call("job_result", {"cursor": page["page"]["next_cursor"]})
+    ok &= rest["page"]["offset"] == 50
+
+    # 中途停止后由新的任务管理器恢复
+    calls["report"] = 0
+    values = [f"{300000 + i:06d}" for i in range(40)]
+    interrupted = JobManager(job_manager.root)
+    interrupted.start(server._execute_tool)
+    job = await interrupted.submit("stock_research_report_em", "symbol", {}, {"values": values}, 2)
+    await asyncio.sleep(LATENCY * 10)
+    interrupted.stop()
+    before = (await interrupted.status(job["job_id"]))["finished"]
+    resumed = JobManager(job_manager.root)
+    resumed.start(server._execute_tool)
+    status = await wait(resumed, job["job_id"])
+    print(f"停止前完成 {before} 项 | 恢复后 {status['items']} | 上游请求 {calls['report']} 次(共 {len(values)} 项)")
+    ok &= resumed.resumed == 1 and status["items"]["done"] == len(values)
+    ok &= 0 < before < len(values) and calls["report"] <= len(values) + 2
+
+    job = await job_manager.submit("stock_zt_pool_em", "date", {}, {"date_range": {"start": "20240101", "end": "20240131"}})
+    status = await wait(job_manager, job["job_id"])
+    print(f"date_range 2024-01: {status['total']} 个交易日 | {status['items']}")
+    ok &= status["total"] == calls["zt"] == status["items"]["done"]
+
+    # 新浪数据源已熔断(0.5 s 后半开)，任务项应等待放行而不是失败
+    breaker = breakers.get("sina")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure(ConnectionError("upstream unreachable"))
+    job = await job_manager.submit("stock_lhb_detail_daily_sina", "date", {},
+                                   {"date_range": {"start": "20240101", "end": "20240119"}}, 2)
+    status = await wait(job_manager, job["job_id"])
+    print(f"熔断期间提交: {status['items']} | 上游请求 {calls['lhb']} 次 | 等待熔断 {job_manager.breaker_waits} 次")
+    ok &= status["items"]["done"] == status["total"] == calls["lhb"] and job_manager.breaker_waits > 0
+
+    print(job_manager.stats())
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+"""
+分钟 K 线合成回归测试
+
+校验由 1 分钟线合成的 5/15/30/60 分钟 K 线:
+  - 默认: 合成多日 1 分钟线(含 09:30 集合竞价)，与按上午/下午时段分别 resample 的参考结果对比
+  - --live: 从东方财富拉取最近几个交易日的 1 分钟线、流通股与各周期 K 线，对比已收盘交易日的
+    开高低收、成交量、成交额、涨跌幅、涨跌额、振幅与换手率
+
+运行: python test/check_minute_resample.py [--live] [--symbol 000001]
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server_akshare.cache import today_cst
+from mcp_server_akshare.store.resample import MINUTE_PERIODS, resample_minutes
+
+COMPARE_COLUMNS = ["开盘", "收盘", "最高", "最低", "成交量", "成交额", "涨跌幅", "涨跌额", "振幅", "换手率"]
+FLOAT_SHARES = 1.9e10  # 合成数据使用的流通股(股)
+AGG = {"开盘": "first", "收盘": "last", "最高": "max", "最低": "min", "成交量": "sum", "成交额": "sum"}
+
+
+def make_minutes(days: int = 5) -> pd.DataFrame:
+    frames = []
+    rng = np.random.default_rng(42)
+    for day in pd.bdate_range("2024-03-04", periods=days):
+        stamps = pd.DatetimeIndex([day + pd.Timedelta("09:30:00")]).append(
+            pd.date_range(day + pd.Timedelta("09:31:00"), day + pd.Timedelta("11:30:00"), freq="min")
+        ).append(
+            pd.date_range(day + pd.Timedelta("13:01:00"), day + pd.Timedelta("15:00:00"), freq="min")
+        )
+        close = 10 + rng.normal(0, 0.01, len(stamps)).cumsum()
+        frames.append(pd.DataFrame({
+            "时间": stamps.strftime("%Y-%m-%d %H:%M:%S"),
+            "开盘": (close + rng.normal(0, 0.005, len(stamps))).round(2),
+            "收盘": close.round(2),
+            "最高": (close + 0.02).round(2),
+            "最低": (close - 0.02).round(2),
+            "成交量": rng.integers(100, 10000, len(stamps)),
+            "成交额": rng.uniform(1e4, 1e6, len(stamps)).round(2),
+            "均价": close.round(3),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def reference(minutes: pd.DataFrame, period: str) -> pd.DataFrame:
+    """按上午、下午两个时段分别 resample(右闭、右标签)的参考实现"""
+    df = minutes.copy()
+    df["时间"] = pd.to_datetime(df["时间"])
+    # 集合竞价并入第一根 K 线
+    auction = df["时间"].dt.strftime("%H:%M") <= "09:30"
+    df.loc[auction, "时间"] = df.loc[auction, "时间"].dt.normalize() + pd.Timedelta("09:31:00")
+    bars = []
+    for _, day in df.groupby(df["时间"].dt.date):
+        for origin, session in (
+            ("09:30:00", day[day["时间"].dt.strftime("%H:%M") <= "11:30"]),
+            ("13:00:00", day[day["时间"].dt.strftime("%H:%M") > "11:30"]),
+        ):
+            start = session["时间"].iloc[0].normalize() + pd.Timedelta(origin)
+            bars.append(
+                session.set_index("时间")[list(AGG)]
+                .resample(f"{period}min", closed="right", label="right", origin=start)
+                .agg(AGG)
+                .dropna(subset=["开盘"])
+            )
+    bars = pd.concat(bars)
+    prev_close = bars["收盘"].shift()
+    bars["涨跌幅"] = ((bars["收盘"] - prev_close) / prev_close * 100).round(2)
+    bars["涨跌额"] = (bars["收盘"] - prev_close).round(3)
+    bars["振幅"] = ((bars["最高"] - bars["最低"]) / prev_close * 100).round(2)
+    bars["换手率"] = (bars["成交量"] * 100 / FLOAT_SHARES * 100).round(2)
+    return bars.reset_index()
+
+
+def compare(label: str, derived: pd.DataFrame, expected: pd.DataFrame) -> bool:
+    derived = derived.set_index(pd.to_datetime(derived["时间"]))[COMPARE_COLUMNS]
+    expected = expected.set_index(pd.to_datetime(expected["时间"]))[COMPARE_COLUMNS]
+    common = derived.index.intersection(expected.index)
+    missing = expected.index.difference(derived.index)
+    extra = derived.index.difference(expected.index)
+    diff = ~np.isclose(derived.loc[common].to_numpy(float), expected.loc[common].to_numpy(float),
+                       rtol=1e-6, atol=1e-6, equal_nan=True)
+    ok = not len(missing) and not len(extra) and not diff.any()
+    print(f"{label:12s}: {len(common):5d} 根 | 缺少 {len(missing)} | 多出 {len(extra)} | 数值不一致 {int(diff.any(axis=1).sum())} | {'OK' if ok else 'FAIL'}")
+    if not ok:
+        for stamp in list(missing[:3]) + list(extra[:3]):
+            print(f"    时间不一致: {stamp}")
+        for stamp in common[diff.any(axis=1)][:3]:
+            print(f"    {stamp}: 合成 {derived.loc[stamp].tolist()} | 期望 {expected.loc[stamp].tolist()}")
+    return ok
+
+
+def check_synthetic() -> bool:
+    minutes = make_minutes()
+    ok = True
+    for period in MINUTE_PERIODS:
+        derived = resample_minutes(minutes, period, float_shares=FLOAT_SHARES)
+        ok &= compare(f"合成 {period} 分钟", derived, reference(minutes, period))
+    sixty = resample_minutes(minutes, "60")
+    labels = sorted(set(pd.to_datetime(sixty["时间"]).dt.strftime("%H:%M")))
+    print(f"60 分钟线时刻: {labels}")
+    return ok and labels == ["10:30", "11:30", "14:00", "15:00"]
+
+
+def check_live(symbol: str) -> bool:
+    import akshare as ak
+
+    minutes = ak.stock_zh_a_hist_min_em(symbol=symbol, period="1")
+    today = str(today_cst())
+    minutes = minutes[minutes["时间"].str[:10] < today]
+    days = sorted(set(minutes["时间"].str[:10]))
+    info = ak.stock_individual_info_em(symbol=symbol)
+    float_shares = float(info.loc[info["item"] == "流通股", "value"].iloc[0])
+    print(f"{symbol}: 1 分钟线 {len(minutes)} 条，交易日 {days}，流通股 {float_shares:.0f}")
+    ok = True
+    for period in MINUTE_PERIODS:
+        upstream = ak.stock_zh_a_hist_min_em(symbol=symbol, period=period)
+        upstream = upstream[upstream["时间"].str[:10].isin(days)]
+        # 第一根 K 线没有前收盘价，不参与对比
+        derived = resample_minutes(minutes, period, float_shares=float_shares).iloc[1:]
+        ok &= compare(f"上游 {period} 分钟", derived, upstream.iloc[1:])
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="与东方财富的分钟 K 线对比")
+    parser.add_argument("--symbol", default="000001")
+    args = parser.parse_args()
+
+    ok = check_live(args.symbol) if args.live else check_synthetic()
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
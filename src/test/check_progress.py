@@ -0,0 +1,89 @@
+"""
+进度通知检查
+
+用模拟的分页抓取(akshare 的 tqdm 分页循环，每页固定延迟)替换 stock_research_report_em，
+以带 progressToken 的请求上下文调用工具，记录收到的进度通知:
+  - 第一条通知的到达时间应接近一页的延迟，而不是整个抓取的耗时
+  - 进度单调递增，最后一条等于总页数
+  - 不带 progressToken 的调用不发送通知
+不访问网络。
+
+运行: python test/check_progress.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import akshare as ak
+import pandas as pd
+from akshare.utils.tqdm import get_tqdm
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.context import RequestContext
+from mcp.types import RequestParams
+
+from mcp_server_akshare import server
+from mcp_server_akshare.progress import progress_notifier
+
+PAGES = 20
+PAGE_LATENCY = 0.1
+
+
+class FakeSession:
+    def __init__(self):
+        self.received = []
+        self.started = time.perf_counter()
+
+    async def send_progress_notification(self, token, progress, total=None):
+        self.received.append((time.perf_counter() - self.started, token, progress, total))
+
+
+def research_report(symbol: str = "000001") -> pd.DataFrame:
+    frames = []
+    tqdm = get_tqdm()
+    for page in tqdm(range(1, PAGES + 1), leave=False):
+        time.sleep(PAGE_LATENCY)
+        frames.append(pd.DataFrame({"股票代码": [symbol] * 50, "页": [page] * 50}))
+    return pd.concat(frames, ignore_index=True)
+
+
+async def call(symbol: str, token=None) -> FakeSession:
+    session = FakeSession()
+    meta = RequestParams.Meta(progressToken=token) if token is not None else None
+    context_token = request_ctx.set(RequestContext(request_id=1, meta=meta, session=session, lifespan_context=None))
+    try:
+        await server.handle_call_tool("stock_research_report_em", {"symbol": symbol})
+    finally:
+        request_ctx.reset(context_token)
+    await asyncio.sleep(0.05)
+    return session
+
+
+async def main():
+    ak.stock_research_report_em = research_report
+    ok = True
+
+    start = time.perf_counter()
+    session = await call("000001", token="t1")
+    elapsed = time.perf_counter() - start
+    progress = [p for _, _, p, _ in session.received]
+    first = session.received[0][0] if session.received else None
+    print(f"抓取 {PAGES} 页耗时 {elapsed:.2f} s | 通知 {len(progress)} 条 | 首条 {first:.2f} s | 进度 {progress}")
+    ok &= bool(progress) and first < PAGE_LATENCY * 3
+    ok &= progress == sorted(set(progress)) and progress[-1] == PAGES
+    ok &= all(token == "t1" and total == PAGES for _, token, _, total in session.received)
+
+    session = await call("000002")
+    print(f"不带 progressToken: 通知 {len(session.received)} 条")
+    ok &= not session.received
+
+    print(progress_notifier.stats())
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
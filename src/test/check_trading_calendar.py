@@ -0,0 +1,148 @@
+"""
+交易日历回归测试
+
+  - 默认: 用合成的交易日列表(含节假日)建立日历，把 is_trading_day / previous_session /
+    next_session 与逐日遍历的参考实现对比(包括已知范围之外按工作日回退的部分)，
+    并检查分发路径上的日期参数规范化、交易时段时钟(午休、收盘宽限期、节假日、夏令时切换)，
+    测量单次查询耗时
+  - --live: 从上游拉取 A 股、港股、美股交易日历并输出概况
+
+运行: python test/check_trading_calendar.py [--live]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server_akshare.trading_calendar import (
+    CLOSE_GRACE,
+    MARKET_TIMEZONES,
+    TradingCalendar,
+    TradingCalendars,
+    trading_calendars,
+)
+
+HOLIDAYS = {datetime.date(2024, 1, 1), datetime.date(2024, 2, 12), datetime.date(2024, 2, 13), datetime.date(2024, 5, 1)}
+FIRST, LAST = datetime.date(2023, 12, 20), datetime.date(2024, 6, 28)
+
+
+def sessions():
+    day = FIRST
+    while day <= LAST:
+        if day.weekday() < 5 and day not in HOLIDAYS:
+            yield day
+        day += datetime.timedelta(days=1)
+
+
+def reference_is_trading(day: datetime.date, known: set) -> bool:
+    if FIRST <= day <= LAST:
+        return day in known
+    return day.weekday() < 5
+
+
+def reference_step(day: datetime.date, known: set, step: int) -> datetime.date:
+    while not reference_is_trading(day, known):
+        day += datetime.timedelta(days=step)
+    return day
+
+
+def check_synthetic() -> bool:
+    known = set(sessions())
+    ok = True
+    with tempfile.TemporaryDirectory() as root:
+        calendar = TradingCalendar("a", lambda: sorted(known), root=Path(root))
+        calendar.refresh()
+        day = FIRST - datetime.timedelta(days=20)
+        mismatches = 0
+        while day <= LAST + datetime.timedelta(days=20):
+            if calendar.is_trading_day(day) != reference_is_trading(day, known) \
+                    or calendar.previous_session(day) != reference_step(day, known, -1) \
+                    or calendar.next_session(day) != reference_step(day, known, 1) \
+                    or calendar.previous_session(day, inclusive=False) != reference_step(day - datetime.timedelta(days=1), known, -1) \
+                    or calendar.next_session(day, inclusive=False) != reference_step(day + datetime.timedelta(days=1), known, 1):
+                mismatches += 1
+                print(f"    不一致: {day}")
+            day += datetime.timedelta(days=1)
+        print(f"逐日对比: 不一致 {mismatches} 天 | {'OK' if not mismatches else 'FAIL'}")
+        ok &= not mismatches
+
+        reloaded = TradingCalendar("a", lambda: [], root=Path(root))
+        ok &= reloaded.is_trading_day(datetime.date(2024, 2, 13)) is False and reloaded.stats()["source"] == "file"
+
+        calendars = TradingCalendars({"a": calendar, "hk": calendar, "us": calendar})
+        cases = [
+            ("stock_zt_pool_em", {"date": "20240212"}, None),
+            ("stock_zt_pool_em", {"date": "20240214"}, {}),
+            ("stock_zh_a_hist", {"start_date": "20240210", "end_date": "20240213"}, None),
+            ("stock_zh_a_hist", {"start_date": "20240210", "end_date": "20240218"},
+             {"start_date": "20240214", "end_date": "20240216"}),
+            ("stock_zh_a_hist_min_em", {"start_date": "2024-04-27 09:30:00", "end_date": "2024-05-01 15:00:00"},
+             {"start_date": "2024-04-29 00:00:00", "end_date": "2024-04-30 23:59:59"}),
+            ("stock_zh_a_hist_min_em", {"start_date": "2024-04-29 09:30:00", "end_date": "2222-01-01 09:32:00"},
+             {"end_date": f"{calendar.today()} 23:59:59"}),
+            ("stock_zh_a_spot_em", {}, {}),
+        ]
+        for name, arguments, expected in cases:
+            result = calendars.normalize(name, arguments)
+            passed = result == expected
+            ok &= passed
+            print(f"{name:24s} {arguments} -> {result} | {'OK' if passed else 'FAIL'}")
+
+        def at(market: str, text: str) -> float:
+            return datetime.datetime.fromisoformat(text).replace(tzinfo=MARKET_TIMEZONES[market]).timestamp()
+
+        us = TradingCalendar("us", lambda: [], root=Path(root) / "us")
+        hour = 3600
+        clock_cases = [
+            (calendar, "2024-02-08 10:00", 0),
+            (calendar, "2024-02-08 12:00", hour),
+            (calendar, "2024-02-08 15:00", 0 if CLOSE_GRACE > 0 else 18.25 * hour),
+            (calendar, "2024-02-08 16:00", 17.25 * hour),
+            # 春节休市: 周五收盘后冻结到下周三开盘
+            (calendar, "2024-02-09 16:00", 4 * 24 * hour + 17.25 * hour),
+            # 美股夏令时在 2024-03-10 开始，周五收盘到周一开盘少一小时
+            (us, "2024-03-08 17:00", 64.5 * hour - hour),
+        ]
+        for cal, text, expected in clock_cases:
+            wait = cal.seconds_until_open(at(cal.market, text))
+            passed = abs(wait - expected) < 1e-6
+            ok &= passed
+            print(f"{cal.market} {text} 距开盘 {wait / hour:8.2f} h | {'OK' if passed else 'FAIL'}")
+
+        day = datetime.date(2024, 3, 9)
+        repeat = 100000
+        start = time.perf_counter()
+        for _ in range(repeat):
+            calendar.previous_session(day)
+        print(f"previous_session: {(time.perf_counter() - start) / repeat * 1e6:.2f} us/次")
+    return ok
+
+
+def check_live() -> bool:
+    ok = True
+    for market, calendar in trading_calendars.calendars.items():
+        ok &= calendar.refresh()
+        today = calendar.today()
+        print(f"{market}: {calendar.stats()} | 今天 {today} 交易日 {calendar.is_trading_day(today)} | "
+              f"上一交易日 {calendar.previous_session(today, inclusive=False)}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="从上游拉取交易日历")
+    args = parser.parse_args()
+
+    ok = check_live() if args.live else check_synthetic()
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()